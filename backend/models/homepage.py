@@ -1,11 +1,64 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 
+class ImageVariant(BaseModel):
+    url: str
+    width: int
+    height: int
+    format: str
+    size_bytes: int
+
+class ModelVariant(BaseModel):
+    url: str
+    format: str
+    media_type: str
+    size_bytes: int
+    gaussian_count: Optional[int] = None
+    lod: Optional[float] = None  # Fraction of the source gaussians kept
+    progressive: bool = False  # Records are importance ordered; any prefix renders
+    sh_degree: Optional[int] = None  # Spherical harmonic bands kept
+    compression: Optional[Dict[str, float]] = None  # Size ratio and reconstruction error vs. the source
+
+class ModelMetadata(BaseModel):
+    gaussian_count: int
+    sh_degree: int
+    bounds_min: List[float]
+    bounds_max: List[float]
+    centroid: List[float]
+    camera_distance: float  # Fits the bounding sphere in a 60 degree view
+    sha256: str
+
+class ModelTileset(BaseModel):
+    id: str
+    url: str  # Packed tiles; each tile is a byte range listed in the manifest
+    manifest_url: str
+    tile_count: int
+    depth: int
+    gaussian_count: int
+    size_bytes: int
+
+class ModelSortOrders(BaseModel):
+    id: str
+    url: str  # One block of `gaussian_count` indices per azimuth step
+    model_url: str  # The .splat variant the indices refer to
+    azimuths: int  # Steps evenly spaced over a full turn
+    index_type: str  # uint16 or uint32, little-endian
+    gaussian_count: int
+    camera_distance: float
+    size_bytes: int
+
 class HomepageHeroContent(BaseModel):
     headline: str = Field(default="Bring Your Menu to Life in 3D")
     subheadline: str = Field(default="Let customers explore your dishes with immersive, real food scans.")
     hero_image_base64: Optional[str] = Field(default=None)
+    hero_image_variants: List[ImageVariant] = Field(default_factory=list)
+    hero_source_url: Optional[str] = Field(default=None)
+    hero_model_variants: List[ModelVariant] = Field(default_factory=list)
+    hero_model_tileset: Optional[ModelTileset] = Field(default=None)
+    hero_model_sort_orders: List[ModelSortOrders] = Field(default_factory=list)
+    hero_model_metadata: Optional[ModelMetadata] = Field(default=None)
+    hero_model_poster: Optional[ImageVariant] = Field(default=None)
     primary_cta_text: str = Field(default="View Sample Menu")
     primary_cta_url: str = Field(default="/menu")
     secondary_cta_text: str = Field(default="Contact Us")
@@ -28,6 +81,7 @@ class HomepageDemoItem(BaseModel):
     name: str
     description: str
     image_base64: Optional[str] = Field(default=None)
+    image_variants: List[ImageVariant] = Field(default_factory=list)
     menu_link: str = Field(default="/menu")
     emoji: str = Field(default="🍔")
 
@@ -92,4 +146,50 @@ class HomepageContentUpdate(BaseModel):
     hero: Optional[HomepageHeroContent] = None
     features: Optional[List[HomepageFeature]] = None
     testimonials: Optional[List[HomepageTestimonial]] = None
-    demo_items: Optional[List[HomepageDemoItem]] = None
\ No newline at end of file
+    demo_items: Optional[List[HomepageDemoItem]] = None
+
+class UploadSessionCreate(BaseModel):
+    filename: str
+    size: int = Field(ge=0)
+
+class UploadSession(BaseModel):
+    id: str
+    filename: str
+    size: int
+    received: List[List[int]] = Field(default_factory=list)
+    bytes_received: int = 0
+    complete: bool = False
+    created_at: datetime = Field(default_factory=datetime.now)
+    expires_at: datetime
+
+class AssetJobStage(BaseModel):
+    name: str
+    status: str = "pending"  # pending, running, done, skipped or failed
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+class AssetJob(BaseModel):
+    id: str
+    kind: str
+    status: str  # queued, running, succeeded or failed
+    stages: List[AssetJobStage] = Field(default_factory=list)
+    progress: float = 0.0
+    published: bool = False  # The result is live on the homepage
+    superseded: bool = False  # A newer upload replaced it before it was published
+    result: Dict = Field(default_factory=dict)
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+class DirectUploadCreate(BaseModel):
+    filename: str
+    size: int = Field(ge=0)
+    sha256: str = Field(pattern=r"^[0-9a-f]{64}$")
+
+class DirectUpload(BaseModel):
+    stored_filename: str
+    exists: bool = False  # Storage already holds these bytes; skip straight to completing
+    upload_url: Optional[str] = None  # POST the form fields plus the file here
+    fields: Dict[str, str] = Field(default_factory=dict)
@@ -1,21 +1,108 @@
-from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File, Request, Query
+from fastapi.responses import JSONResponse, RedirectResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from models.homepage import HomepageContent, HomepageContentUpdate
+from pymongo import ReturnDocument
+from models.homepage import AssetJob, DirectUpload, DirectUploadCreate, HomepageContent, HomepageContentUpdate, HomepageHeroContent, ImageVariant, ModelMetadata, ModelSortOrders, ModelTileset, ModelVariant, UploadSession, UploadSessionCreate
+from services.uploads import stream_upload_to_temp, format_size, MULTIPART_OVERHEAD, TEMP_UPLOAD_PREFIX
+from services.asset_gc import collect_garbage
+from services.asset_jobs import claim_unfinished_jobs, create_job, get_job, hold_lease, job_slots, save_job, set_stage
+from services.asset_store import IMMUTABLE_CACHE_CONTROL, content_address, content_hash, image_extension, normalize_extension, resolve_asset, store_file
+from services.chunks import load_chunk_manifest, write_chunk_manifests
+from services.compression import ENCODING_SUFFIXES, available_encodings, compress_files, compressed_sibling, negotiate_encoding
+from services.content_cache import content_response, homepage_cache
+from services.file_responses import file_etag, file_slice_response, prefix_file_response, ranged_file_response
+from services.image_variants import generate_image_variants, strip_image_metadata
+from services.migrations import migrate_demo_images, migrate_to_sharded_layout
+from services.processing import run_in_process
+from services.storage import create_storage
+from services.splats.compressed import (
+    COMPRESSED_PLY_EXTENSION,
+    COMPRESSED_PLY_MEDIA_TYPE,
+)
+from services.splats.gaussians import SPLAT_DTYPE
+from services.splats.metadata import inspect_model
+from services.splats.pipeline import process_model
+from services.splats.poster import render_poster_file
+from services.splats.sort_orders import (
+    SORT_ORDER_AZIMUTHS,
+    SORT_ORDER_EXTENSION,
+    SORT_ORDER_MAX_GAUSSIANS,
+    build_sort_orders_file,
+)
+from services.splats.tiles import (
+    TILESET_EXTENSION,
+    TILESET_MANIFEST_SUFFIX,
+    TILING_MIN_GAUSSIANS,
+    build_tileset_file,
+    load_tileset_manifest,
+    tileset_manifest_path,
+)
+from services.upload_validation import (
+    DEMO_UPLOAD_KINDS,
+    HERO_UPLOAD_KINDS,
+    UploadRejected,
+    UploadValidator,
+    check_declared_size,
+    validate_file,
+    verify_upload,
+)
+from services.upload_sessions import (
+    bytes_received,
+    create_part_file,
+    discard_session,
+    expire_upload_sessions,
+    finalize_hash,
+    is_complete,
+    merge_ranges,
+    session_expiry,
+    session_part_path,
+    write_chunk,
+)
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional, Tuple
+import asyncio
+import logging
+import re
 import uuid
-import base64
 import os
-import aiofiles
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/homepage", tags=["homepage"])
 
 # Create uploads directory
 UPLOAD_DIR = Path("/app/uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
+# Durable asset storage; UPLOAD_DIR is its working copy
+storage = create_storage(UPLOAD_DIR)
+
+# Maximum size of a hero upload (200MB)
+MAX_HERO_UPLOAD_SIZE = 200 * 1024 * 1024
+
+# Maximum size of a demo image upload (20MB)
+MAX_DEMO_UPLOAD_SIZE = 20 * 1024 * 1024
+
+# Request body limits of the multipart upload routes, checked before the
+# body is read
+UPLOAD_SIZE_LIMITS = {
+    r"/api/homepage/upload/hero": MAX_HERO_UPLOAD_SIZE + MULTIPART_OVERHEAD,
+    r"/api/homepage/upload/demo/[^/]+": MAX_DEMO_UPLOAD_SIZE + MULTIPART_OVERHEAD
+}
+
+# Hero fields built by upload processing. Content updates never set them:
+# they describe the stored hero_image_base64 and go with it.
+HERO_ASSET_FIELDS = (
+    "hero_image_variants",
+    "hero_source_url",
+    "hero_model_variants",
+    "hero_model_tileset",
+    "hero_model_sort_orders",
+    "hero_model_metadata",
+    "hero_model_poster",
+)
+
 # This would normally be imported from auth, but for now we'll use a simple dependency
 async def get_admin_user():
     # In a real implementation, this would check authentication
@@ -25,26 +112,35 @@ def get_database():
     from server import database
     return database
 
+async def _load_homepage_content(db: AsyncIOMotorDatabase) -> HomepageContent:
+    """
+    Load the homepage document from the database.
+    Returns default content if none exists.
+    """
+    content = await db.homepage_content.find_one({"id": "main"})
+    
+    if content:
+        # Convert MongoDB document to Pydantic model
+        content["_id"] = str(content["_id"])
+        return HomepageContent(**content)
+    
+    # Return default content
+    return HomepageContent(id="main")
+
 @router.get("/content", response_model=HomepageContent)
 async def get_homepage_content(
+    request: Request,
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
     Get the current homepage content.
     Returns default content if none exists.
+    Served from the in-process cache as prebuilt (optionally precompressed)
+    JSON bytes; If-None-Match with the current version ETag returns 304.
     """
     try:
-        # Try to get existing content
-        content = await db.homepage_content.find_one({"id": "main"})
-        
-        if content:
-            # Convert MongoDB document to Pydantic model
-            content["_id"] = str(content["_id"])
-            return HomepageContent(**content)
-        else:
-            # Return default content
-            default_content = HomepageContent(id="main")
-            return default_content
+        cached = await homepage_cache.get(lambda: _load_homepage_content(db))
+        return content_response(request, cached)
             
     except Exception as e:
         raise HTTPException(
@@ -52,6 +148,13 @@ async def get_homepage_content(
             detail=f"Error retrieving homepage content: {str(e)}"
         )
 
+@router.get("/content/cache-stats")
+async def get_homepage_cache_stats():
+    """
+    Hit/miss counters for the homepage content cache.
+    """
+    return homepage_cache.stats()
+
 @router.put("/content", response_model=HomepageContent)
 async def update_homepage_content(
     content_update: HomepageContentUpdate,
@@ -74,9 +177,19 @@ async def update_homepage_content(
         
         # Update fields that are provided
         update_data = content_update.dict(exclude_unset=True)
+        detach_job = False
         
         if "hero" in update_data:
-            current_content.hero = content_update.hero
+            hero = content_update.hero.dict()
+            if hero["hero_image_base64"] == current_content.hero.hero_image_base64:
+                assets = current_content.hero.dict()
+            else:
+                # A hero set or removed by hand has no processed assets, and
+                # an upload still processing must not publish over it
+                assets = HomepageHeroContent().dict()
+                detach_job = True
+            hero.update({field: assets[field] for field in HERO_ASSET_FIELDS})
+            current_content.hero = HomepageHeroContent(**hero)
         if "features" in update_data:
             current_content.features = content_update.features
         if "testimonials" in update_data:
@@ -87,13 +200,39 @@ async def update_homepage_content(
         # Update timestamp
         current_content.updated_at = datetime.now()
         
-        # Save to database
+        # Save to database, setting only the fields sent. Unless the hero
+        # image changed, it and its processed assets are left alone, so a
+        # hero job publishing meanwhile keeps them
         content_dict = current_content.dict()
-        await db.homepage_content.update_one(
-            {"id": "main"},
-            {"$set": content_dict},
-            upsert=True
-        )
+        changes = {
+            field: content_dict[field] for field in ("features", "testimonials", "demo_items") if field in update_data
+        }
+        if detach_job:
+            changes["hero"] = content_dict["hero"]
+        elif "hero" in update_data:
+            changes.update({
+                f"hero.{field}": value for field, value in content_dict["hero"].items()
+                if field not in HERO_ASSET_FIELDS and field != "hero_image_base64"
+            })
+        changes["updated_at"] = content_dict["updated_at"]
+        update = {"$set": changes}
+        if detach_job:
+            update["$unset"] = {"hero_job_id": ""}
+        
+        stored = None
+        if existing_content:
+            stored = await db.homepage_content.find_one_and_update(
+                {"id": "main"}, update, return_document=ReturnDocument.AFTER
+            )
+        if stored:
+            current_content = HomepageContent(**stored)
+        else:
+            await db.homepage_content.update_one(
+                {"id": "main"},
+                {**update, "$set": content_dict},
+                upsert=True
+            )
+        await homepage_cache.set(current_content)
         
         return current_content
         
@@ -114,13 +253,15 @@ async def reset_homepage_content(
         # Create default content
         default_content = HomepageContent(id="main")
         
-        # Save to database
+        # Save to database, detaching any hero upload still processing so
+        # it can't publish onto the reset content
         content_dict = default_content.dict()
         await db.homepage_content.update_one(
             {"id": "main"},
-            {"$set": content_dict},
+            {"$set": content_dict, "$unset": {"hero_job_id": ""}},
             upsert=True
         )
+        await homepage_cache.set(default_content)
         
         return default_content
         
@@ -132,12 +273,416 @@ async def reset_homepage_content(
 
 @router.get("/content/preview", response_model=HomepageContent)
 async def preview_homepage_content(
+    request: Request,
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
     Get homepage content for preview (public endpoint).
     """
-    return await get_homepage_content(db)
+    return await get_homepage_content(request, db)
+
+def _hero_file_type(kind: str) -> str:
+    """
+    Human readable type of an uploaded hero file, from the kind its
+    validation found.
+    """
+    if kind == "splat":
+        return "3D Splat Model"
+    elif kind == "ply":
+        return "3D PLY Model"
+    return "Image"
+
+# Model files served with precompressed gzip/brotli siblings
+PRECOMPRESSED_EXTENSIONS = ('.ply', '.splat')
+
+UPLOAD_MEDIA_TYPES = {
+    '.ply': 'application/ply',
+    COMPRESSED_PLY_EXTENSION: COMPRESSED_PLY_MEDIA_TYPE,
+    '.splat': 'application/splat',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+    '.json': 'application/json'
+}
+
+def _upload_extension(filename: str) -> str:
+    file_extension = Path(filename).suffix.lower()
+    if filename.lower().endswith(COMPRESSED_PLY_EXTENSION):
+        file_extension = COMPRESSED_PLY_EXTENSION
+    return file_extension
+
+def _upload_media_type(filename: str) -> str:
+    return UPLOAD_MEDIA_TYPES.get(_upload_extension(filename), 'application/octet-stream')
+
+def _asset_path(url: str) -> Path:
+    """
+    Working copy path of an uploaded file, from its name or /uploads/ URL.
+    """
+    return resolve_asset(UPLOAD_DIR, Path(url).name)
+
+# Files known to be in remote storage, so reads can redirect without a lookup
+stored_files = set()
+
+async def _persist_uploads(urls: List[str], siblings: bool = False) -> None:
+    """
+    Copy files from the working copy to remote storage. With siblings,
+    their precompressed .gz/.br siblings are stored instead, marked with
+    their Content-Encoding so the bucket serves them like the API does.
+    """
+    if not storage.remote:
+        return
+    for url in urls:
+        path = _asset_path(url)
+        if not siblings:
+            await storage.save(path, _upload_media_type(path.name))
+            stored_files.add(path.name)
+            continue
+        for encoding in available_encodings(path):
+            sibling = compressed_sibling(path, encoding)
+            await storage.save(sibling, _upload_media_type(path.name), encoding)
+            stored_files.add(sibling.name)
+
+async def _is_stored(filename: str) -> bool:
+    if filename not in stored_files and await storage.size(filename) is not None:
+        stored_files.add(filename)
+    return filename in stored_files
+
+# Stages of a hero upload job, in order. The upload is live once "publish"
+# is done; the stages after it build optional delivery assets, and their
+# failure doesn't fail the job.
+HERO_IMAGE_STAGES = ["variants", "publish"]
+HERO_MODEL_STAGES = ["inspect", "convert", "poster", "publish", "delivery", "tiles", "sort_orders"]
+HERO_OPTIONAL_STAGES = ("delivery", "tiles", "sort_orders")
+
+# Hero upload kinds that may go straight to storage
+DIRECT_UPLOAD_KINDS = ("ply", "splat")
+
+# Keep references to background tasks so they aren't garbage collected
+background_tasks = set()
+
+async def _attach_hero_asset(db: AsyncIOMotorDatabase, source_url: str, field: str, value):
+    """
+    Set a derived hero field, unless the hero was replaced while the
+    asset was being built.
+    """
+    result = await db.homepage_content.update_one(
+        {"id": "main", "hero.hero_source_url": source_url},
+        {"$set": {f"hero.{field}": value}}
+    )
+    if result.modified_count:
+        homepage_cache.invalidate()
+
+async def _build_hero_tileset(db: AsyncIOMotorDatabase, source_url: str, model_url: str):
+    """
+    Tile a large hero model and attach the tileset.
+    """
+    tileset = await run_in_process(
+        build_tileset_file, _asset_path(model_url), UPLOAD_DIR
+    )
+    if tileset:
+        await _persist_uploads([tileset["url"], f"{tileset['id']}{TILESET_MANIFEST_SUFFIX}"])
+        await _attach_hero_asset(db, source_url, "hero_model_tileset", ModelTileset(**tileset).dict())
+
+async def _build_hero_sort_orders(db: AsyncIOMotorDatabase, source_url: str, model_variants: list):
+    """
+    Precompute auto-rotate sort orders for the hero model variants small
+    enough for low-end devices, and attach them.
+    """
+    sort_orders = []
+    for variant in model_variants:
+        if variant["format"] != "splat" or variant["gaussian_count"] > SORT_ORDER_MAX_GAUSSIANS:
+            continue
+        orders = await run_in_process(
+            build_sort_orders_file, _asset_path(variant["url"]), UPLOAD_DIR
+        )
+        if orders:
+            await _persist_uploads([orders["url"]])
+            sort_orders.append(ModelSortOrders(**orders).dict())
+    if sort_orders:
+        await _attach_hero_asset(db, source_url, "hero_model_sort_orders", sort_orders)
+
+def _start_background_task(coroutine):
+    task = asyncio.create_task(coroutine)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+async def _prepare_hero_model_delivery(source_url: str, model_variants: list):
+    """
+    Write gzip/brotli siblings of the hero model files ahead of the first
+    request for them, and chunk manifests of the converted variants.
+    """
+    urls = [source_url] + [variant["url"] for variant in model_variants]
+    paths = [_asset_path(url) for url in urls]
+    await run_in_process(compress_files, paths)
+    await run_in_process(write_chunk_manifests, paths[1:])
+    await _persist_uploads(urls, siblings=True)
+
+async def _publish_hero(db: AsyncIOMotorDatabase, job_id: str, source_url: str, result: dict) -> bool:
+    """
+    Swap a processed upload in as the hero in a single update, unless a
+    newer upload has been queued since. Text edited meanwhile is kept.
+    Returns whether the hero was swapped.
+    """
+    hero = {
+        "hero_image_base64": result["image_url"],
+        "hero_image_variants": [ImageVariant(**v).dict() for v in result["variants"]],
+        "hero_source_url": source_url,
+        "hero_model_variants": [ModelVariant(**v).dict() for v in result["model_variants"]],
+        "hero_model_tileset": None,
+        "hero_model_sort_orders": [],
+        "hero_model_metadata": ModelMetadata(**result["model_metadata"]).dict() if result["model_metadata"] else None,
+        "hero_model_poster": ImageVariant(**result["model_poster"]).dict() if result["model_poster"] else None,
+    }
+    update = await db.homepage_content.update_one(
+        {"id": "main", "hero_job_id": job_id},
+        {"$set": {
+            **{f"hero.{field}": value for field, value in hero.items()},
+            "updated_at": datetime.now()
+        }}
+    )
+    if update.matched_count:
+        homepage_cache.invalidate()
+    return bool(update.matched_count)
+
+async def _run_job_stage(db: AsyncIOMotorDatabase, job: dict, name: str, stage) -> None:
+    await set_stage(db, job, name, "running")
+    try:
+        await stage()
+    except Exception as e:
+        logger.exception(f"Stage {name} of asset job {job['id']} failed")
+        await set_stage(db, job, name, "failed", str(e))
+        if name not in HERO_OPTIONAL_STAGES:
+            raise
+    else:
+        await set_stage(db, job, name, "done")
+
+async def _run_hero_job(db: AsyncIOMotorDatabase, job: dict):
+    """
+    Process a stored hero upload off the request path, one stage at a
+    time, with the CPU-heavy work in the process pool. Direct uploads are
+    first fetched from storage and verified. Images get
+    responsive variants; gaussian splat PLY models are inspected (count,
+    SH degree, bounds, framing), converted to compact .splat and given a
+    CPU-rendered poster. A converted model becomes the served hero URL and
+    the original upload is kept as the source. Once published, model files
+    are precompressed and chunked, and tiles and auto-rotate sort orders
+    are built. With remote storage, every file is stored before the hero
+    points at it.
+    """
+    payload = job["payload"]
+    upload_path = _asset_path(payload["stored_filename"])
+    source_url = f"/uploads/{payload['stored_filename']}"
+    result = {
+        "image_url": source_url,
+        "variants": [],
+        "model_variants": [],
+        "model_metadata": None,
+        "model_poster": None
+    }
+    
+    async def fetch():
+        # The bytes never passed through the API, so nothing trusts them
+        # until they hash to the declared address and pass the format checks
+        temp_path = UPLOAD_DIR / f"{TEMP_UPLOAD_PREFIX}{job['id']}"
+        try:
+            if not await storage.fetch(payload["stored_filename"], temp_path):
+                raise ValueError("Uploaded file not found in storage")
+            await asyncio.to_thread(
+                verify_upload, temp_path, payload["filename"], payload["sha256"], DIRECT_UPLOAD_KINDS
+            )
+        except UploadRejected:
+            temp_path.unlink(missing_ok=True)
+            await storage.delete(payload["stored_filename"])
+            stored_files.discard(payload["stored_filename"])
+            raise
+        except Exception:
+            temp_path.unlink(missing_ok=True)
+            raise
+        upload_path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(temp_path, upload_path)
+    
+    async def variants():
+        result["variants"] = await run_in_process(generate_image_variants, upload_path, UPLOAD_DIR)
+    
+    async def inspect():
+        try:
+            result["model_metadata"] = await run_in_process(inspect_model, upload_path, payload["sha256"])
+        except ValueError:
+            result["model_metadata"] = None
+    
+    async def convert():
+        try:
+            result["model_variants"] = await run_in_process(process_model, upload_path, UPLOAD_DIR)
+        except ValueError:
+            # Not a gaussian splat PLY: serve the upload as-is
+            result["model_variants"] = []
+        if result["model_variants"]:
+            result["image_url"] = result["model_variants"][0]["url"]
+    
+    async def poster():
+        result["model_poster"] = await run_in_process(
+            render_poster_file, _asset_path(result["image_url"]), UPLOAD_DIR
+        )
+    
+    async def publish():
+        await _persist_uploads(
+            ([] if payload.get("direct") else [source_url])
+            + [variant["url"] for variant in result["variants"]]
+            + [variant["url"] for variant in result["model_variants"]]
+            + ([result["model_poster"]["url"]] if result["model_poster"] else [])
+        )
+        published = await _publish_hero(db, job["id"], source_url, result)
+        await save_job(db, job, published=published, superseded=not published, result=result)
+    
+    async def delivery():
+        await _prepare_hero_model_delivery(source_url, result["model_variants"])
+    
+    async def tiles():
+        await _build_hero_tileset(db, source_url, result["model_variants"][0]["url"])
+    
+    async def sort_orders():
+        await _build_hero_sort_orders(db, source_url, result["model_variants"])
+    
+    stages = {
+        "fetch": fetch,
+        "variants": variants,
+        "inspect": inspect,
+        "convert": convert,
+        "poster": poster,
+        "publish": publish,
+        "delivery": delivery,
+        "tiles": tiles,
+        "sort_orders": sort_orders
+    }
+    
+    def skipped(name: str) -> bool:
+        model_variants = result["model_variants"]
+        if name == "poster":
+            return not model_variants
+        if name in HERO_OPTIONAL_STAGES and not job["published"]:
+            return True
+        if name == "delivery":
+            return Path(source_url).suffix.lower() not in PRECOMPRESSED_EXTENSIONS
+        if name == "tiles":
+            return not model_variants or (model_variants[0].get("gaussian_count") or 0) < TILING_MIN_GAUSSIANS
+        if name == "sort_orders":
+            return not model_variants or not SORT_ORDER_AZIMUTHS
+        return False
+    
+    lease = asyncio.create_task(hold_lease(db, job))
+    try:
+        async with job_slots:
+            try:
+                await save_job(db, job, status="running")
+                for stage in job["stages"]:
+                    if skipped(stage["name"]):
+                        await set_stage(db, job, stage["name"], "skipped")
+                    else:
+                        await _run_job_stage(db, job, stage["name"], stages[stage["name"]])
+                await save_job(db, job, status="succeeded", result=result, finished_at=datetime.now())
+                
+            except Exception as e:
+                await save_job(db, job, status="failed", error=str(e), finished_at=datetime.now())
+    finally:
+        lease.cancel()
+
+async def _strip_upload_metadata(temp_path: Path, kind: str, sha256: str) -> str:
+    """
+    Drop EXIF (including GPS), XMP and text metadata from an uploaded
+    image before it is stored and served. Returns the SHA-256 the file
+    will be stored under.
+    """
+    if kind != "image":
+        return sha256
+    return await run_in_process(strip_image_metadata, temp_path) or sha256
+
+async def _queue_hero_job(
+    db: AsyncIOMotorDatabase,
+    filename: Optional[str],
+    kind: str,
+    stored_filename: str,
+    file_size: int,
+    sha256: str,
+    direct: bool = False
+) -> dict:
+    """
+    Queue processing of a stored hero upload and build the upload response.
+    The kind is the one validation found, so a file named without an
+    extension is processed as what its bytes are. The hero switches to
+    the upload when its job publishes it; poll GET /jobs/{job_id} for
+    progress. Direct uploads are still only in storage, so their job
+    starts by fetching them.
+    """
+    file_type = _hero_file_type(kind)
+    source_url = f"/uploads/{stored_filename}"
+    stages = HERO_IMAGE_STAGES if kind == "image" else HERO_MODEL_STAGES
+    
+    job = await create_job(
+        db,
+        "hero_upload",
+        ["fetch"] + stages if direct else stages,
+        {
+            "filename": filename,
+            "kind": kind,
+            "stored_filename": stored_filename,
+            "file_size": file_size,
+            "sha256": sha256,
+            "direct": direct
+        }
+    )
+    
+    # The newest upload wins: jobs queued before it no longer publish
+    await db.homepage_content.update_one(
+        {"id": "main"},
+        {"$set": {"hero_job_id": job["id"]}},
+        upsert=True
+    )
+    _start_background_task(_run_hero_job(db, job))
+    
+    return {
+        "message": f"Hero {file_type.lower()} uploaded successfully, processing in background", 
+        "image_url": source_url, 
+        "file_type": file_type,
+        "file_size": format_size(file_size),
+        "sha256": sha256,
+        "source_url": source_url,
+        "job_id": job["id"],
+        "job_url": f"/jobs/{job['id']}",
+        "status": job["status"]
+    }
+
+async def resume_asset_jobs(db: AsyncIOMotorDatabase) -> int:
+    """
+    Rerun jobs whose worker stopped before finishing them: claim each
+    unfinished job with a lapsed lease and run it here. Jobs another worker
+    is still running keep their lease and are left alone. Every stage
+    writes content-addressed files, so running one again is safe. Returns
+    the number resumed.
+    """
+    jobs = await claim_unfinished_jobs(db)
+    for job in jobs:
+        _start_background_task(_run_hero_job(db, job))
+    return len(jobs)
+
+@router.get("/jobs/{job_id}", response_model=AssetJob)
+async def get_asset_job(
+    job_id: str,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Status and per-stage progress of a background asset-processing job.
+    """
+    job = await get_job(db, job_id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    return AssetJob(**job)
 
 @router.post("/upload/hero")
 async def upload_hero_image(
@@ -149,73 +694,326 @@ async def upload_hero_image(
     Supports files up to 200MB.
     """
     try:
-        # Check file size (200MB limit)
-        MAX_SIZE = 200 * 1024 * 1024  # 200MB in bytes
-        
-        # Read file content
-        file_content = await file.read()
-        file_size = len(file_content)
-        
-        if file_size > MAX_SIZE:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File size ({file_size / (1024*1024):.1f}MB) exceeds maximum allowed size of 200MB"
-            )
+        # Stream the upload to a temp file in bounded chunks, rejecting
+        # files that aren't the image or model they claim to be
+        validator = UploadValidator(file.filename, HERO_UPLOAD_KINDS, MAX_HERO_UPLOAD_SIZE)
+        upload = await stream_upload_to_temp(file, UPLOAD_DIR, MAX_HERO_UPLOAD_SIZE, validator=validator)
         
-        # Generate unique filename
-        file_extension = Path(file.filename).suffix if file.filename else ""
-        unique_filename = f"hero_{uuid.uuid4()}{file_extension}"
-        file_path = UPLOAD_DIR / unique_filename
+        # Move the finished upload, minus image metadata, to its content address
+        sha256 = await _strip_upload_metadata(upload.temp_path, validator.kind, upload.sha256)
+        stored_filename, _ = store_file(upload.temp_path, UPLOAD_DIR, sha256, validator.extension)
         
-        # Save file to disk
-        async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(file_content)
+        # Store file path in database (not the file content)
+        return await _queue_hero_job(
+            db, file.filename, validator.kind, stored_filename, _asset_path(stored_filename).stat().st_size, sha256
+        )
         
-        # Determine file type
-        if file.filename and file.filename.endswith('.splat'):
-            file_type = "3D Splat Model"
-        elif file.filename and file.filename.endswith('.ply'):
-            file_type = "3D PLY Model"
-        else:
-            file_type = "Image"
+    except HTTPException:
+        # Re-raise HTTP exceptions (like file size errors)
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error uploading hero file: {str(e)}"
+        )
+
+def _session_response(session: dict) -> UploadSession:
+    received = merge_ranges(session.get("received", []))
+    return UploadSession(
+        id=session["id"],
+        filename=session["filename"],
+        size=session["size"],
+        received=received,
+        bytes_received=bytes_received(received),
+        complete=is_complete(received, session["size"]),
+        created_at=session["created_at"],
+        expires_at=session["expires_at"]
+    )
+
+async def _get_open_session(db: AsyncIOMotorDatabase, session_id: str) -> dict:
+    session = await db.upload_sessions.find_one({"id": session_id})
+    
+    if not session or session["expires_at"] < datetime.now():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found or expired"
+        )
+    
+    return session
+
+@router.post("/upload/hero/sessions", response_model=UploadSession)
+async def create_hero_upload_session(
+    session_create: UploadSessionCreate,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Start a resumable hero upload.
+    Chunks are then sent with PUT /upload/hero/sessions/{id}?offset=N and
+    the upload is finished with POST /upload/hero/sessions/{id}/complete.
+    """
+    if session_create.size > MAX_HERO_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File size ({format_size(session_create.size)}) exceeds maximum allowed size of 200MB"
+        )
+    
+    # Reject unsupported types and misaligned .splat sizes before any bytes arrive
+    check_declared_size(session_create.filename, session_create.size)
+    
+    try:
+        # Clean up abandoned sessions before starting a new one
+        await expire_upload_sessions(db, UPLOAD_DIR)
         
-        # Store file path in database (not the file content)
-        file_url = f"/uploads/{unique_filename}"
+        session_id = str(uuid.uuid4())
+        await create_part_file(UPLOAD_DIR, session_id, session_create.size)
         
-        # Get existing content
-        existing_content = await db.homepage_content.find_one({"id": "main"})
+        session = {
+            "id": session_id,
+            "filename": session_create.filename,
+            "size": session_create.size,
+            "received": [],
+            "created_at": datetime.now(),
+            "expires_at": session_expiry()
+        }
+        await db.upload_sessions.insert_one(session)
         
-        if existing_content:
-            current_content = HomepageContent(**existing_content)
-        else:
-            current_content = HomepageContent(id="main")
+        return _session_response(session)
         
-        # Update hero image with file URL
-        current_content.hero.hero_image_base64 = file_url
-        current_content.updated_at = datetime.now()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating upload session: {str(e)}"
+        )
+
+@router.get("/upload/hero/sessions/{session_id}", response_model=UploadSession)
+async def get_hero_upload_session(
+    session_id: str,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Report the byte ranges received so far, so a client can resume.
+    """
+    return _session_response(await _get_open_session(db, session_id))
+
+@router.put("/upload/hero/sessions/{session_id}", response_model=UploadSession)
+async def upload_hero_session_chunk(
+    session_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Write the raw request body into the session at the given byte offset.
+    """
+    session = await _get_open_session(db, session_id)
+    
+    if offset > session["size"]:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail=f"Offset {offset} is past declared upload size of {session['size']} bytes"
+        )
+    
+    try:
+        # The chunk holding the file head is checked as it streams in
+        validator = UploadValidator(session["filename"], HERO_UPLOAD_KINDS, MAX_HERO_UPLOAD_SIZE) if offset == 0 else None
+        written = await write_chunk(
+            UPLOAD_DIR, session_id, offset, session["size"], request.stream(), validator
+        )
         
-        # Save to database (only the file path, not the file content)
-        content_dict = current_content.dict()
-        await db.homepage_content.update_one(
-            {"id": "main"},
-            {"$set": content_dict},
-            upsert=True
+        # Record the range and push the expiry forward
+        session = await db.upload_sessions.find_one_and_update(
+            {"id": session_id},
+            {
+                "$push": {"received": [offset, offset + written]},
+                "$set": {"expires_at": session_expiry()}
+            },
+            return_document=ReturnDocument.AFTER
         )
         
-        return {
-            "message": f"Hero {file_type.lower()} uploaded successfully", 
-            "image_url": file_url, 
-            "file_type": file_type,
-            "file_size": f"{file_size / (1024*1024):.1f}MB"
-        }
+        return _session_response(session)
         
     except HTTPException:
-        # Re-raise HTTP exceptions (like file size errors)
         raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error uploading hero file: {str(e)}"
+            detail=f"Error writing upload chunk: {str(e)}"
+        )
+
+@router.post("/upload/hero/sessions/{session_id}/complete")
+async def complete_hero_upload_session(
+    session_id: str,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Finish a resumable upload and use the assembled file as the hero.
+    """
+    session = await _get_open_session(db, session_id)
+    received = merge_ranges(session.get("received", []))
+    
+    if not is_complete(received, session["size"]):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload incomplete: {bytes_received(received)} of {session['size']} bytes received"
+        )
+    
+    try:
+        validator = await asyncio.to_thread(
+            validate_file, session_part_path(UPLOAD_DIR, session_id), session["filename"]
+        )
+    except UploadRejected:
+        # The assembled file will never be usable, so drop the session
+        discard_session(UPLOAD_DIR, session_id)
+        await db.upload_sessions.delete_one({"id": session_id})
+        raise
+    
+    try:
+        sha256 = await finalize_hash(UPLOAD_DIR, session_id)
+        sha256 = await _strip_upload_metadata(
+            session_part_path(UPLOAD_DIR, session_id), validator.kind, sha256
+        )
+        
+        # Move the assembled file to its content address
+        stored_filename, _ = store_file(
+            session_part_path(UPLOAD_DIR, session_id),
+            UPLOAD_DIR,
+            sha256,
+            validator.extension
+        )
+        await db.upload_sessions.delete_one({"id": session_id})
+        
+        return await _queue_hero_job(
+            db, session["filename"], validator.kind, stored_filename, _asset_path(stored_filename).stat().st_size, sha256
+        )
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error completing upload session: {str(e)}"
+        )
+
+@router.delete("/upload/hero/sessions/{session_id}")
+async def abort_hero_upload_session(
+    session_id: str,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Abandon a resumable upload and remove its partial data.
+    """
+    discard_session(UPLOAD_DIR, session_id)
+    result = await db.upload_sessions.delete_one({"id": session_id})
+    
+    if result.deleted_count == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found or expired"
+        )
+    
+    return {"message": "Upload session aborted"}
+
+@router.get("/upload/hero/direct")
+async def get_hero_direct_upload_support():
+    """
+    Whether hero uploads can go straight to the storage bucket, and for
+    which file types. Clients ask before hashing a file for one.
+    """
+    return {
+        "available": storage.remote,
+        "extensions": [f".{kind}" for kind in DIRECT_UPLOAD_KINDS],
+        "max_size": MAX_HERO_UPLOAD_SIZE
+    }
+
+def _check_direct_upload(direct_upload: DirectUploadCreate) -> str:
+    """
+    Direct uploads are processed before their bytes are ever read, so the
+    kind must come from the file name. Returns it.
+    """
+    kind = check_declared_size(direct_upload.filename, direct_upload.size, DIRECT_UPLOAD_KINDS)
+    
+    if kind is None:
+        raise UploadRejected(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Direct uploads need a .ply or .splat file name"
+        )
+    
+    return kind
+
+@router.post("/upload/hero/direct", response_model=DirectUpload)
+async def create_hero_direct_upload(direct_upload: DirectUploadCreate):
+    """
+    Start a hero upload that goes straight to the storage bucket instead of
+    through the API. The client hashes the file first; the response is a
+    presigned form to POST it to, or exists=true if storage already holds
+    those bytes. Finish with POST /upload/hero/direct/complete.
+    Only models are accepted: images are small, and their metadata is
+    stripped on the way in, which a direct upload would bypass.
+    Returns 501 when assets are stored locally.
+    """
+    if direct_upload.size > MAX_HERO_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File size ({format_size(direct_upload.size)}) exceeds maximum allowed size of 200MB"
+        )
+    
+    _check_direct_upload(direct_upload)
+    
+    if not storage.remote:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Direct uploads need a remote storage backend"
+        )
+    
+    try:
+        stored_filename = content_address(direct_upload.sha256, normalize_extension(direct_upload.filename))
+        
+        if await storage.size(stored_filename) == direct_upload.size:
+            return DirectUpload(stored_filename=stored_filename, exists=True)
+        
+        form = await storage.upload_form(
+            stored_filename, _upload_media_type(stored_filename), direct_upload.size
+        )
+        return DirectUpload(stored_filename=stored_filename, upload_url=form["url"], fields=form["fields"])
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating direct upload: {str(e)}"
+        )
+
+@router.post("/upload/hero/direct/complete")
+async def complete_hero_direct_upload(
+    direct_upload: DirectUploadCreate,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Use a file uploaded straight to storage as the hero. Its job fetches
+    and verifies the bytes before anything else happens to them.
+    """
+    if not storage.remote:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Direct uploads need a remote storage backend"
+        )
+    
+    kind = _check_direct_upload(direct_upload)
+    stored_filename = content_address(direct_upload.sha256, normalize_extension(direct_upload.filename))
+    stored_size = await storage.size(stored_filename)
+    
+    if stored_size != direct_upload.size:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload incomplete: storage holds {stored_size or 0} of {direct_upload.size} bytes"
+        )
+    
+    try:
+        return await _queue_hero_job(
+            db, direct_upload.filename, kind, stored_filename, direct_upload.size, direct_upload.sha256, direct=True
+        )
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error completing direct upload: {str(e)}"
         )
 
 @router.post("/upload/demo/{index}")
@@ -235,12 +1033,29 @@ async def upload_demo_image(
                 detail="Demo image index must be between 0 and 2"
             )
         
-        # Read file content
-        file_content = await file.read()
+        # Stream the image to disk, strip its metadata and store it by content hash
+        upload = await stream_upload_to_temp(
+            file,
+            UPLOAD_DIR,
+            MAX_DEMO_UPLOAD_SIZE,
+            validator=UploadValidator(file.filename, DEMO_UPLOAD_KINDS, MAX_DEMO_UPLOAD_SIZE)
+        )
+        sha256 = await run_in_process(strip_image_metadata, upload.temp_path) or upload.sha256
+        stored_filename, _ = store_file(
+            upload.temp_path,
+            UPLOAD_DIR,
+            sha256,
+            image_extension(file.content_type, file.filename)
+        )
         
-        # Convert to base64
-        base64_content = base64.b64encode(file_content).decode('utf-8')
-        data_url = f"data:{file.content_type};base64,{base64_content}"
+        # Only the file path is kept in the content document
+        file_url = f"/uploads/{stored_filename}"
+        
+        # Responsive variants for srcset, generated in the process pool
+        image_variants = await run_in_process(
+            generate_image_variants, _asset_path(stored_filename), UPLOAD_DIR
+        )
+        await _persist_uploads([file_url] + [variant["url"] for variant in image_variants])
         
         # Get existing content
         existing_content = await db.homepage_content.find_one({"id": "main"})
@@ -252,7 +1067,8 @@ async def upload_demo_image(
         
         # Update demo image
         if index < len(current_content.demo_items):
-            current_content.demo_items[index].image_base64 = data_url
+            current_content.demo_items[index].image_base64 = file_url
+            current_content.demo_items[index].image_variants = [ImageVariant(**v) for v in image_variants]
         
         current_content.updated_at = datetime.now()
         
@@ -263,46 +1079,392 @@ async def upload_demo_image(
             {"$set": content_dict},
             upsert=True
         )
+        await homepage_cache.set(current_content)
         
-        return {"message": f"Demo image {index} uploaded successfully", "image_url": data_url}
+        return {
+            "message": f"Demo image {index} uploaded successfully",
+            "image_url": file_url,
+            "variants": image_variants
+        }
         
+    except UploadRejected:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error uploading demo image: {str(e)}"
         )
 
-@router.get("/uploads/{filename}")
-@router.head("/uploads/{filename}")
-async def serve_uploaded_file(filename: str):
+async def migrate_legacy_demo_images(db: AsyncIOMotorDatabase) -> dict:
     """
-    Serve uploaded files from the uploads directory.
-    Supports both GET and HEAD requests.
+    Run the demo image migration and drop the cached content if it changed.
+    """
+    stats = await migrate_demo_images(db, UPLOAD_DIR)
+    if stats["images"]:
+        homepage_cache.invalidate()
+    return stats
+
+@router.post("/migrations/demo-images")
+async def run_demo_image_migration(
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: dict = Depends(get_admin_user)
+):
+    """
+    Move any remaining base64 demo images into the asset store.
+    Also runs in the background at startup.
+    """
+    try:
+        return await migrate_legacy_demo_images(db)
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error migrating demo images: {str(e)}"
+        )
+
+async def migrate_upload_layout() -> dict:
+    """
+    Move uploaded files still in the flat upload directory into shards.
+    """
+    return await migrate_to_sharded_layout(UPLOAD_DIR)
+
+@router.post("/migrations/sharded-layout")
+async def run_sharded_layout_migration(
+    current_user: dict = Depends(get_admin_user)
+):
+    """
+    Move any files left in the flat upload directory into the sharded
+    layout. Also runs in the background at startup.
+    """
+    try:
+        return await migrate_upload_layout()
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error migrating upload layout: {str(e)}"
+        )
+
+async def collect_asset_garbage(db: AsyncIOMotorDatabase, **options) -> dict:
+    """
+    Sweep abandoned upload sessions, then unreferenced uploaded files.
+    """
+    await expire_upload_sessions(db, UPLOAD_DIR)
+    stats = await collect_garbage(db, UPLOAD_DIR, storage, **options)
+    if stats["deleted"] and not stats["dry_run"]:
+        stored_files.clear()
+    return stats
+
+@router.post("/maintenance/asset-gc")
+async def run_asset_garbage_collection(
+    dry_run: bool = Query(False),
+    limit: Optional[int] = Query(None, ge=1),
+    after: Optional[str] = Query(None),
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    current_user: dict = Depends(get_admin_user)
+):
+    """
+    Delete uploaded files no content or pending job references, once past
+    the grace period, and report the bytes reclaimed. dry_run only reports.
+    With limit, pass the returned next_after as after to continue.
+    Also runs on a schedule.
+    """
+    try:
+        return await collect_asset_garbage(db, dry_run=dry_run, limit=limit, after=after)
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error collecting unused assets: {str(e)}"
+        )
+
+async def _tileset_manifest_path(tileset_id: str) -> Path:
+    if not re.fullmatch(r"[0-9a-f]{64}", tileset_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tileset not found"
+        )
+    return await _uploaded_file_path(tileset_manifest_path(UPLOAD_DIR, tileset_id).name)
+
+@router.get("/tilesets/{tileset_id}")
+async def get_tileset_manifest(tileset_id: str, request: Request):
+    """
+    Octree manifest of a tiled model: per-tile bounds, children and the
+    byte range of each tile in the packed file.
+    """
+    return ranged_file_response(
+        request,
+        await _tileset_manifest_path(tileset_id),
+        media_type="application/json",
+        etag=f'"{tileset_id}-manifest"',
+        headers={"cache-control": IMMUTABLE_CACHE_CONTROL}
+    )
+
+@router.get("/tilesets/{tileset_id}/tiles/{tile_id}")
+@router.head("/tilesets/{tileset_id}/tiles/{tile_id}")
+async def get_tile(tileset_id: str, tile_id: str, request: Request):
+    """
+    Serve one tile as a standalone .splat, sliced from the packed tileset
+    by its precomputed byte range.
+    """
+    manifest = load_tileset_manifest(await _tileset_manifest_path(tileset_id))
+    tile = manifest["tiles"].get(tile_id)
+    if tile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tile not found"
+        )
+    
+    return file_slice_response(
+        request,
+        await _uploaded_file_path(f"{tileset_id}{TILESET_EXTENSION}"),
+        tile["offset"],
+        tile["length"],
+        media_type=manifest["media_type"],
+        etag=f'"{tileset_id}-{tile_id}"',
+        headers={"cache-control": IMMUTABLE_CACHE_CONTROL}
+    )
+
+@router.get("/sort-orders/{orders_id}/{azimuth}")
+@router.head("/sort-orders/{orders_id}/{azimuth}")
+async def get_sort_order(
+    orders_id: str,
+    azimuth: int,
+    request: Request,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Serve the precomputed back-to-front order for one auto-rotate azimuth
+    step as raw little-endian indices (the whole file holds every step).
+    """
+    entry = await homepage_cache.get(lambda: _load_homepage_content(db))
+    for variant_orders in entry.content.hero.hero_model_sort_orders:
+        if variant_orders.id == orders_id:
+            break
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sort orders not found"
+        )
+    
+    if not 0 <= azimuth < variant_orders.azimuths:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Azimuth step out of range"
+        )
+    
+    block_size = variant_orders.size_bytes // variant_orders.azimuths
+    return file_slice_response(
+        request,
+        await _uploaded_file_path(f"{orders_id}{SORT_ORDER_EXTENSION}"),
+        azimuth * block_size,
+        block_size,
+        media_type="application/octet-stream",
+        etag=f'"{orders_id}-{azimuth}"',
+        headers={"cache-control": IMMUTABLE_CACHE_CONTROL}
+    )
+
+async def _uploaded_file_path(filename: str) -> Path:
     """
-    file_path = UPLOAD_DIR / filename
+    Local path of an uploaded file, fetched into the working copy from
+    storage if this node doesn't have it yet.
+    """
+    file_path = _asset_path(filename)
     
-    if not file_path.exists():
+    # In-flight uploads are never served
+    if filename.startswith(TEMP_UPLOAD_PREFIX) or (
+        not file_path.is_file() and not (storage.remote and await storage.fetch(filename, file_path))
+    ):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found"
         )
+    return file_path
+
+async def _prebuilt_chunk_manifest(filename: str) -> Tuple[Path, dict]:
+    """
+    An uploaded file and the chunk manifest its hero job wrote. Hashing a
+    large file is too slow for a request, so a missing one is a 404.
+    """
+    file_path = await _uploaded_file_path(filename)
+    manifest = await asyncio.to_thread(load_chunk_manifest, file_path)
     
-    # Determine media type based on file extension
-    file_extension = file_path.suffix.lower()
-    media_type_map = {
-        '.ply': 'application/ply',
-        '.splat': 'application/splat',
-        '.jpg': 'image/jpeg',
-        '.jpeg': 'image/jpeg',
-        '.png': 'image/png',
-        '.gif': 'image/gif',
-        '.webp': 'image/webp'
-    }
+    if manifest is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chunk manifest not found"
+        )
     
-    media_type = media_type_map.get(file_extension, 'application/octet-stream')
+    return file_path, manifest
+
+@router.get("/uploads/{filename}/chunks")
+async def get_chunk_manifest(filename: str):
+    """
+    Split an uploaded file into fixed-size chunks, each with its own
+    SHA-256, so clients can fetch them in parallel, verify them and cache
+    them individually. Chunk URLs carry their hash for cache keying.
+    Only model variants processed by a hero job have a manifest.
+    """
+    file_path, manifest = await _prebuilt_chunk_manifest(filename)
+    
+    offset = 0
+    chunks = []
+    for index, chunk in enumerate(manifest["chunks"]):
+        chunks.append({
+            "index": index,
+            "offset": offset,
+            "length": chunk["length"],
+            "sha256": chunk["sha256"],
+            "url": f"/uploads/{filename}/chunks/{index}?sha256={chunk['sha256']}"
+        })
+        offset += chunk["length"]
+    
+    cache_control = IMMUTABLE_CACHE_CONTROL if content_hash(filename) else "no-cache"
+    return JSONResponse(
+        content={
+            "url": f"/uploads/{filename}",
+            "size": manifest["size"],
+            "sha256": manifest["sha256"],
+            "chunk_size": manifest["chunk_size"],
+            "chunks": chunks
+        },
+        headers={"cache-control": cache_control}
+    )
+
+@router.get("/uploads/{filename}/chunks/{index}")
+@router.head("/uploads/{filename}/chunks/{index}")
+async def get_chunk(filename: str, index: int, request: Request):
+    """
+    Serve one chunk of an uploaded file as a standalone 200 response,
+    validated by the chunk's own hash.
+    """
+    file_path, manifest = await _prebuilt_chunk_manifest(filename)
+    if not 0 <= index < len(manifest["chunks"]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chunk not found"
+        )
+    
+    chunk = manifest["chunks"][index]
+    return file_slice_response(
+        request,
+        file_path,
+        index * manifest["chunk_size"],
+        chunk["length"],
+        media_type="application/octet-stream",
+        etag=f'"{chunk["sha256"]}"',
+        headers={"cache-control": IMMUTABLE_CACHE_CONTROL if content_hash(filename) else "no-cache"}
+    )
+
+async def _storage_redirect(filename: str, request: Request) -> RedirectResponse:
+    """
+    Send a read of a stored file to the bucket, picking a precompressed
+    sibling the same way the API would. Presigned URLs expire, so only
+    redirects to a public URL may be cached.
+    """
+    target = filename
+    headers = {"cache-control": IMMUTABLE_CACHE_CONTROL if storage.public_reads else "no-store"}
+    
+    if Path(filename).suffix.lower() in PRECOMPRESSED_EXTENSIONS:
+        headers["vary"] = "Accept-Encoding"
+        accept_encoding = request.headers.get("accept-encoding")
+        if accept_encoding and "range" not in request.headers:
+            stored_encodings = [
+                encoding for encoding, suffix in ENCODING_SUFFIXES.items()
+                if await _is_stored(filename + suffix)
+            ]
+            encoding = negotiate_encoding(accept_encoding, stored_encodings)
+            if encoding:
+                target = filename + ENCODING_SUFFIXES[encoding]
+    
+    return RedirectResponse(
+        await storage.read_url(target),
+        status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+        headers=headers
+    )
+
+@router.get("/uploads/{filename}")
+@router.head("/uploads/{filename}")
+async def serve_uploaded_file(
+    filename: str,
+    request: Request,
+    budget: Optional[int] = Query(None, ge=SPLAT_DTYPE.itemsize)
+):
+    """
+    Serve uploaded files from the uploads directory.
+    Supports both GET and HEAD requests, byte ranges (single and multipart),
+    and conditional requests via ETag / Last-Modified.
+    For .splat models, ?budget=N returns the largest whole-record prefix
+    within N bytes; processed models are importance ordered, so the prefix
+    is a complete coarse model. Full model responses use precompressed
+    gzip/brotli siblings according to Accept-Encoding.
+    With remote storage, full reads of stored content-addressed files
+    redirect to the bucket.
+    """
+    file_extension = _upload_extension(filename)
+    media_type = _upload_media_type(filename)
+    
+    # Content-addressed files never change: cache them forever under a
+    # content-derived ETag. Legacy names are revalidated on every use.
+    sha256 = content_hash(filename)
+    if sha256:
+        etag = f'"{sha256}"'
+        cache_control = IMMUTABLE_CACHE_CONTROL
+    else:
+        etag = None
+        cache_control = "no-cache"
+    
+    if storage.remote and sha256 and budget is None and await _is_stored(filename):
+        return await _storage_redirect(filename, request)
+    
+    file_path = await _uploaded_file_path(filename)
+    
+    if budget is not None:
+        if file_extension != '.splat':
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Byte budgets are only supported for .splat models"
+            )
+        
+        # Whole records only, so the prefix is always a valid model
+        length = budget - budget % SPLAT_DTYPE.itemsize
+        validator = etag or file_etag(file_path.stat())
+        return prefix_file_response(
+            request,
+            file_path,
+            length,
+            media_type=media_type,
+            etag=f'{validator[:-1]}-b{length}"',
+            headers={"cache-control": cache_control}
+        )
+    
+    headers = {"cache-control": cache_control}
+    
+    # Models are sent precompressed when the client accepts it. Range
+    # requests address the identity bytes, so they are never encoded.
+    if file_path.suffix.lower() in PRECOMPRESSED_EXTENSIONS:
+        headers["vary"] = "Accept-Encoding"
+        encoding = None
+        if "range" not in request.headers:
+            encoding = negotiate_encoding(
+                request.headers.get("accept-encoding"), available_encodings(file_path)
+            )
+        if encoding:
+            headers["content-encoding"] = encoding
+            return ranged_file_response(
+                request,
+                compressed_sibling(file_path, encoding),
+                media_type=media_type,
+                filename=filename,
+                etag=f'{etag[:-1]}-{encoding}"' if etag else None,
+                headers=headers
+            )
     
-    return FileResponse(
-        path=file_path,
+    return ranged_file_response(
+        request,
+        file_path,
         media_type=media_type,
-        filename=filename
+        filename=filename,
+        etag=etag,
+        headers=headers
     )
\ No newline at end of file
@@ -3,6 +3,7 @@ from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import asyncio
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
@@ -16,7 +17,11 @@ load_dotenv(ROOT_DIR / '.env')
 # Import homepage routes
 import sys
 sys.path.append(str(ROOT_DIR))
-from routes.homepage import router as homepage_router
+from routes.homepage import router as homepage_router, UPLOAD_SIZE_LIMITS, collect_asset_garbage, migrate_legacy_demo_images, migrate_upload_layout, resume_asset_jobs
+from services.asset_gc import ASSET_GC_INTERVAL_SECONDS, ASSET_GC_SCHEDULED_LIMIT
+from services.asset_jobs import ASSET_JOB_LEASE_SECONDS
+from services.processing import shutdown_process_pool
+from services.uploads import UploadSizeLimitMiddleware
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
@@ -31,6 +36,9 @@ app = FastAPI(
 )
 
 # Configure maximum request size (200MB)
+app.add_middleware(UploadSizeLimitMiddleware, limits=UPLOAD_SIZE_LIMITS)
+
+# Added last so it wraps the size limit and its 413s keep CORS headers
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -81,6 +89,76 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Keep references to background tasks so they aren't garbage collected
+background_tasks = set()
+
+async def _migrate_demo_images_in_background():
+    try:
+        await migrate_legacy_demo_images(database)
+    except Exception:
+        logger.exception("Demo image migration failed")
+
+async def _migrate_upload_layout_in_background():
+    try:
+        await migrate_upload_layout()
+    except Exception:
+        logger.exception("Upload layout migration failed")
+
+@app.on_event("startup")
+async def start_background_migrations():
+    # Move legacy base64 demo images to disk without delaying startup
+    task = asyncio.create_task(_migrate_demo_images_in_background())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+    # Move files from the flat upload directory into hash-prefix shards
+    task = asyncio.create_task(_migrate_upload_layout_in_background())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+async def _resume_asset_jobs_periodically():
+    # Uploads whose processing was cut short by a restart, here or on
+    # another worker, are processed again once their job's lease lapses
+    while True:
+        try:
+            resumed = await resume_asset_jobs(database)
+            if resumed:
+                logger.info(f"Resumed {resumed} asset processing jobs")
+        except Exception:
+            logger.exception("Resuming asset jobs failed")
+        await asyncio.sleep(ASSET_JOB_LEASE_SECONDS)
+
+@app.on_event("startup")
+async def resume_interrupted_asset_jobs():
+    task = asyncio.create_task(_resume_asset_jobs_periodically())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+async def _collect_asset_garbage_periodically():
+    # Each sweep examines a slice of the uploads directory and the next one
+    # continues after it, wrapping around at the end
+    after = None
+    while True:
+        await asyncio.sleep(ASSET_GC_INTERVAL_SECONDS)
+        try:
+            stats = await collect_asset_garbage(database, limit=ASSET_GC_SCHEDULED_LIMIT, after=after)
+            after = stats["next_after"]
+            if stats["deleted"]:
+                logger.info(f"Removed {stats['deleted']} unused assets, {stats['bytes_reclaimed']} bytes reclaimed")
+        except Exception:
+            logger.exception("Asset garbage collection failed")
+
+@app.on_event("startup")
+async def start_asset_garbage_collection():
+    if ASSET_GC_INTERVAL_SECONDS > 0:
+        task = asyncio.create_task(_collect_asset_garbage_periodically())
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
+
+@app.on_event("shutdown")
+async def shutdown_asset_workers():
+    shutdown_process_pool()
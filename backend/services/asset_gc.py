@@ -0,0 +1,232 @@
+import asyncio
+import os
+import re
+import time
+from pathlib import Path
+from typing import List, Optional, Set
+from services.asset_store import resolve_asset
+from services.asset_jobs import UNFINISHED_JOB_STATUSES
+from services.chunks import CHUNK_MANIFEST_SUFFIX
+from services.compression import ENCODING_SUFFIXES
+from services.splats.tiles import TILESET_EXTENSION, TILESET_MANIFEST_SUFFIX
+from services.storage import AssetStorage
+from services.upload_sessions import session_part_path
+
+# Unreferenced files younger than this are kept: uploads still being
+# processed, and files an in-flight edit is about to point at
+ASSET_GC_GRACE_SECONDS = int(os.environ.get("ASSET_GC_GRACE_HOURS", "24")) * 3600
+
+# Hours between scheduled sweeps (0 disables them), and the files each
+# scheduled sweep examines before handing over to the next one
+ASSET_GC_INTERVAL_SECONDS = int(os.environ.get("ASSET_GC_INTERVAL_HOURS", "6")) * 3600
+ASSET_GC_SCHEDULED_LIMIT = int(os.environ.get("ASSET_GC_SCHEDULED_LIMIT", "5000"))
+
+# Files examined per batch, and the pause between batches so a sweep never
+# starves request handling
+ASSET_GC_BATCH_SIZE = 200
+ASSET_GC_BATCH_PAUSE = 0.05
+
+# Cursor prefix of a sweep that has finished the working copy and moved on
+# to the files remote storage holds
+STORAGE_CURSOR_PREFIX = "storage:"
+
+UPLOAD_REFERENCE = re.compile(r"/uploads/([^/?#\s\"']+)")
+
+# One sweep at a time, scheduled or on demand
+_sweep_lock = asyncio.Lock()
+
+def _collect_references(value, referenced: Set[str]) -> None:
+    if isinstance(value, str):
+        referenced.update(UPLOAD_REFERENCE.findall(value))
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect_references(item, referenced)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_references(item, referenced)
+
+async def referenced_assets(db) -> Set[str]:
+    """
+    Names of every uploaded file a content document or an unfinished job
+    points at. Any `/uploads/<name>` string counts, wherever it is stored,
+    so new content fields are protected without changes here.
+    """
+    referenced: Set[str] = set()
+    async for document in db.homepage_content.find({}):
+        _collect_references(document, referenced)
+    async for job in db.asset_jobs.find({"status": {"$in": UNFINISHED_JOB_STATUSES}}):
+        referenced.add(job["payload"]["stored_filename"])
+        _collect_references(job.get("result"), referenced)
+    return referenced
+
+def base_asset_name(filename: str) -> str:
+    """
+    The file a derived file was built from: precompressed siblings and
+    chunk manifests belong to their asset, tileset manifests to the packed
+    tiles. Other files are their own base.
+    """
+    for suffix in list(ENCODING_SUFFIXES.values()) + [CHUNK_MANIFEST_SUFFIX]:
+        if filename.endswith(suffix) and len(filename) > len(suffix):
+            return filename[:-len(suffix)]
+    if filename.endswith(TILESET_MANIFEST_SUFFIX):
+        return filename[:-len(TILESET_MANIFEST_SUFFIX)] + TILESET_EXTENSION
+    return filename
+
+def _list_files(upload_dir: Path, after: Optional[str], limit: Optional[int]) -> List[str]:
+    """
+    Paths of the files under the upload directory, relative to it, that
+    come after `after`: shard directories and files not yet migrated out
+    of the root. Each directory's entries are visited in name order, and
+    directories wholly before the cursor are skipped unread, so an
+    incremental sweep only lists the shards it reaches. Stops once it has
+    `limit` + 1 paths, enough to tell whether more remain.
+    """
+    cursor = tuple(after.split("/")) if after else ()
+    paths = []
+
+    def walk(directory: Path, parts: tuple) -> bool:
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except FileNotFoundError:
+            return True
+        for entry in entries:
+            entry_parts = parts + (entry.name,)
+            if entry.is_dir(follow_symlinks=False):
+                if entry_parts >= cursor[:len(entry_parts)] and not walk(Path(entry.path), entry_parts):
+                    return False
+            elif entry_parts > cursor:
+                paths.append("/".join(entry_parts))
+                if limit is not None and len(paths) > limit:
+                    return False
+        return True
+
+    walk(upload_dir, ())
+    return paths
+
+def _age(path: Path, now: float) -> Optional[float]:
+    try:
+        return now - path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+async def collect_garbage(
+    db,
+    upload_dir: Path,
+    storage: Optional[AssetStorage] = None,
+    grace_seconds: int = ASSET_GC_GRACE_SECONDS,
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
+    dry_run: bool = False
+) -> dict:
+    """
+    Delete uploaded files nothing references any more, once they are older
+    than the grace period. Derived files (precompressed siblings, chunk and
+    tileset manifests) share the fate of the file they were built from;
+    stale temp files of interrupted uploads and writes go too. Remote
+    copies are deleted along with local ones, and with remote storage the
+    files only it holds are swept after the working copy.
+
+    Files are visited in path order, then stored files in name order. With
+    `limit`, a sweep stops after that many files and reports `next_after`,
+    the cursor to resume after, so large upload directories and buckets can
+    be swept incrementally.
+    """
+    async with _sweep_lock:
+        stats = {
+            "scanned": 0,
+            "deleted": 0,
+            "bytes_reclaimed": 0,
+            "kept": 0,
+            "dry_run": dry_run,
+            "next_after": None
+        }
+
+        referenced = await referenced_assets(db)
+        live_parts = {
+            session_part_path(upload_dir, session["id"]).name
+            async for session in db.upload_sessions.find({})
+        }
+        remote = storage is not None and storage.remote
+        storage_after = None
+        if after is not None and after.startswith(STORAGE_CURSOR_PREFIX):
+            storage_after = after[len(STORAGE_CURSOR_PREFIX):]
+            relative_paths = []
+        else:
+            relative_paths = await asyncio.to_thread(_list_files, upload_dir, after, limit)
+        if limit is not None and len(relative_paths) > limit:
+            relative_paths = relative_paths[:limit]
+            stats["next_after"] = relative_paths[-1]
+
+        now = time.time()
+        for start in range(0, len(relative_paths), ASSET_GC_BATCH_SIZE):
+            for relative_path in relative_paths[start:start + ASSET_GC_BATCH_SIZE]:
+                path = upload_dir / relative_path
+                name = path.name
+                stats["scanned"] += 1
+
+                age = _age(path, now)
+                if age is None:
+                    continue
+
+                if name in live_parts or age <= grace_seconds:
+                    garbage = False
+                elif name.startswith("."):
+                    # Temp files of uploads and atomic writes that never finished
+                    garbage = True
+                else:
+                    base = base_asset_name(name)
+                    # Derived files are written beside the file they came from
+                    base_age = _age(path.with_name(base), now) if base != name else age
+                    garbage = base not in referenced and (base_age is None or base_age > grace_seconds)
+
+                if not garbage:
+                    stats["kept"] += 1
+                    continue
+
+                size = _size(path)
+                if not dry_run:
+                    path.unlink(missing_ok=True)
+                    if storage is not None and storage.remote and not name.startswith("."):
+                        await storage.delete(name)
+                stats["deleted"] += 1
+                stats["bytes_reclaimed"] += size
+
+            await asyncio.sleep(ASSET_GC_BATCH_PAUSE)
+
+        remaining = None if limit is None else limit - len(relative_paths)
+        if remote and stats["next_after"] is None and remaining == 0:
+            stats["next_after"] = STORAGE_CURSOR_PREFIX
+        elif remote and stats["next_after"] is None:
+            stored_files = await storage.list(storage_after or None, None if remaining is None else remaining + 1)
+            if remaining is not None and len(stored_files) > remaining:
+                stored_files = stored_files[:remaining]
+                stats["next_after"] = STORAGE_CURSOR_PREFIX + stored_files[-1].name
+
+            for start in range(0, len(stored_files), ASSET_GC_BATCH_SIZE):
+                for stored_file in stored_files[start:start + ASSET_GC_BATCH_SIZE]:
+                    name = stored_file.name
+                    stats["scanned"] += 1
+
+                    # Files in the working copy were swept above
+                    if resolve_asset(upload_dir, name).exists():
+                        continue
+
+                    age = now - stored_file.modified
+                    if base_asset_name(name) in referenced or age <= grace_seconds:
+                        stats["kept"] += 1
+                        continue
+
+                    if not dry_run:
+                        await storage.delete(name)
+                    stats["deleted"] += 1
+                    stats["bytes_reclaimed"] += stored_file.size
+
+                await asyncio.sleep(ASSET_GC_BATCH_PAUSE)
+
+        return stats
@@ -0,0 +1,137 @@
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+# Jobs processed at once; their CPU-heavy stages share the process pool
+ASSET_JOB_CONCURRENCY = int(os.environ.get("ASSET_JOB_CONCURRENCY", "2"))
+
+# Jobs that had not finished when the server stopped
+UNFINISHED_JOB_STATUSES = ["queued", "running"]
+
+# A worker holds a lease on each job it runs and renews it while the job is
+# queued or running; a job whose lease has lapsed lost its worker and may
+# be claimed by another
+ASSET_JOB_LEASE_SECONDS = int(os.environ.get("ASSET_JOB_LEASE_SECONDS", "300"))
+
+# Identifies this process as the owner of the jobs it leases
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+job_slots = asyncio.Semaphore(ASSET_JOB_CONCURRENCY)
+
+def _lease_expiry() -> datetime:
+    return datetime.now() + timedelta(seconds=ASSET_JOB_LEASE_SECONDS)
+
+def _stage(name: str) -> dict:
+    return {"name": name, "status": "pending", "error": None, "started_at": None, "finished_at": None}
+
+async def create_job(db: AsyncIOMotorDatabase, kind: str, stages: List[str], payload: dict) -> dict:
+    """
+    Record a queued job. `payload` holds everything needed to run (or
+    rerun) it, so jobs survive a restart. The job is leased to this worker.
+    """
+    now = datetime.now()
+    job = {
+        "id": str(uuid.uuid4()),
+        "kind": kind,
+        "status": "queued",
+        "owner": WORKER_ID,
+        "lease_expires_at": _lease_expiry(),
+        "stages": [_stage(name) for name in stages],
+        "progress": 0.0,
+        "published": False,
+        "superseded": False,
+        "payload": payload,
+        "result": {},
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+        "finished_at": None,
+    }
+    await db.asset_jobs.insert_one(job)
+    job.pop("_id", None)
+    return job
+
+async def save_job(db: AsyncIOMotorDatabase, job: dict, **changes) -> None:
+    """
+    Apply changes to a job and persist its state, renewing the lease while
+    it is unfinished. The runner owns the job document, so the whole
+    mutable state is written each time; a worker whose job was claimed by
+    another no longer writes to it.
+    """
+    job.update(changes)
+    finished = sum(1 for stage in job["stages"] if stage["status"] in ("done", "skipped", "failed"))
+    job["progress"] = finished / len(job["stages"]) if job["stages"] else 1.0
+    job["updated_at"] = datetime.now()
+    job["lease_expires_at"] = _lease_expiry() if job["status"] in UNFINISHED_JOB_STATUSES else None
+    await db.asset_jobs.update_one(
+        {"id": job["id"], "owner": WORKER_ID},
+        {"$set": {
+            key: job[key]
+            for key in ("status", "stages", "progress", "published", "superseded", "result", "error", "updated_at", "finished_at", "lease_expires_at")
+        }}
+    )
+
+async def hold_lease(db: AsyncIOMotorDatabase, job: dict) -> None:
+    """
+    Keep renewing this worker's lease on a job, for as long as it waits
+    for a slot or runs a long stage. Runs until cancelled.
+    """
+    while True:
+        await asyncio.sleep(ASSET_JOB_LEASE_SECONDS / 3)
+        job["lease_expires_at"] = _lease_expiry()
+        await db.asset_jobs.update_one(
+            {"id": job["id"], "owner": WORKER_ID, "status": {"$in": UNFINISHED_JOB_STATUSES}},
+            {"$set": {"lease_expires_at": job["lease_expires_at"]}}
+        )
+
+async def set_stage(db: AsyncIOMotorDatabase, job: dict, name: str, status: str, error: Optional[str] = None) -> None:
+    for stage in job["stages"]:
+        if stage["name"] == name:
+            stage["status"] = status
+            stage["error"] = error
+            if status == "running":
+                stage["started_at"] = datetime.now()
+            else:
+                stage["finished_at"] = datetime.now()
+    await save_job(db, job)
+
+async def get_job(db: AsyncIOMotorDatabase, job_id: str) -> Optional[dict]:
+    return await db.asset_jobs.find_one({"id": job_id})
+
+async def claim_unfinished_jobs(db: AsyncIOMotorDatabase) -> List[dict]:
+    """
+    Unfinished jobs whose lease has lapsed, oldest first, each claimed for
+    this worker and reset to be run again. A job is claimed in a single
+    update, so when workers race for it only one gets it.
+    """
+    now = datetime.now()
+    lapsed = {
+        "status": {"$in": UNFINISHED_JOB_STATUSES},
+        "$or": [{"lease_expires_at": None}, {"lease_expires_at": {"$lt": now}}]
+    }
+    candidates = await db.asset_jobs.find(lapsed).sort("created_at", 1).to_list(None)
+
+    jobs = []
+    for candidate in candidates:
+        job = await db.asset_jobs.find_one_and_update(
+            {"id": candidate["id"], **lapsed},
+            {"$set": {
+                "owner": WORKER_ID,
+                "lease_expires_at": _lease_expiry(),
+                "status": "queued",
+                "stages": [_stage(stage["name"]) for stage in candidate["stages"]],
+                "published": False,
+                "result": {},
+                "updated_at": now
+            }},
+            return_document=ReturnDocument.AFTER
+        )
+        if job:
+            job.pop("_id", None)
+            jobs.append(job)
+    return jobs
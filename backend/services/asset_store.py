@@ -0,0 +1,116 @@
+import hashlib
+import mimetypes
+import os
+import re
+import uuid
+from pathlib import Path
+from typing import Optional, Tuple
+from services.uploads import TEMP_UPLOAD_PREFIX
+
+# Content-addressed files never change, so they can be cached forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# `<sha256><.ext>` names produced by the store
+CONTENT_ADDRESSED_NAME = re.compile(r"^(?P<sha256>[0-9a-f]{64})(?P<ext>(\.[a-z0-9]+)*)$")
+
+def normalize_extension(filename: Optional[str]) -> str:
+    """
+    Lower-cased extension of an uploaded file name, limited to safe characters.
+    """
+    if not filename:
+        return ""
+    suffix = Path(filename).suffix.lower()
+    return suffix if re.fullmatch(r"\.[a-z0-9]+", suffix) else ""
+
+def image_extension(content_type: Optional[str], filename: Optional[str] = None) -> str:
+    """
+    File extension for an uploaded image, from its name or MIME type.
+    """
+    extension = normalize_extension(filename)
+    if extension:
+        return extension
+    if content_type == "image/jpeg":
+        return ".jpg"
+    return mimetypes.guess_extension(content_type or "") or ""
+
+def shard_key(filename: str) -> str:
+    """
+    Hex key that places a stored file in the sharded layout: the content
+    hash of content-addressed files, a hash of the name for legacy ones.
+    Only the part before the first dot counts, so derived files
+    (`<name>.gz`, `<name>.chunks.json`, ...) land beside their asset.
+    """
+    stem = filename.partition(".")[0]
+    if re.fullmatch(r"[0-9a-f]{64}", stem):
+        return stem
+    return hashlib.sha256(stem.encode()).hexdigest()
+
+def asset_path(upload_dir: Path, filename: str) -> Path:
+    """
+    Where a stored file lives: two levels of hash-prefix directories
+    (`ab/cd/<name>`), keeping every directory small.
+    """
+    key = shard_key(filename)
+    return upload_dir / key[:2] / key[2:4] / filename
+
+def resolve_asset(upload_dir: Path, filename: str) -> Path:
+    """
+    Path of a stored file, falling back to the old flat layout for files
+    the sharding migration hasn't moved yet. Returns the sharded path when
+    the file exists in neither.
+    """
+    path = asset_path(upload_dir, filename)
+    if not path.exists():
+        legacy_path = upload_dir / filename
+        if legacy_path.is_file():
+            return legacy_path
+    return path
+
+def content_address(sha256: str, extension: str) -> str:
+    return f"{sha256}{extension}"
+
+def content_hash(filename: str) -> Optional[str]:
+    """
+    The SHA-256 a content-addressed file name was derived from, if any.
+    """
+    match = CONTENT_ADDRESSED_NAME.match(filename)
+    return match.group("sha256") if match else None
+
+def store_file(temp_path: Path, upload_dir: Path, sha256: str, extension: str) -> Tuple[str, bool]:
+    """
+    Move a fully written temp file to its content address.
+    Returns the stored file name and whether an identical file already
+    existed. Linking fails atomically if the target exists, so concurrent
+    identical uploads collapse to a single file. An existing file is
+    touched, so the garbage collector's grace period starts over.
+    """
+    filename = content_address(sha256, extension)
+    destination = asset_path(upload_dir, filename)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        os.link(temp_path, destination)
+        deduplicated = False
+    except FileExistsError:
+        deduplicated = True
+    except OSError:
+        # Filesystems without hard links: a rename is still atomic and the
+        # bytes are identical whichever concurrent upload wins
+        deduplicated = destination.exists()
+        if not deduplicated:
+            os.replace(temp_path, destination)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+    if deduplicated:
+        os.utime(destination)
+    return filename, deduplicated
+
+def store_bytes(data: bytes, upload_dir: Path, extension: str) -> str:
+    """
+    Write bytes into the content-addressed store and return the file name.
+    """
+    temp_path = upload_dir / f"{TEMP_UPLOAD_PREFIX}{uuid.uuid4().hex}"
+    temp_path.write_bytes(data)
+    filename, _ = store_file(temp_path, upload_dir, hashlib.sha256(data).hexdigest(), extension)
+    return filename
@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import List, Optional
+
+# Logical chunk size for parallel, individually cached model downloads
+ASSET_CHUNK_SIZE = 2 * 1024 * 1024
+
+CHUNK_MANIFEST_SUFFIX = ".chunks.json"
+
+def chunk_manifest_path(path: Path) -> Path:
+    return path.with_name(path.name + CHUNK_MANIFEST_SUFFIX)
+
+def build_chunk_manifest(path: Path, chunk_size: int = ASSET_CHUNK_SIZE) -> dict:
+    """
+    Hash a file in fixed-size chunks, reading it once. Chunk i covers bytes
+    [i * chunk_size, min(size, (i + 1) * chunk_size)).
+    """
+    stat_result = path.stat()
+    whole = hashlib.sha256()
+    chunks = []
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            whole.update(chunk)
+            chunks.append({"length": len(chunk), "sha256": hashlib.sha256(chunk).hexdigest()})
+
+    return {
+        "size": stat_result.st_size,
+        "mtime": stat_result.st_mtime,
+        "chunk_size": chunk_size,
+        "sha256": whole.hexdigest(),
+        "chunks": chunks,
+    }
+
+def _read_manifest(path: Path) -> Optional[dict]:
+    # A sidecar is only trusted while it still matches the file it describes
+    try:
+        manifest = json.loads(chunk_manifest_path(path).read_text())
+    except (OSError, ValueError):
+        return None
+    stat_result = path.stat()
+    if manifest.get("size") != stat_result.st_size or manifest.get("mtime") != stat_result.st_mtime:
+        return None
+    return manifest
+
+def write_chunk_manifest(path: Path) -> dict:
+    manifest = build_chunk_manifest(path)
+    sidecar = chunk_manifest_path(path)
+    temp_path = sidecar.with_name(f".{sidecar.name}.tmp")
+    temp_path.write_text(json.dumps(manifest))
+    os.replace(temp_path, sidecar)
+    return manifest
+
+def load_chunk_manifest(path: Path) -> Optional[dict]:
+    """
+    The prebuilt chunk manifest of a file, or None if it has none or it no
+    longer matches. Manifests are only built by write_chunk_manifests,
+    never on a request.
+    """
+    return _read_manifest(path)
+
+def write_chunk_manifests(paths: List[Path]) -> None:
+    """
+    Build chunk manifests ahead of time; runs in a worker process.
+    """
+    for path in paths:
+        if _read_manifest(path) is None:
+            write_chunk_manifest(path)
@@ -0,0 +1,137 @@
+import gzip
+import os
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# Preferred order when the client accepts several encodings equally
+ENCODING_PREFERENCE = ("br", "gzip")
+
+# Precompressed sibling files: `<name>.br` / `<name>.gz` next to the asset.
+# Brotli's top quality is too slow for 100MB+ models, 9 is close in size.
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+BROTLI_FILE_QUALITY = 9
+FILE_CHUNK_SIZE = 1024 * 1024
+
+# Siblings saving less than this fraction of the original are not kept
+MIN_COMPRESSION_SAVINGS = 0.05
+
+def compress_bytes(data: bytes) -> Dict[str, bytes]:
+    """
+    Precompressed variants of `data`, keyed by content-coding.
+    Brotli is included only when the library is installed.
+    """
+    variants = {"gzip": gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(data, quality=BROTLI_QUALITY)
+    return variants
+
+def _accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+def negotiate_encoding(accept_encoding: Optional[str], available: Iterable[str]) -> Optional[str]:
+    """
+    Pick the best available content-coding for an Accept-Encoding header.
+    Returns None when the identity representation should be sent.
+    """
+    if not accept_encoding:
+        return None
+
+    accepted = _accepted_encodings(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    available = set(available)
+
+    best, best_quality = None, 0.0
+    for coding in ENCODING_PREFERENCE:
+        if coding not in available:
+            continue
+        quality = accepted.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+def compressed_sibling(path: Path, encoding: str) -> Path:
+    return path.with_name(path.name + ENCODING_SUFFIXES[encoding])
+
+def available_encodings(path: Path) -> List[str]:
+    """
+    Content-codings with a precompressed sibling of `path` on disk.
+    """
+    return [encoding for encoding in ENCODING_SUFFIXES if compressed_sibling(path, encoding).exists()]
+
+def _compressors():
+    yield "gzip", zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    if brotli is not None:
+        yield "br", brotli.Compressor(quality=BROTLI_FILE_QUALITY)
+
+def compress_file(path: Path) -> Dict[str, int]:
+    """
+    Write gzip (and brotli, when installed) siblings of a file, reading it
+    once in chunks. Siblings that don't save enough are removed. Returns
+    the size of each sibling kept, by content-coding.
+    """
+    compressors = dict(_compressors())
+    temp_paths = {
+        encoding: compressed_sibling(path, encoding).with_name(f".{compressed_sibling(path, encoding).name}.tmp")
+        for encoding in compressors
+    }
+    outputs = {encoding: open(temp_path, "wb") for encoding, temp_path in temp_paths.items()}
+
+    try:
+        with open(path, "rb") as source:
+            while chunk := source.read(FILE_CHUNK_SIZE):
+                for encoding, compressor in compressors.items():
+                    outputs[encoding].write(
+                        compressor.process(chunk) if encoding == "br" else compressor.compress(chunk)
+                    )
+        for encoding, compressor in compressors.items():
+            outputs[encoding].write(compressor.finish() if encoding == "br" else compressor.flush())
+    except BaseException:
+        for encoding, output in outputs.items():
+            output.close()
+            temp_paths[encoding].unlink(missing_ok=True)
+        raise
+    finally:
+        for output in outputs.values():
+            output.close()
+
+    original_size = path.stat().st_size
+    sizes = {}
+    for encoding, temp_path in temp_paths.items():
+        size = temp_path.stat().st_size
+        if size <= original_size * (1 - MIN_COMPRESSION_SAVINGS):
+            os.replace(temp_path, compressed_sibling(path, encoding))
+            sizes[encoding] = size
+        else:
+            temp_path.unlink()
+            compressed_sibling(path, encoding).unlink(missing_ok=True)
+    return sizes
+
+def compress_files(paths: List[Path]) -> Dict[str, Dict[str, int]]:
+    """
+    Precompress several files; runs in a worker process.
+    """
+    return {path.name: compress_file(path) for path in paths}
@@ -0,0 +1,148 @@
+import asyncio
+import hashlib
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional
+from fastapi import Request
+from fastapi.responses import Response
+from models.homepage import HomepageContent
+from services.compression import compress_bytes, negotiate_encoding
+from services.file_responses import etag_matches
+
+# Safety-net expiry for the cached homepage, in seconds. Writes through this
+# process refresh the cache immediately; the TTL bounds staleness from writes
+# made by other workers.
+HOMEPAGE_CACHE_TTL = float(os.environ.get("HOMEPAGE_CACHE_TTL_SECONDS", "60"))
+
+@dataclass
+class CachedContent:
+    """
+    A validated homepage document together with its JSON serialization,
+    precompressed variants and version ETag.
+    """
+    content: HomepageContent
+    body: bytes
+    etag: str
+    loaded_at: float
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    def representation(self, encoding: Optional[str]):
+        """
+        Body and ETag for a content-coding (None for identity).
+        Each coding gets its own strong ETag.
+        """
+        if encoding is None:
+            return self.body, self.etag
+        return self.encoded[encoding], f'{self.etag[:-1]}-{encoding}"'
+
+class HomepageContentCache:
+    """
+    In-process cache of the homepage content document.
+    Concurrent misses share a single database load.
+    """
+
+    def __init__(self, ttl: float = HOMEPAGE_CACHE_TTL):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entry: Optional[CachedContent] = None
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> Optional[CachedContent]:
+        entry = self._entry
+        if entry and time.monotonic() - entry.loaded_at < self.ttl:
+            return entry
+        return None
+
+    async def get(self, load: Callable[[], Awaitable[HomepageContent]]) -> CachedContent:
+        """
+        Return the cached entry, calling `load` on a miss or after expiry.
+        """
+        entry = self._fresh()
+        if entry:
+            self.hits += 1
+            return entry
+
+        async with self._lock:
+            # Another request may have refreshed the entry while we waited
+            entry = self._fresh()
+            if entry:
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            version = self._version
+            content = await load()
+            entry = await asyncio.to_thread(self._build, content)
+
+            # Don't overwrite a newer write that landed during the load
+            if version == self._version:
+                self._entry = entry
+            return entry
+
+    async def set(self, content: HomepageContent) -> CachedContent:
+        """
+        Write-through after the content was saved.
+        """
+        self._version += 1
+        version = self._version
+        entry = await asyncio.to_thread(self._build, content)
+        if version == self._version:
+            self._entry = entry
+        return entry
+
+    def invalidate(self) -> None:
+        self._version += 1
+        self._entry = None
+
+    def stats(self) -> dict:
+        entry = self._entry
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "ttl_seconds": self.ttl,
+            "cached": entry is not None,
+            "age_seconds": round(time.monotonic() - entry.loaded_at, 3) if entry else None,
+            "etag": entry.etag if entry else None,
+            "sizes": {
+                "identity": len(entry.body),
+                **{encoding: len(body) for encoding, body in entry.encoded.items()}
+            } if entry else None
+        }
+
+    def _build(self, content: HomepageContent) -> CachedContent:
+        # Serialization and compression happen once per content version
+        body = content.model_dump_json().encode()
+        return CachedContent(
+            content=content,
+            body=body,
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            loaded_at=time.monotonic(),
+            encoded=compress_bytes(body)
+        )
+
+def content_response(request: Request, entry: CachedContent) -> Response:
+    """
+    Serve a cached entry, negotiating Accept-Encoding and answering
+    If-None-Match with 304.
+    """
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), entry.encoded)
+    body, etag = entry.representation(encoding)
+
+    headers = {
+        "etag": etag,
+        "vary": "Accept-Encoding",
+        "cache-control": "no-cache"
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag, weak=True):
+        return Response(status_code=304, headers=headers)
+
+    if encoding:
+        headers["content-encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+homepage_cache = HomepageContentCache()
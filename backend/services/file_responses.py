@@ -0,0 +1,276 @@
+import os
+import uuid
+import aiofiles
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from fastapi import Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+# Chunk size used when streaming partial content
+RANGE_CHUNK_SIZE = 64 * 1024
+
+# Requests asking for more ranges than this get the whole file instead
+MAX_RANGES = 64
+
+def file_etag(stat_result: os.stat_result) -> str:
+    """
+    Strong validator from the file's size and modification time.
+    """
+    return f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+def etag_matches(header: str, etag: str, weak: bool) -> bool:
+    """
+    Check an If-None-Match / If-Range style header against an ETag.
+    Weak comparison ignores the W/ prefix; strong comparison rejects weak tags.
+    """
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag.removeprefix("W/"):
+            return True
+    return False
+
+def _not_modified_since(header: str, mtime: float) -> bool:
+    try:
+        since = parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have one second resolution
+    return int(mtime) <= since
+
+def parse_range_header(header: str, size: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Parse a `bytes=` Range header into inclusive (start, end) pairs.
+    Returns None if the header is malformed (the Range is then ignored) and
+    an empty list if no range is satisfiable.
+    Overlapping and adjacent ranges are coalesced.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec:
+        return None
+
+    ranges: List[Tuple[int, int]] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, sep, last = part.partition("-")
+        if not sep:
+            return None
+        try:
+            if first == "":
+                # Suffix range: the last N bytes
+                length = int(last)
+                if length == 0:
+                    continue
+                start, end = max(size - length, 0), size - 1
+            else:
+                start = int(first)
+                end = int(last) if last else size - 1
+                if last and end < start:
+                    return None
+                end = min(end, size - 1)
+        except ValueError:
+            return None
+        if start < 0 or start >= size:
+            continue
+        ranges.append((start, end))
+
+    if len(ranges) > MAX_RANGES:
+        return None
+
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+async def _read_ranges(
+    path: Path,
+    ranges: List[Tuple[int, int]],
+    separators: Optional[List[bytes]] = None,
+    trailer: bytes = b""
+) -> AsyncIterator[bytes]:
+    async with aiofiles.open(path, 'rb') as f:
+        for index, (start, end) in enumerate(ranges):
+            if separators:
+                yield separators[index]
+            await f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = await f.read(min(RANGE_CHUNK_SIZE, remaining))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
+    if trailer:
+        yield trailer
+
+def ranged_file_response(
+    request: Request,
+    path: Path,
+    media_type: str,
+    filename: Optional[str] = None,
+    etag: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Serve a file honouring conditional requests (If-None-Match,
+    If-Modified-Since), Range / If-Range with single and multipart
+    206 responses, for both GET and HEAD.
+    """
+    stat_result = os.stat(path)
+    size = stat_result.st_size
+    etag = etag or file_etag(stat_result)
+    last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+
+    base_headers = {
+        "accept-ranges": "bytes",
+        "etag": etag,
+        "last-modified": last_modified,
+        **(headers or {})
+    }
+    if filename:
+        base_headers["content-disposition"] = f'attachment; filename="{filename}"'
+
+    # Conditional GET: If-None-Match takes precedence over If-Modified-Since
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        not_modified = etag_matches(if_none_match, etag, weak=True)
+    else:
+        not_modified = bool(if_modified_since) and _not_modified_since(if_modified_since, stat_result.st_mtime)
+    if not_modified:
+        return Response(status_code=304, headers=base_headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and if_range:
+        # Only honour the Range if the client's copy is still current
+        if if_range.strip().startswith('"') or if_range.strip().startswith("W/"):
+            range_current = etag_matches(if_range, etag, weak=False)
+        else:
+            range_current = if_range.strip() == last_modified
+        if not range_current:
+            range_header = None
+
+    ranges = parse_range_header(range_header, size) if range_header else None
+
+    if ranges is None:
+        return FileResponse(
+            path=path,
+            media_type=media_type,
+            headers=base_headers,
+            stat_result=stat_result
+        )
+
+    if not ranges:
+        return Response(
+            status_code=416,
+            headers={**base_headers, "content-range": f"bytes */{size}"}
+        )
+
+    is_head = request.method == "HEAD"
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        range_headers = {
+            **base_headers,
+            "content-range": f"bytes {start}-{end}/{size}",
+            "content-length": str(end - start + 1)
+        }
+        if is_head:
+            return Response(status_code=206, headers=range_headers, media_type=media_type)
+        return StreamingResponse(
+            _read_ranges(path, ranges),
+            status_code=206,
+            headers=range_headers,
+            media_type=media_type
+        )
+
+    # Multiple ranges are sent as multipart/byteranges
+    boundary = uuid.uuid4().hex
+    separators = [
+        (
+            f"\r\n--{boundary}\r\n"
+            f"Content-Type: {media_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+        ).encode()
+        for start, end in ranges
+    ]
+    trailer = f"\r\n--{boundary}--\r\n".encode()
+    content_length = (
+        sum(len(s) for s in separators)
+        + sum(end - start + 1 for start, end in ranges)
+        + len(trailer)
+    )
+    multipart_headers = {**base_headers, "content-length": str(content_length)}
+    multipart_type = f"multipart/byteranges; boundary={boundary}"
+
+    if is_head:
+        return Response(status_code=206, headers=multipart_headers, media_type=multipart_type)
+    return StreamingResponse(
+        _read_ranges(path, ranges, separators, trailer),
+        status_code=206,
+        headers=multipart_headers,
+        media_type=multipart_type
+    )
+
+def file_slice_response(
+    request: Request,
+    path: Path,
+    offset: int,
+    length: int,
+    media_type: str,
+    etag: str,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Serve `length` bytes starting at `offset` as a complete 200 response,
+    with its own validator. Used for byte-budgeted models and for tiles
+    packed into one file.
+    """
+    stat_result = os.stat(path)
+    offset = min(offset, stat_result.st_size)
+    length = min(length, stat_result.st_size - offset)
+
+    slice_headers = {
+        "etag": etag,
+        "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "content-length": str(length),
+        **(headers or {})
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag, weak=True):
+        del slice_headers["content-length"]
+        return Response(status_code=304, headers=slice_headers)
+
+    if request.method == "HEAD" or length == 0:
+        return Response(headers=slice_headers, media_type=media_type)
+    return StreamingResponse(
+        _read_ranges(path, [(offset, offset + length - 1)]),
+        headers=slice_headers,
+        media_type=media_type
+    )
+
+def prefix_file_response(
+    request: Request,
+    path: Path,
+    length: int,
+    media_type: str,
+    etag: str,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Serve the first `length` bytes of a file as a complete 200 response.
+    """
+    return file_slice_response(request, path, 0, length, media_type, etag, headers)
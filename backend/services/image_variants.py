@@ -0,0 +1,202 @@
+import hashlib
+import os
+import struct
+import zlib
+from io import BytesIO
+from pathlib import Path
+from typing import List, Optional
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+from services.asset_store import store_bytes
+
+# Target widths for responsive variants; widths above the source are skipped
+VARIANT_WIDTHS = (320, 640, 1024, 1600, 2400)
+
+# Encoder settings per output format
+VARIANT_FORMATS = {
+    "avif": {"quality": 55},
+    "webp": {"quality": 80, "method": 4},
+}
+
+def _available_formats() -> List[str]:
+    return [fmt for fmt in VARIANT_FORMATS if features.check(fmt)]
+
+def _variant_widths(source_width: int) -> List[int]:
+    widths = [width for width in VARIANT_WIDTHS if width < source_width]
+    # Always offer a re-encoded copy at (capped) full size
+    widths.append(min(source_width, VARIANT_WIDTHS[-1]))
+    return sorted(set(widths))
+
+def generate_image_variants(source_path: Path, upload_dir: Path) -> List[dict]:
+    """
+    Resize and re-encode an uploaded image into responsive variants.
+    Runs in a worker process. EXIF orientation is applied to the pixels and
+    all metadata is dropped from the outputs. Returns an empty list for files
+    Pillow cannot read (3D models, animations).
+    """
+    try:
+        with Image.open(source_path) as image:
+            if getattr(image, "is_animated", False):
+                return []
+            image = ImageOps.exif_transpose(image)
+            image.load()
+    except (UnidentifiedImageError, OSError):
+        return []
+
+    has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+    image = image.convert("RGBA" if has_alpha else "RGB")
+
+    variants = []
+    for width in _variant_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+
+        for fmt in _available_formats():
+            buffer = BytesIO()
+            # No exif/icc arguments: re-encoding drops all source metadata
+            resized.save(buffer, format=fmt.upper(), **VARIANT_FORMATS[fmt])
+            data = buffer.getvalue()
+            filename = store_bytes(data, upload_dir, f".{fmt}")
+            variants.append({
+                "url": f"/uploads/{filename}",
+                "width": width,
+                "height": height,
+                "format": fmt,
+                "size_bytes": len(data)
+            })
+
+    return variants
+
+# EXIF tag kept on originals, so they still display upright
+EXIF_ORIENTATION = 0x0112
+
+# JPEG segments carrying EXIF/XMP (APP1), IPTC (APP13) and comments (COM).
+# JFIF, ICC profiles and the Adobe color transform are kept.
+JPEG_METADATA_MARKERS = (0xE1, 0xED, 0xFE)
+
+# PNG chunks carrying EXIF, text and timestamps
+PNG_METADATA_CHUNKS = (b"eXIf", b"tEXt", b"iTXt", b"zTXt", b"tIME")
+
+# WebP chunks carrying EXIF and XMP, with their VP8X flag bits
+WEBP_METADATA_CHUNKS = {b"EXIF": 0x08, b"XMP ": 0x04}
+
+def _orientation_exif(data: bytes) -> Optional[bytes]:
+    """
+    A minimal EXIF block (TIFF header onwards) holding only the source's
+    orientation, or None when it is upright or unknown.
+    """
+    try:
+        with Image.open(BytesIO(data)) as image:
+            orientation = image.getexif().get(EXIF_ORIENTATION, 1)
+    except (UnidentifiedImageError, OSError):
+        return None
+    if orientation == 1:
+        return None
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION] = orientation
+    return exif.tobytes()[len(b"Exif\x00\x00"):]
+
+def _strip_jpeg(data: bytes) -> bytes:
+    orientation = _orientation_exif(data)
+    output = [data[:2]]
+    if orientation:
+        segment = b"Exif\x00\x00" + orientation
+        output.append(b"\xff\xe1" + struct.pack(">H", len(segment) + 2) + segment)
+
+    position = 2
+    while position + 4 <= len(data) and data[position] == 0xFF:
+        marker = data[position + 1]
+        if marker == 0xDA:
+            # Start of scan: entropy-coded data follows, copied untouched
+            break
+        length = struct.unpack(">H", data[position + 2:position + 4])[0]
+        end = position + 2 + length
+        if marker not in JPEG_METADATA_MARKERS:
+            output.append(data[position:end])
+        position = end
+    output.append(data[position:])
+    return b"".join(output)
+
+def _png_chunk(chunk_type: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", len(body)) + chunk_type + body + struct.pack(">I", zlib.crc32(chunk_type + body))
+
+def _strip_png(data: bytes) -> bytes:
+    orientation = _orientation_exif(data)
+    output = [data[:8]]
+    position = 8
+    while position + 8 <= len(data):
+        length = struct.unpack(">I", data[position:position + 4])[0]
+        chunk_type = data[position + 4:position + 8]
+        end = position + 12 + length
+        if chunk_type == b"IDAT" and orientation:
+            output.append(_png_chunk(b"eXIf", orientation))
+            orientation = None
+        if chunk_type not in PNG_METADATA_CHUNKS:
+            output.append(data[position:end])
+        position = end
+    return b"".join(output)
+
+def _strip_webp(data: bytes) -> bytes:
+    orientation = _orientation_exif(data)
+    chunks = []
+    cleared_flags = 0
+    position = 12
+    while position + 8 <= len(data):
+        chunk_type = data[position:position + 4]
+        length = struct.unpack("<I", data[position + 4:position + 8])[0]
+        end = position + 8 + length + (length & 1)
+        if chunk_type in WEBP_METADATA_CHUNKS:
+            cleared_flags |= WEBP_METADATA_CHUNKS[chunk_type]
+        else:
+            chunks.append(bytearray(data[position:end]))
+        position = end
+    if orientation:
+        # EXIF comes last in an extended WebP
+        chunks.append(bytearray(b"EXIF" + struct.pack("<I", len(orientation)) + orientation + b"\x00" * (len(orientation) & 1)))
+        cleared_flags &= ~WEBP_METADATA_CHUNKS[b"EXIF"]
+    for chunk in chunks:
+        if chunk[:4] == b"VP8X":
+            chunk[8] &= ~cleared_flags & 0xFF
+    body = b"WEBP" + b"".join(chunks)
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+def _container(head: bytes) -> Optional[str]:
+    if head.startswith(b"\xff\xd8"):
+        return "jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+def strip_metadata_bytes(data: bytes) -> bytes:
+    """
+    Remove EXIF (including GPS), XMP, IPTC, comments and text chunks from
+    a JPEG, PNG or WebP without re-encoding its pixels. Orientation is kept
+    as the only EXIF tag. Other formats are returned unchanged.
+    """
+    container = _container(data)
+    if container == "jpeg":
+        return _strip_jpeg(data)
+    if container == "png":
+        return _strip_png(data)
+    if container == "webp":
+        return _strip_webp(data)
+    return data
+
+def strip_image_metadata(path: Path) -> Optional[str]:
+    """
+    Strip metadata from an uploaded image file in place, before it is
+    stored. Runs in a worker process. Returns the SHA-256 of the rewritten
+    file, or None if there was nothing to strip.
+    """
+    with open(path, "rb") as f:
+        if _container(f.read(12)) is None:
+            return None
+    data = path.read_bytes()
+    stripped = strip_metadata_bytes(data)
+    if stripped == data:
+        return None
+    temp_path = path.with_name(f"{path.name}.strip")
+    temp_path.write_bytes(stripped)
+    os.replace(temp_path, path)
+    return hashlib.sha256(stripped).hexdigest()
@@ -0,0 +1,154 @@
+import asyncio
+import base64
+import binascii
+import logging
+import os
+from pathlib import Path
+from typing import List, Tuple
+from services.asset_store import asset_path, image_extension, store_bytes
+from services.image_variants import strip_metadata_bytes
+
+logger = logging.getLogger(__name__)
+
+# Documents fetched per batch, and the pause between batches so the
+# migration never starves request handling
+MIGRATION_BATCH_SIZE = 20
+MIGRATION_BATCH_PAUSE = 0.1
+
+# Files moved per batch by the sharded layout migration
+SHARD_MIGRATION_BATCH_SIZE = 500
+
+def parse_data_url(data_url: str) -> Tuple[str, bytes]:
+    """
+    Split a base64 `data:` URL into its MIME type and decoded bytes.
+    """
+    header, _, payload = data_url.partition(",")
+    if not header.startswith("data:") or not header.endswith(";base64"):
+        raise ValueError("Not a base64 data URL")
+    content_type = header[len("data:"):-len(";base64")] or "application/octet-stream"
+    return content_type, base64.b64decode(payload, validate=True)
+
+def _store_data_url(data_url: str, upload_dir: Path) -> str:
+    content_type, data = parse_data_url(data_url)
+    data = strip_metadata_bytes(data)
+    return f"/uploads/{store_bytes(data, upload_dir, image_extension(content_type))}"
+
+async def migrate_demo_images(
+    db,
+    upload_dir: Path,
+    batch_size: int = MIGRATION_BATCH_SIZE
+) -> dict:
+    """
+    Move base64 demo images out of homepage documents into the asset store.
+    Runs online: documents are processed in batches, and each image is swapped
+    with a compare-and-set update so a concurrent edit is never overwritten.
+    Safe to re-run; migrated documents no longer match the query.
+    """
+    stats = {"documents": 0, "images": 0, "bytes_removed": 0, "failed": 0}
+    seen = set()
+
+    while True:
+        batch = await db.homepage_content.find(
+            {"demo_items.image_base64": {"$regex": "^data:"}, "_id": {"$nin": list(seen)}}
+        ).limit(batch_size).to_list(batch_size)
+
+        if not batch:
+            break
+
+        for document in batch:
+            seen.add(document["_id"])
+            stats["documents"] += 1
+
+            for index, item in enumerate(document.get("demo_items") or []):
+                data_url = item.get("image_base64")
+                if not data_url or not data_url.startswith("data:"):
+                    continue
+
+                try:
+                    file_url = await asyncio.to_thread(_store_data_url, data_url, upload_dir)
+                except (ValueError, binascii.Error) as e:
+                    logger.warning(f"Skipping demo image {index} of {document.get('id')}: {e}")
+                    stats["failed"] += 1
+                    continue
+
+                field = f"demo_items.{index}.image_base64"
+                result = await db.homepage_content.update_one(
+                    {"_id": document["_id"], field: data_url},
+                    {"$set": {field: file_url}}
+                )
+                if result.modified_count:
+                    stats["images"] += 1
+                    stats["bytes_removed"] += len(data_url)
+
+        await asyncio.sleep(MIGRATION_BATCH_PAUSE)
+
+    if stats["documents"]:
+        logger.info(f"Demo image migration finished: {stats}")
+    return stats
+
+def _flat_files(upload_dir: Path) -> List[str]:
+    # Temp files stay in the root: they are in flight or swept as garbage
+    return [
+        entry.name for entry in os.scandir(upload_dir)
+        if entry.is_file(follow_symlinks=False) and not entry.name.startswith(".")
+    ]
+
+def _move_to_shard(upload_dir: Path, filename: str) -> bool:
+    """
+    Move one file from the flat root into its shard. The file is linked
+    into place before the flat name is removed, so readers always find it
+    under one of the two. Returns False if the shard already held it.
+    """
+    source = upload_dir / filename
+    destination = asset_path(upload_dir, filename)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, destination)
+        moved = True
+    except FileExistsError:
+        # Stored again since the layout changed; the bytes are the same
+        moved = False
+    except OSError:
+        moved = not destination.exists()
+        if moved:
+            os.replace(source, destination)
+    source.unlink(missing_ok=True)
+    return moved
+
+def _move_batch(upload_dir: Path, filenames: List[str], stats: dict) -> None:
+    for filename in filenames:
+        try:
+            size = (upload_dir / filename).stat().st_size
+            moved = _move_to_shard(upload_dir, filename)
+        except FileNotFoundError:
+            # Removed (or moved by another worker) since the listing
+            continue
+        except OSError as e:
+            logger.warning(f"Could not move {filename} into the sharded layout: {e}")
+            stats["failed"] += 1
+            continue
+        if moved:
+            stats["files"] += 1
+            stats["bytes"] += size
+        else:
+            stats["duplicates"] += 1
+
+async def migrate_to_sharded_layout(
+    upload_dir: Path,
+    batch_size: int = SHARD_MIGRATION_BATCH_SIZE
+) -> dict:
+    """
+    Move uploaded files from the flat upload directory into the two-level
+    hash-prefix layout. Runs online, in batches; lookups fall back to the
+    flat name until a file has moved. Safe to re-run.
+    """
+    stats = {"files": 0, "bytes": 0, "duplicates": 0, "failed": 0}
+    filenames = await asyncio.to_thread(_flat_files, upload_dir)
+
+    for start in range(0, len(filenames), batch_size):
+        await asyncio.to_thread(_move_batch, upload_dir, filenames[start:start + batch_size], stats)
+        await asyncio.sleep(MIGRATION_BATCH_PAUSE)
+
+    if filenames:
+        logger.info(f"Sharded layout migration finished: {stats}")
+    return stats
@@ -0,0 +1,35 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+# Worker processes for CPU-heavy asset work (image resizing, model conversion)
+ASSET_PROCESS_WORKERS = int(
+    os.environ.get("ASSET_PROCESS_WORKERS", max(1, (os.cpu_count() or 2) // 2))
+)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Shared, lazily created process pool for asset processing.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=ASSET_PROCESS_WORKERS)
+    return _executor
+
+async def run_in_process(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a picklable, module-level function in the process pool without
+    blocking the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), partial(func, *args, **kwargs))
+
+def shutdown_process_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
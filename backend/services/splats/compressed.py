@@ -0,0 +1,265 @@
+import numpy as np
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from services.splats.gaussians import Gaussians
+from services.splats.ply import read_ply_element, read_ply_header
+
+# Compressed PLY layout as read by PlayCanvas/SuperSplat and Spark: gaussians
+# are quantized relative to the bounds of their 256-gaussian chunk
+CHUNK_SIZE = 256
+COMPRESSED_PLY_EXTENSION = ".compressed.ply"
+COMPRESSED_PLY_MEDIA_TYPE = "application/x-compressed-ply"
+
+# Highest SH band kept in compressed variants (0 keeps base color only).
+# Each dropped band saves 3, 5 or 7 bytes per gaussian.
+COMPRESSED_SH_DEGREE = int(os.environ.get("COMPRESSED_SPLAT_SH_DEGREE", "3"))
+
+CHUNK_PROPERTIES = (
+    "min_x", "min_y", "min_z", "max_x", "max_y", "max_z",
+    "min_scale_x", "min_scale_y", "min_scale_z", "max_scale_x", "max_scale_y", "max_scale_z",
+    "min_r", "min_g", "min_b", "max_r", "max_g", "max_b",
+)
+VERTEX_PROPERTIES = ("packed_position", "packed_rotation", "packed_scale", "packed_color")
+
+# Log scales are clamped so degenerate (zero) scales stay finite
+LOG_SCALE_LIMIT = 20.0
+
+# Smallest-three quaternion components lie in [-1/sqrt(2), 1/sqrt(2)]
+ROTATION_NORM = np.sqrt(2.0)
+
+def sh_coefficients(degree: int) -> int:
+    """
+    Higher-order SH coefficients per color channel up to `degree`.
+    """
+    return (degree + 1) ** 2 - 1
+
+def _chunk_bounds(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Pad the last chunk with its final row so it doesn't widen the bounds
+    padding = -len(values) % CHUNK_SIZE
+    padded = np.pad(values, ((0, padding), (0, 0)), mode="edge")
+    chunks = padded.reshape(-1, CHUNK_SIZE, values.shape[1])
+    return chunks.min(axis=1), chunks.max(axis=1)
+
+def _normalize(values: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    # Per-gaussian [0, 1] position within its chunk's bounds
+    lower = np.repeat(lower, CHUNK_SIZE, axis=0)[:len(values)]
+    extent = np.repeat(upper, CHUNK_SIZE, axis=0)[:len(values)] - lower
+    return np.where(extent > 0, (values - lower) / np.where(extent > 0, extent, 1.0), 0.0)
+
+def _denormalize(values: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    lower = np.repeat(lower, CHUNK_SIZE, axis=0)[:len(values)]
+    upper = np.repeat(upper, CHUNK_SIZE, axis=0)[:len(values)]
+    return lower + values * (upper - lower)
+
+def _pack_unorm(values: np.ndarray, bits: int) -> np.ndarray:
+    scale = (1 << bits) - 1
+    return np.clip(np.rint(values * scale), 0, scale).astype(np.uint32)
+
+def _unpack_unorm(packed: np.ndarray, shift: int, bits: int) -> np.ndarray:
+    scale = (1 << bits) - 1
+    return ((packed >> np.uint32(shift)) & np.uint32(scale)).astype(np.float32) / scale
+
+def _pack_111011(values: np.ndarray) -> np.ndarray:
+    return (
+        (_pack_unorm(values[:, 0], 11) << np.uint32(21))
+        | (_pack_unorm(values[:, 1], 10) << np.uint32(11))
+        | _pack_unorm(values[:, 2], 11)
+    )
+
+def _unpack_111011(packed: np.ndarray) -> np.ndarray:
+    return np.stack([
+        _unpack_unorm(packed, 21, 11),
+        _unpack_unorm(packed, 11, 10),
+        _unpack_unorm(packed, 0, 11),
+    ], axis=1)
+
+def pack_rotations(rotations: np.ndarray) -> np.ndarray:
+    """
+    Smallest-three encoding: 2 bits for the index of the largest component,
+    10 bits for each of the other three. q and -q are the same rotation, so
+    the sign is chosen to make the dropped component positive.
+    """
+    largest = np.argmax(np.abs(rotations), axis=1)
+    rows = np.arange(len(rotations))
+    signs = np.where(rotations[rows, largest] < 0, -1.0, 1.0).astype(np.float32)
+    rotations = rotations * signs[:, None]
+
+    kept = np.arange(4)[None, :] != largest[:, None]
+    others = rotations[kept].reshape(-1, 3) / ROTATION_NORM + 0.5
+
+    return (
+        (largest.astype(np.uint32) << np.uint32(30))
+        | (_pack_unorm(others[:, 0], 10) << np.uint32(20))
+        | (_pack_unorm(others[:, 1], 10) << np.uint32(10))
+        | _pack_unorm(others[:, 2], 10)
+    )
+
+def unpack_rotations(packed: np.ndarray) -> np.ndarray:
+    largest = (packed >> np.uint32(30)).astype(np.intp)
+    others = np.stack([
+        _unpack_unorm(packed, 20, 10),
+        _unpack_unorm(packed, 10, 10),
+        _unpack_unorm(packed, 0, 10),
+    ], axis=1)
+    others = (others - 0.5) * ROTATION_NORM
+
+    rotations = np.empty((len(packed), 4), dtype=np.float32)
+    kept = np.arange(4)[None, :] != largest[:, None]
+    rotations[kept] = others.reshape(-1)
+    rotations[~kept] = np.sqrt(np.maximum(0.0, 1.0 - np.sum(others * others, axis=1)))
+    return rotations
+
+def _flatten_sh(sh_rest: np.ndarray) -> np.ndarray:
+    # Channel-major like the source PLY: all R coefficients, then G, then B
+    return sh_rest.transpose(0, 2, 1).reshape(len(sh_rest), -1)
+
+def _pack_sh(values: np.ndarray) -> np.ndarray:
+    return np.clip(np.floor((values / 8.0 + 0.5) * 256.0), 0, 255).astype(np.uint8)
+
+def _unpack_sh(packed: np.ndarray) -> np.ndarray:
+    values = np.where(packed == 0, 0.0, (packed.astype(np.float32) + 0.5) / 256.0)
+    values = ((values - 0.5) * 8.0).astype(np.float32)
+    return values.reshape(len(packed), 3, -1).transpose(0, 2, 1)
+
+def _header(chunk_count: int, count: int, sh_values: int) -> bytes:
+    lines = ["ply", "format binary_little_endian 1.0", f"element chunk {chunk_count}"]
+    lines += [f"property float {name}" for name in CHUNK_PROPERTIES]
+    lines.append(f"element vertex {count}")
+    lines += [f"property uint {name}" for name in VERTEX_PROPERTIES]
+    if sh_values:
+        lines.append(f"element sh {count}")
+        lines += [f"property uchar f_rest_{i}" for i in range(sh_values)]
+    lines.append("end_header")
+    return ("\n".join(lines) + "\n").encode("ascii")
+
+def encode_compressed_ply(
+    gaussians: Gaussians,
+    sh_degree: int = COMPRESSED_SH_DEGREE
+) -> Tuple[bytes, Gaussians]:
+    """
+    Quantize gaussians into the compressed PLY layout (16 bytes per gaussian
+    plus one byte per kept SH coefficient). Positions and log scales are
+    11-10-11 bit fixed point within chunk bounds, rotations use the
+    smallest-three encoding and SH bands above `sh_degree` are dropped.
+    Returns the file bytes and the gaussians as a viewer will decode them.
+    """
+    count = len(gaussians)
+    log_scales = np.clip(np.log(np.maximum(gaussians.scales, 1e-30)), -LOG_SCALE_LIMIT, LOG_SCALE_LIMIT)
+
+    position_min, position_max = _chunk_bounds(gaussians.positions)
+    scale_min, scale_max = _chunk_bounds(log_scales)
+    color_min, color_max = _chunk_bounds(gaussians.colors)
+
+    chunks = np.concatenate(
+        [position_min, position_max, scale_min, scale_max, color_min, color_max], axis=1
+    ).astype("<f4")
+
+    color = _normalize(gaussians.colors, color_min, color_max)
+    packed_color = (
+        (_pack_unorm(color[:, 0], 8) << np.uint32(24))
+        | (_pack_unorm(color[:, 1], 8) << np.uint32(16))
+        | (_pack_unorm(color[:, 2], 8) << np.uint32(8))
+        | _pack_unorm(gaussians.opacities, 8)
+    )
+
+    vertices = np.stack([
+        _pack_111011(_normalize(gaussians.positions, position_min, position_max)),
+        pack_rotations(gaussians.rotations),
+        _pack_111011(_normalize(log_scales, scale_min, scale_max)),
+        packed_color,
+    ], axis=1).astype("<u4")
+
+    sh = None
+    sh_data = b""
+    kept = min(sh_coefficients(max(sh_degree, 0)), sh_coefficients(gaussians.sh_degree))
+    if kept:
+        sh = _pack_sh(_flatten_sh(gaussians.sh_rest[:, :kept, :]))
+        sh_data = sh.tobytes()
+
+    data = b"".join([
+        _header(len(chunks), count, sh.shape[1] if sh is not None else 0),
+        chunks.tobytes(),
+        vertices.tobytes(),
+        sh_data,
+    ])
+    return data, _decode(chunks, vertices, sh)
+
+def _decode(chunks: np.ndarray, vertices: np.ndarray, sh: Optional[np.ndarray]) -> Gaussians:
+    position_min, position_max = chunks[:, 0:3], chunks[:, 3:6]
+    scale_min, scale_max = chunks[:, 6:9], chunks[:, 9:12]
+    color_min, color_max = chunks[:, 12:15], chunks[:, 15:18]
+
+    packed_color = vertices[:, 3]
+    color = np.stack([
+        _unpack_unorm(packed_color, 24, 8),
+        _unpack_unorm(packed_color, 16, 8),
+        _unpack_unorm(packed_color, 8, 8),
+    ], axis=1)
+
+    return Gaussians(
+        positions=_denormalize(_unpack_111011(vertices[:, 0]), position_min, position_max).astype(np.float32),
+        scales=np.exp(_denormalize(_unpack_111011(vertices[:, 2]), scale_min, scale_max)).astype(np.float32),
+        rotations=unpack_rotations(vertices[:, 1]),
+        colors=_denormalize(color, color_min, color_max).astype(np.float32),
+        opacities=_unpack_unorm(packed_color, 0, 8),
+        sh_rest=_unpack_sh(sh) if sh is not None else None,
+    )
+
+def is_compressed_ply(path: Path) -> bool:
+    with open(path, "rb") as f:
+        header = read_ply_header(f)
+    return any(element.name == "chunk" for element in header.elements)
+
+def decode_compressed_ply(path: Path) -> Gaussians:
+    """
+    Decode a compressed PLY file back into gaussians.
+    """
+    with open(path, "rb") as f:
+        header = read_ply_header(f)
+
+    chunk_rows = read_ply_element(path, "chunk")
+    chunks = np.stack([np.asarray(chunk_rows[name], dtype=np.float32) for name in CHUNK_PROPERTIES], axis=1)
+    vertex_rows = read_ply_element(path, "vertex")
+    vertices = np.stack([np.asarray(vertex_rows[name], dtype=np.uint32) for name in VERTEX_PROPERTIES], axis=1)
+
+    sh = None
+    if any(element.name == "sh" for element in header.elements):
+        sh_rows = read_ply_element(path, "sh")
+        sh = np.stack([np.asarray(sh_rows[name]) for name in sh_rows.dtype.names], axis=1)
+
+    return _decode(chunks, vertices, sh)
+
+def _rmse(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.sqrt(np.mean(np.square(a - b)))) if a.size else 0.0
+
+def compression_error(original: Gaussians, decoded: Gaussians) -> Dict[str, float]:
+    """
+    Reconstruction error of a quantized model against its source.
+    Dropped SH bands count as error against zero.
+    """
+    extent = original.positions.max(axis=0) - original.positions.min(axis=0) if len(original) else np.zeros(3)
+    diagonal = float(np.linalg.norm(extent)) or 1.0
+
+    dots = np.abs(np.sum(original.rotations * decoded.rotations, axis=1))
+    angles = 2.0 * np.degrees(np.arccos(np.clip(dots, 0.0, 1.0)))
+
+    scale_error = np.abs(decoded.scales - original.scales) / np.maximum(original.scales, 1e-12)
+
+    sh_error = 0.0
+    if original.sh_rest is not None:
+        reference = original.sh_rest
+        decoded_sh = np.zeros_like(reference)
+        if decoded.sh_rest is not None:
+            decoded_sh[:, :decoded.sh_rest.shape[1], :] = decoded.sh_rest
+        sh_error = _rmse(reference, decoded_sh)
+
+    return {
+        "position_rmse": _rmse(original.positions, decoded.positions),
+        "position_rmse_relative": _rmse(original.positions, decoded.positions) / diagonal,
+        "rotation_error_degrees": float(angles.mean()) if len(angles) else 0.0,
+        "scale_error_relative": float(np.median(scale_error)) if len(scale_error) else 0.0,
+        "color_rmse": _rmse(original.colors, decoded.colors),
+        "opacity_rmse": _rmse(original.opacities, decoded.opacities),
+        "sh_rmse": sh_error,
+    }
@@ -0,0 +1,140 @@
+import numpy as np
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Optional
+from services.splats.ply import PlyError, read_ply_element
+
+# Zeroth-order spherical harmonic constant, maps SH DC terms to base color
+SH_C0 = 0.28209479177387814
+
+# Packed .splat record: position, linear scale, RGBA color, quantized rotation (32 bytes)
+SPLAT_DTYPE = np.dtype([
+    ("position", "<f4", 3),
+    ("scale", "<f4", 3),
+    ("color", "u1", 4),
+    ("rotation", "u1", 4),
+])
+
+SPLAT_MEDIA_TYPE = "application/splat"
+
+@dataclass
+class Gaussians:
+    """
+    Decoded 3D gaussians as column arrays.
+    """
+    positions: np.ndarray            # (N, 3) float32
+    scales: np.ndarray               # (N, 3) float32, linear (not log) scale
+    rotations: np.ndarray            # (N, 4) float32 unit quaternions (w, x, y, z)
+    colors: np.ndarray               # (N, 3) float32 base color in [0, 1]
+    opacities: np.ndarray            # (N,) float32 in [0, 1]
+    sh_rest: Optional[np.ndarray] = None  # (N, K, 3) float32 higher-order SH coefficients
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @property
+    def sh_degree(self) -> int:
+        if self.sh_rest is None:
+            return 0
+        # K = (degree + 1)^2 - 1 coefficients per channel
+        return int(round(np.sqrt(self.sh_rest.shape[1] + 1))) - 1
+
+    def take(self, indices: np.ndarray) -> "Gaussians":
+        """
+        Select (and reorder) gaussians by index across every attribute.
+        """
+        return Gaussians(**{
+            f.name: None if getattr(self, f.name) is None else getattr(self, f.name)[indices]
+            for f in fields(self)
+        })
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+def normalize_quaternions(q: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(q, axis=1, keepdims=True)
+    identity = np.array([1, 0, 0, 0], dtype=np.float32)
+    return np.where(norms > 0, q / np.maximum(norms, 1e-12), identity).astype(np.float32)
+
+def _columns(vertices: np.ndarray, names) -> np.ndarray:
+    return np.stack([np.asarray(vertices[name], dtype=np.float32) for name in names], axis=1)
+
+def gaussians_from_ply(path: Path) -> Gaussians:
+    """
+    Decode a 3D Gaussian Splatting PLY (as written by the reference
+    training code) into column arrays. Raises PlyError for PLY files
+    without gaussian attributes.
+    """
+    vertices = read_ply_element(path, "vertex")
+    names = set(vertices.dtype.names)
+
+    required = {"x", "y", "z", "scale_0", "scale_1", "scale_2",
+                "rot_0", "rot_1", "rot_2", "rot_3", "opacity",
+                "f_dc_0", "f_dc_1", "f_dc_2"}
+    missing = required - names
+    if missing:
+        raise PlyError(f"PLY is not a gaussian splat (missing {', '.join(sorted(missing))})")
+
+    rest_names = sorted(
+        (name for name in names if name.startswith("f_rest_")),
+        key=lambda name: int(name[len("f_rest_"):])
+    )
+    sh_rest = None
+    if rest_names and len(rest_names) % 3 == 0:
+        # PLY stores SH channel-major: all R coefficients, then G, then B
+        coefficients = len(rest_names) // 3
+        sh_rest = _columns(vertices, rest_names).reshape(-1, 3, coefficients).transpose(0, 2, 1)
+
+    return Gaussians(
+        positions=_columns(vertices, ("x", "y", "z")),
+        scales=np.exp(_columns(vertices, ("scale_0", "scale_1", "scale_2"))),
+        rotations=normalize_quaternions(_columns(vertices, ("rot_0", "rot_1", "rot_2", "rot_3"))),
+        colors=np.clip(0.5 + SH_C0 * _columns(vertices, ("f_dc_0", "f_dc_1", "f_dc_2")), 0.0, 1.0),
+        opacities=_sigmoid(np.asarray(vertices["opacity"], dtype=np.float32)),
+        sh_rest=np.ascontiguousarray(sh_rest) if sh_rest is not None else None,
+    )
+
+def gaussians_from_splat(path: Path, limit: Optional[int] = None) -> Gaussians:
+    """
+    Decode a packed 32-byte-per-gaussian .splat file, or only its first
+    `limit` records.
+    """
+    size = path.stat().st_size
+    if size % SPLAT_DTYPE.itemsize:
+        raise ValueError(".splat size is not a multiple of the 32 byte record size")
+
+    count = size // SPLAT_DTYPE.itemsize
+    if limit is not None:
+        count = min(count, limit)
+    records = np.memmap(path, dtype=SPLAT_DTYPE, mode="r", shape=(count,))
+    color = records["color"].astype(np.float32) / 255.0
+
+    return Gaussians(
+        positions=np.array(records["position"], dtype=np.float32),
+        scales=np.array(records["scale"], dtype=np.float32),
+        rotations=normalize_quaternions((records["rotation"].astype(np.float32) - 128.0) / 128.0),
+        colors=color[:, :3],
+        opacities=color[:, 3],
+    )
+
+def load_gaussians(path: Path) -> Gaussians:
+    """
+    Load gaussians from a .ply or .splat file, by extension.
+    """
+    if path.suffix.lower() == ".splat":
+        return gaussians_from_splat(path)
+    return gaussians_from_ply(path)
+
+def encode_splat(gaussians: Gaussians) -> bytes:
+    """
+    Pack gaussians into the .splat layout with vectorized operations.
+    """
+    records = np.empty(len(gaussians), dtype=SPLAT_DTYPE)
+    records["position"] = gaussians.positions
+    records["scale"] = gaussians.scales
+
+    rgba = np.concatenate([gaussians.colors, gaussians.opacities[:, None]], axis=1)
+    records["color"] = np.clip(np.rint(rgba * 255.0), 0, 255).astype(np.uint8)
+    records["rotation"] = np.clip(np.rint(gaussians.rotations * 128.0 + 128.0), 0, 255).astype(np.uint8)
+
+    return records.tobytes()
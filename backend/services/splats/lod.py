@@ -0,0 +1,67 @@
+import numpy as np
+from services.splats.gaussians import Gaussians
+from services.splats.morton import morton_codes
+
+# Fractions of gaussians kept per level of detail
+LOD_LEVELS = (1.0, 0.4, 0.15, 0.05)
+
+# Levels that would keep fewer gaussians than this are not generated
+MIN_LOD_GAUSSIANS = 5000
+
+# Size of the first importance band in stream order; each later band
+# doubles, so a byte-budget prefix is at most one band short of whole
+FIRST_IMPORTANCE_BAND = 4096
+
+def importance_scores(gaussians: Gaussians) -> np.ndarray:
+    """
+    Visual importance of each gaussian: opacity times ellipsoid volume.
+    Large, opaque gaussians dominate the image; tiny or faint ones are
+    the first to go at lower levels of detail.
+    """
+    volume = np.prod(gaussians.scales.astype(np.float64), axis=1)
+    return gaussians.opacities.astype(np.float64) * volume
+
+def importance_order(gaussians: Gaussians) -> np.ndarray:
+    """
+    Indices of gaussians from most to least important.
+    """
+    return np.argsort(-importance_scores(gaussians), kind="stable")
+
+def lod_count(count: int, level: float) -> int:
+    """
+    Number of gaussians kept at a level of detail.
+    """
+    return int(np.ceil(count * level))
+
+def lod_levels(count: int):
+    """
+    The levels of detail worth generating for a model of `count` gaussians.
+    """
+    return [
+        level for level in LOD_LEVELS
+        if level == 1.0 or lod_count(count, level) >= MIN_LOD_GAUSSIANS
+    ]
+
+def importance_bands(count: int) -> np.ndarray:
+    """
+    Ascending band boundaries (in importance rank) for stream ordering:
+    every level-of-detail count plus a doubling series.
+    """
+    boundaries = {lod_count(count, level) for level in LOD_LEVELS}
+    size = FIRST_IMPORTANCE_BAND
+    while size < count:
+        boundaries.add(size)
+        size *= 2
+    return np.array(sorted(boundaries), dtype=np.int64)
+
+def stream_order(gaussians: Gaussians) -> np.ndarray:
+    """
+    Indices for storing gaussians: by importance band first, then by
+    Morton code within each band. Every level of detail stays an exact
+    prefix, while neighbouring records are also close in space, which
+    compresses better and tightens per-chunk quantization bounds.
+    """
+    rank = np.empty(len(gaussians), dtype=np.int64)
+    rank[importance_order(gaussians)] = np.arange(len(gaussians))
+    band = np.searchsorted(importance_bands(len(gaussians)), rank, side="right")
+    return np.lexsort((morton_codes(gaussians.positions), band))
@@ -0,0 +1,100 @@
+import numpy as np
+from pathlib import Path
+from services.splats.gaussians import SPLAT_DTYPE
+from services.splats.ply import PlyError, read_ply_element, read_ply_header
+
+# Rows scanned per step, so memory stays bounded for any model size
+METADATA_BLOCK_SIZE = 1 << 20
+
+# Vertical field of view the suggested camera distance is computed for
+CAMERA_FOV_DEGREES = 60.0
+
+def _position_stats(positions, count: int) -> dict:
+    # Running min / max / sum over memory-mapped blocks
+    lower = np.full(3, np.inf)
+    upper = np.full(3, -np.inf)
+    total = np.zeros(3)
+    for start in range(0, count, METADATA_BLOCK_SIZE):
+        block = np.asarray(positions(start, min(start + METADATA_BLOCK_SIZE, count)), dtype=np.float64)
+        block = block[np.all(np.isfinite(block), axis=1)]
+        if not len(block):
+            continue
+        lower = np.minimum(lower, block.min(axis=0))
+        upper = np.maximum(upper, block.max(axis=0))
+        total += block.sum(axis=0)
+    if not np.all(np.isfinite(lower)):
+        lower = upper = np.zeros(3)
+    return {"bounds_min": lower, "bounds_max": upper, "centroid": total / max(count, 1)}
+
+def _ply_stats(path: Path) -> dict:
+    with open(path, "rb") as f:
+        header = read_ply_header(f)
+    elements = {element.name: element for element in header.elements}
+
+    if "chunk" in elements:
+        # Compressed PLY: chunk bounds give the extent without unpacking
+        chunks = read_ply_element(path, "chunk")
+        count = elements["vertex"].count
+        lower = np.stack([chunks[f"min_{axis}"] for axis in "xyz"], axis=1).astype(np.float64)
+        upper = np.stack([chunks[f"max_{axis}"] for axis in "xyz"], axis=1).astype(np.float64)
+        sizes = np.minimum(256, count - 256 * np.arange(len(chunks)))[:, None]
+        sh_element = elements.get("sh")
+        return {
+            "gaussian_count": count,
+            "sh_values": len(sh_element.properties) if sh_element else 0,
+            "bounds_min": lower.min(axis=0),
+            "bounds_max": upper.max(axis=0),
+            "centroid": np.sum((lower + upper) / 2 * sizes, axis=0) / max(count, 1),
+        }
+
+    vertices = read_ply_element(path, "vertex")
+    names = vertices.dtype.names
+    if not {"x", "y", "z"} <= set(names):
+        raise PlyError("PLY vertices have no positions")
+
+    def positions(start, end):
+        block = vertices[start:end]
+        return np.stack([block["x"], block["y"], block["z"]], axis=1)
+
+    return {
+        "gaussian_count": len(vertices),
+        "sh_values": sum(1 for name in names if name.startswith("f_rest_")),
+        **_position_stats(positions, len(vertices)),
+    }
+
+def _splat_stats(path: Path) -> dict:
+    size = path.stat().st_size
+    if size % SPLAT_DTYPE.itemsize:
+        raise ValueError(".splat size is not a multiple of the 32 byte record size")
+    count = size // SPLAT_DTYPE.itemsize
+    if not count:
+        raise ValueError(".splat file is empty")
+    records = np.memmap(path, dtype=SPLAT_DTYPE, mode="r", shape=(count,))
+    return {
+        "gaussian_count": count,
+        "sh_values": 0,
+        **_position_stats(lambda start, end: records["position"][start:end], count),
+    }
+
+def inspect_model(path: Path, sha256: str) -> dict:
+    """
+    Summarize a .ply or .splat model for the viewer without loading it:
+    the PLY header is parsed and the vertex data memory-mapped and scanned
+    in blocks. Raises ValueError for files that are not point models.
+    """
+    stats = _splat_stats(path) if path.suffix.lower() == ".splat" else _ply_stats(path)
+
+    lower, upper = stats["bounds_min"], stats["bounds_max"]
+    radius = float(np.linalg.norm(upper - lower)) / 2
+    coefficients = stats["sh_values"] // 3
+
+    return {
+        "gaussian_count": int(stats["gaussian_count"]),
+        "sh_degree": int(round(np.sqrt(coefficients + 1))) - 1,
+        "bounds_min": [float(v) for v in lower],
+        "bounds_max": [float(v) for v in upper],
+        "centroid": [float(v) for v in stats["centroid"]],
+        # Distance at which the bounding sphere fills the view
+        "camera_distance": radius / float(np.sin(np.radians(CAMERA_FOV_DEGREES) / 2)),
+        "sha256": sha256,
+    }
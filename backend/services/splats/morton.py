@@ -0,0 +1,34 @@
+import numpy as np
+
+# Bits per axis; three axes interleave into a 63-bit code
+MORTON_BITS = 21
+
+def _spread_bits(values: np.ndarray) -> np.ndarray:
+    # Insert two zero bits between each of the low 21 bits
+    x = values.astype(np.uint64) & np.uint64(0x1FFFFF)
+    x = (x | (x << np.uint64(32))) & np.uint64(0x1F00000000FFFF)
+    x = (x | (x << np.uint64(16))) & np.uint64(0x1F0000FF0000FF)
+    x = (x | (x << np.uint64(8))) & np.uint64(0x100F00F00F00F00F)
+    x = (x | (x << np.uint64(4))) & np.uint64(0x10C30C30C30C30C3)
+    x = (x | (x << np.uint64(2))) & np.uint64(0x1249249249249249)
+    return x
+
+def morton_codes(positions: np.ndarray) -> np.ndarray:
+    """
+    3D Morton (Z-order) codes of points, quantized to 21 bits per axis
+    within their bounding box. Sorting by the code keeps nearby points
+    close together in memory.
+    """
+    if not len(positions):
+        return np.empty(0, dtype=np.uint64)
+
+    lower = positions.min(axis=0)
+    extent = np.maximum(positions.max(axis=0) - lower, 1e-12)
+    scale = (1 << MORTON_BITS) - 1
+    cells = np.clip(((positions - lower) / extent) * scale, 0, scale).astype(np.uint64)
+
+    return (
+        (_spread_bits(cells[:, 0]) << np.uint64(2))
+        | (_spread_bits(cells[:, 1]) << np.uint64(1))
+        | _spread_bits(cells[:, 2])
+    )
@@ -0,0 +1,103 @@
+from pathlib import Path
+from typing import Dict, List, Optional
+from services.asset_store import store_bytes
+from services.splats.compressed import (
+    COMPRESSED_PLY_EXTENSION,
+    COMPRESSED_PLY_MEDIA_TYPE,
+    compression_error,
+    decode_compressed_ply,
+    encode_compressed_ply,
+    is_compressed_ply,
+)
+from services.splats.gaussians import SPLAT_MEDIA_TYPE, Gaussians, encode_splat, load_gaussians
+from services.splats.lod import lod_count, lod_levels, stream_order
+
+def _variant(
+    filename: str,
+    format: str,
+    media_type: str,
+    size_bytes: int,
+    gaussian_count: int,
+    lod: float = 1.0,
+    progressive: bool = False,
+    sh_degree: Optional[int] = None,
+    compression: Optional[Dict[str, float]] = None
+) -> dict:
+    return {
+        "url": f"/uploads/{filename}",
+        "format": format,
+        "media_type": media_type,
+        "size_bytes": size_bytes,
+        "gaussian_count": gaussian_count,
+        "lod": lod,
+        "progressive": progressive,
+        "sh_degree": sh_degree,
+        "compression": compression,
+    }
+
+def process_model(source_path: Path, upload_dir: Path) -> List[dict]:
+    """
+    Derive served variants from an uploaded gaussian splat model.
+    Runs in a worker process. The first variant returned is the one the
+    homepage should load; the rest are reduced levels of detail for weaker
+    devices. Raises ValueError for files that are not gaussian splats.
+
+    Every .splat variant is stored in descending importance bands, Morton
+    ordered within each band, so any whole-record prefix of it is a valid
+    coarse model. That makes each level of detail a prefix of the full file
+    and lets it be streamed progressively or cut to a byte budget.
+
+    PLY uploads also get a quantized compressed PLY variant, which reports
+    its size ratio and reconstruction error against the source.
+    """
+    extension = source_path.suffix.lower()
+    if extension not in (".ply", ".splat"):
+        return []
+
+    compressed_source = extension == ".ply" and is_compressed_ply(source_path)
+    gaussians = decode_compressed_ply(source_path) if compressed_source else load_gaussians(source_path)
+    order = stream_order(gaussians)
+
+    # Packed .splat: 32 bytes per gaussian instead of ~248 in the PLY
+    gaussians = gaussians.take(order)
+    data = encode_splat(gaussians)
+    record_size = len(data) // max(len(gaussians), 1)
+
+    variants = []
+    for level in lod_levels(len(gaussians)):
+        count = lod_count(len(gaussians), level)
+        level_data = data[:count * record_size]
+        filename = store_bytes(level_data, upload_dir, ".splat")
+        variants.append(_variant(
+            filename, "splat", SPLAT_MEDIA_TYPE, len(level_data), count, level,
+            progressive=True, sh_degree=0
+        ))
+
+    if extension == ".ply" and not compressed_source:
+        source_size = source_path.stat().st_size
+        variants.append(_compressed_variant(
+            gaussians, source_size, upload_dir,
+            "compressed_ply", COMPRESSED_PLY_EXTENSION, COMPRESSED_PLY_MEDIA_TYPE
+        ))
+
+    return variants
+
+def _compressed_variant(
+    gaussians: Gaussians,
+    source_size: int,
+    upload_dir: Path,
+    format: str,
+    extension: str,
+    media_type: str
+) -> dict:
+    data, decoded = encode_compressed_ply(gaussians)
+    filename = store_bytes(data, upload_dir, extension)
+    return _variant(
+        filename, format, media_type, len(data), len(gaussians),
+        sh_degree=decoded.sh_degree,
+        compression={
+            "source_bytes": source_size,
+            "ratio": round(source_size / max(len(data), 1), 2),
+            **compression_error(gaussians, decoded)
+        }
+    )
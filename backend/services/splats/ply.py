@@ -0,0 +1,168 @@
+import numpy as np
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Tuple
+
+# PLY scalar types and their NumPy equivalents (byte order added per file)
+PLY_TYPES = {
+    "char": "i1", "int8": "i1",
+    "uchar": "u1", "uint8": "u1",
+    "short": "i2", "int16": "i2",
+    "ushort": "u2", "uint16": "u2",
+    "int": "i4", "int32": "i4",
+    "uint": "u4", "uint32": "u4",
+    "float": "f4", "float32": "f4",
+    "double": "f8", "float64": "f8",
+}
+
+PLY_FORMATS = {
+    "ascii": "=",
+    "binary_little_endian": "<",
+    "binary_big_endian": ">",
+}
+
+# Headers larger than this are treated as malformed
+MAX_HEADER_SIZE = 64 * 1024
+
+class PlyError(ValueError):
+    """
+    Raised for files that are not valid (or not supported) PLY.
+    """
+
+@dataclass
+class PlyElement:
+    name: str
+    count: int
+    properties: List[Tuple[str, str]] = field(default_factory=list)
+    has_list: bool = False
+
+@dataclass
+class PlyHeader:
+    format: str
+    elements: List[PlyElement]
+    header_size: int
+
+    @property
+    def byte_order(self) -> str:
+        return PLY_FORMATS[self.format]
+
+    def element(self, name: str) -> PlyElement:
+        for element in self.elements:
+            if element.name == name:
+                return element
+        raise PlyError(f"PLY has no '{name}' element")
+
+    def dtype(self, name: str) -> np.dtype:
+        """
+        Structured dtype of one row of an element.
+        """
+        element = self.element(name)
+        if element.has_list:
+            raise PlyError(f"PLY element '{name}' has list properties")
+        return np.dtype([
+            (prop, self.byte_order + PLY_TYPES[ply_type]) for prop, ply_type in element.properties
+        ])
+
+    def element_offset(self, name: str) -> int:
+        """
+        Byte offset of an element's data in a binary file.
+        """
+        offset = self.header_size
+        for element in self.elements:
+            if element.name == name:
+                return offset
+            offset += element.count * self.dtype(element.name).itemsize
+        raise PlyError(f"PLY has no '{name}' element")
+
+def parse_ply_header(data: bytes) -> PlyHeader:
+    """
+    Parse a PLY header from the leading bytes of a file.
+    Raises PlyError if the header is malformed or incomplete.
+    """
+    if not data.startswith(b"ply\n") and not data.startswith(b"ply\r\n"):
+        raise PlyError("Missing 'ply' magic")
+
+    end = data.find(b"end_header")
+    if end < 0:
+        raise PlyError("PLY header is incomplete" if len(data) < MAX_HEADER_SIZE else "PLY header too large")
+    newline = data.find(b"\n", end)
+    if newline < 0:
+        raise PlyError("PLY header is incomplete")
+
+    try:
+        lines = data[:end].decode("ascii").splitlines()[1:]
+    except UnicodeDecodeError:
+        raise PlyError("PLY header is not ASCII")
+
+    ply_format: Optional[str] = None
+    elements: List[PlyElement] = []
+    for line in lines:
+        parts = line.split()
+        if not parts or parts[0] in ("comment", "obj_info"):
+            continue
+        if parts[0] == "format":
+            if len(parts) < 2 or parts[1] not in PLY_FORMATS:
+                raise PlyError(f"Unsupported PLY format: {line}")
+            ply_format = parts[1]
+        elif parts[0] == "element":
+            if len(parts) != 3 or not parts[2].isdigit():
+                raise PlyError(f"Malformed element line: {line}")
+            elements.append(PlyElement(name=parts[1], count=int(parts[2])))
+        elif parts[0] == "property":
+            if not elements:
+                raise PlyError("Property declared before any element")
+            if parts[1] == "list":
+                elements[-1].has_list = True
+                continue
+            if len(parts) != 3 or parts[1] not in PLY_TYPES:
+                raise PlyError(f"Malformed property line: {line}")
+            elements[-1].properties.append((parts[2], parts[1]))
+        else:
+            raise PlyError(f"Unexpected PLY header line: {line}")
+
+    if ply_format is None:
+        raise PlyError("PLY header has no format line")
+    if not elements:
+        raise PlyError("PLY header declares no elements")
+
+    return PlyHeader(format=ply_format, elements=elements, header_size=newline + 1)
+
+def read_ply_header(file: BinaryIO) -> PlyHeader:
+    return parse_ply_header(file.read(MAX_HEADER_SIZE))
+
+def read_ply_element(path: Path, name: str = "vertex") -> np.ndarray:
+    """
+    Read one element of a PLY file as a structured array.
+    Binary files are memory-mapped rather than read into the heap.
+    """
+    with open(path, "rb") as f:
+        header = read_ply_header(f)
+
+    dtype = header.dtype(name)
+    count = header.element(name).count
+
+    if header.format == "ascii":
+        return _read_ascii_element(path, header, name, dtype, count)
+
+    offset = header.element_offset(name)
+    if offset + count * dtype.itemsize > path.stat().st_size:
+        raise PlyError(f"PLY '{name}' data is truncated")
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+
+def _read_ascii_element(path: Path, header: PlyHeader, name: str, dtype: np.dtype, count: int) -> np.ndarray:
+    skip_rows = 0
+    for element in header.elements:
+        if element.name == name:
+            break
+        skip_rows += element.count
+
+    with open(path, "rb") as f:
+        f.seek(header.header_size)
+        try:
+            rows = np.loadtxt(f, dtype=dtype, skiprows=skip_rows, max_rows=count, ndmin=1)
+        except ValueError as e:
+            raise PlyError(f"Malformed ASCII PLY data: {e}")
+
+    if len(rows) != count:
+        raise PlyError(f"PLY '{name}' data is truncated")
+    return rows
@@ -0,0 +1,188 @@
+import numpy as np
+from io import BytesIO
+from pathlib import Path
+from PIL import Image
+from services.asset_store import store_bytes
+from services.splats.gaussians import Gaussians, gaussians_from_splat
+
+POSTER_WIDTH = 960
+POSTER_HEIGHT = 540
+POSTER_QUALITY = 80
+
+# Matches the hero viewer: 60 degree FOV over a dark background
+POSTER_FOV_DEGREES = 60.0
+POSTER_BACKGROUND = (0x1a, 0x1a, 0x1a)
+
+# Processed models are importance ordered, so the poster renders only the
+# leading records; the rest barely change a still image
+POSTER_MAX_GAUSSIANS = 250_000
+
+# Gaussians composited per depth slab. Slabs are blended front to back;
+# within a slab contributions are combined order-independently.
+POSTER_SLAB_SIZE = 16384
+
+# Footprint windows (in pixel radius) that gaussians are bucketed into
+POSTER_FOOTPRINT_RADII = (1, 2, 4, 8, 16)
+
+NEAR_PLANE = 0.05
+MIN_ALPHA = 1.0 / 255.0
+MAX_ALPHA = 0.99
+
+def _rotation_matrices(q: np.ndarray) -> np.ndarray:
+    w, x, y, z = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+    return np.stack([
+        np.stack([1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)], axis=1),
+        np.stack([2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)], axis=1),
+        np.stack([2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)], axis=1),
+    ], axis=1)
+
+def _project(gaussians: Gaussians, width: int, height: int):
+    """
+    Project gaussians for a camera on the model's +z side looking at its
+    centroid, after the viewer's 180 degree flip about x (scans are y-down).
+    Returns screen centers, inverse 2D covariances (conics), pixel radii
+    and depths, for gaussians in front of the camera.
+    """
+    positions = gaussians.positions.astype(np.float64)
+    finite = np.all(np.isfinite(positions), axis=1)
+    if finite.any():
+        lower, upper = positions[finite].min(axis=0), positions[finite].max(axis=0)
+        center = positions[finite].mean(axis=0)
+        radius = max(float(np.linalg.norm(upper - lower)) / 2, 1e-6)
+    else:
+        center, radius = np.zeros(3), 1.0
+    distance = radius / np.sin(np.radians(POSTER_FOV_DEGREES) / 2)
+
+    # Camera space: x right, y up, depth forward. The flip negates y and z.
+    relative = positions - center
+    tx, ty, tz = relative[:, 0], -relative[:, 1], distance + relative[:, 2]
+    focal = (height / 2) / np.tan(np.radians(POSTER_FOV_DEGREES) / 2)
+
+    rotations = _rotation_matrices(gaussians.rotations.astype(np.float64))
+    rotations[:, 1, :] *= -1  # flip y of the world frame
+    m = rotations * gaussians.scales.astype(np.float64)[:, None, :]
+    covariance = m @ m.transpose(0, 2, 1)
+
+    # Jacobian of the perspective projection (image y points down)
+    safe_z = np.maximum(tz, NEAR_PLANE)
+    jacobian = np.zeros((len(positions), 2, 3))
+    jacobian[:, 0, 0] = focal / safe_z
+    jacobian[:, 0, 2] = -focal * tx / safe_z ** 2
+    jacobian[:, 1, 1] = -focal / safe_z
+    jacobian[:, 1, 2] = focal * ty / safe_z ** 2
+    screen = jacobian @ covariance @ jacobian.transpose(0, 2, 1)
+
+    # Low-pass filter so sub-pixel gaussians still cover a pixel
+    a = screen[:, 0, 0] + 0.3
+    b = screen[:, 0, 1]
+    c = screen[:, 1, 1] + 0.3
+    det = a * c - b * b
+
+    mid = (a + c) / 2
+    largest = mid + np.sqrt(np.maximum(mid * mid - det, 0.0))
+    radii = 3.0 * np.sqrt(np.maximum(largest, 0.0))
+
+    u = width / 2 + focal * tx / safe_z
+    v = height / 2 - focal * ty / safe_z
+
+    visible = (
+        finite & (tz > NEAR_PLANE) & (det > 0)
+        & (u + radii >= 0) & (u - radii < width)
+        & (v + radii >= 0) & (v - radii < height)
+    )
+    conics = np.stack([c / det, -b / det, a / det], axis=1)
+    return visible, u, v, conics, radii, tz
+
+def render_poster(gaussians: Gaussians, width: int = POSTER_WIDTH, height: int = POSTER_HEIGHT) -> np.ndarray:
+    """
+    Rasterize gaussians into an RGB image on the CPU: EWA-projected
+    footprints, depth sorted and alpha composited front to back in slabs.
+    """
+    visible, u, v, conics, radii, depth = _project(gaussians, width, height)
+    index = np.flatnonzero(visible)
+    index = index[np.argsort(depth[index], kind="stable")]
+
+    pixels = width * height
+    color = np.zeros((pixels, 3))
+    transmittance = np.ones(pixels)
+
+    u, v = u.astype(np.float32), v.astype(np.float32)
+    conics = conics.astype(np.float32)
+    rgb = gaussians.colors.astype(np.float32)
+    opacity = gaussians.opacities.astype(np.float32)
+    windows = np.searchsorted(POSTER_FOOTPRINT_RADII, np.minimum(radii, POSTER_FOOTPRINT_RADII[-1]))
+
+    for start in range(0, len(index), POSTER_SLAB_SIZE):
+        slab = index[start:start + POSTER_SLAB_SIZE]
+        targets, alphas, owners = [], [], []
+
+        for window, footprint in enumerate(POSTER_FOOTPRINT_RADII):
+            members = slab[windows[slab] == window]
+            if not len(members):
+                continue
+
+            # Footprint math in float32 over (gaussian, row, column) windows
+            offsets = np.arange(-footprint, footprint + 1, dtype=np.float32)
+            px = np.rint(u[members])[:, None, None] + offsets[None, None, :]
+            py = np.rint(v[members])[:, None, None] + offsets[None, :, None]
+            dx = px - u[members][:, None, None]
+            dy = py - v[members][:, None, None]
+
+            conic = conics[members]
+            power = (
+                (-0.5 * conic[:, 0, None, None]) * (dx * dx)
+                - conic[:, 1, None, None] * (dx * dy)
+                + (-0.5 * conic[:, 2, None, None]) * (dy * dy)
+            )
+            alpha = np.minimum(opacity[members][:, None, None] * np.exp(np.minimum(power, 0.0)), MAX_ALPHA)
+
+            inside = (alpha >= MIN_ALPHA) & (px >= 0) & (px < width) & (py >= 0) & (py < height)
+            targets.append((py * width + px)[inside].astype(np.intp))
+            alphas.append(alpha[inside])
+            owners.append(np.broadcast_to(members[:, None, None], inside.shape)[inside])
+
+        if not targets:
+            continue
+        target = np.concatenate(targets)
+        alpha = np.concatenate(alphas)
+        owner = np.concatenate(owners)
+
+        log_transmittance = np.bincount(target, weights=np.log1p(-alpha), minlength=pixels)
+        weight = np.bincount(target, weights=alpha, minlength=pixels)
+        weighted_color = np.stack([
+            np.bincount(target, weights=alpha * rgb[owner, channel], minlength=pixels)
+            for channel in range(3)
+        ], axis=1)
+
+        slab_transmittance = np.exp(log_transmittance)
+        covered = weight > 0
+        slab_color = np.zeros_like(weighted_color)
+        slab_color[covered] = weighted_color[covered] / weight[covered, None]
+
+        color += (transmittance * (1.0 - slab_transmittance))[:, None] * slab_color
+        transmittance *= slab_transmittance
+
+    background = np.array(POSTER_BACKGROUND, dtype=np.float64) / 255.0
+    color += transmittance[:, None] * background
+    image = np.clip(np.rint(color * 255.0), 0, 255).astype(np.uint8)
+    return image.reshape(height, width, 3)
+
+def render_poster_file(model_path: Path, upload_dir: Path) -> dict:
+    """
+    Render a WebP poster for a processed .splat model into the asset store.
+    Runs in a worker process. Returns an image variant record.
+    """
+    gaussians = gaussians_from_splat(model_path, limit=POSTER_MAX_GAUSSIANS)
+    image = Image.fromarray(render_poster(gaussians))
+
+    buffer = BytesIO()
+    image.save(buffer, "WEBP", quality=POSTER_QUALITY, method=4)
+    data = buffer.getvalue()
+
+    return {
+        "url": f"/uploads/{store_bytes(data, upload_dir, '.webp')}",
+        "width": image.width,
+        "height": image.height,
+        "format": "webp",
+        "size_bytes": len(data),
+    }
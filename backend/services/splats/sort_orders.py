@@ -0,0 +1,92 @@
+import numpy as np
+import os
+from pathlib import Path
+from typing import Optional
+from services.asset_store import store_bytes
+from services.splats.gaussians import gaussians_from_splat
+
+# Most evenly spaced azimuths a full auto-rotate turn is sampled at (0
+# disables)
+SORT_ORDER_AZIMUTHS = int(os.environ.get("SORT_ORDER_AZIMUTHS", "32"))
+
+# The orders may take at most this fraction of the .splat model's size (32
+# bytes per gaussian): 16 steps of uint16 indices, 8 of uint32. Fewer steps
+# are never taken than SORT_ORDER_MIN_AZIMUTHS.
+SORT_ORDER_SIZE_RATIO = float(os.environ.get("SORT_ORDER_SIZE_RATIO", "1.0"))
+SORT_ORDER_MIN_AZIMUTHS = 4
+SPLAT_RECORD_SIZE = 32
+
+# Larger models aren't served to the low-end devices that use these orders
+SORT_ORDER_MAX_GAUSSIANS = 262144
+
+# Hero viewer camera: 3 units out on +z, looking at the model, which is
+# flipped 180 degrees about x and spun about its y axis
+VIEWER_CAMERA_DISTANCE = 3.0
+
+SORT_ORDER_EXTENSION = ".order"
+
+def camera_position(azimuth: float, distance: float = VIEWER_CAMERA_DISTANCE) -> np.ndarray:
+    """
+    Camera position in model space when the model is spun by `azimuth`.
+    """
+    # The mesh matrix is Rx(pi) Ry(azimuth) (three.js XYZ Euler order), so
+    # the camera maps back through Ry(azimuth)^T Rx(pi)^T
+    return np.array([distance * np.sin(azimuth), 0.0, -distance * np.cos(azimuth)])
+
+def index_dtype(count: int) -> np.dtype:
+    """
+    Smallest unsigned index type that addresses `count` gaussians.
+    """
+    return np.dtype(np.uint16 if count <= 1 << 16 else np.uint32)
+
+def azimuth_steps(count: int, azimuths: int = SORT_ORDER_AZIMUTHS) -> int:
+    """
+    Azimuth steps to precompute for a model of `count` gaussians: as many as
+    the size budget allows, up to `azimuths`.
+    """
+    block_size = index_dtype(count).itemsize * count
+    budget = SORT_ORDER_SIZE_RATIO * SPLAT_RECORD_SIZE * count
+    return min(azimuths, max(SORT_ORDER_MIN_AZIMUTHS, int(budget // block_size)))
+
+def sort_orders(positions: np.ndarray, azimuths: int, distance: float = VIEWER_CAMERA_DISTANCE) -> np.ndarray:
+    """
+    Back-to-front gaussian orders (farthest first) for `azimuths` evenly
+    spaced spin angles, as an (azimuths, count) index array of the
+    smallest unsigned type that fits.
+    """
+    index_type = index_dtype(len(positions))
+    positions = positions.astype(np.float32)
+    orders = np.empty((azimuths, len(positions)), dtype=index_type)
+    for step in range(azimuths):
+        camera = camera_position(2 * np.pi * step / azimuths, distance).astype(np.float32)
+        distances = np.sum(np.square(positions - camera), axis=1)
+        orders[step] = np.argsort(-distances, kind="stable")
+    return orders
+
+def build_sort_orders_file(model_path: Path, upload_dir: Path, azimuths: int = SORT_ORDER_AZIMUTHS) -> Optional[dict]:
+    """
+    Precompute sort orders for a .splat model into the asset store. Runs in
+    a worker process. The file holds one little-endian index block per
+    azimuth, in azimuth order; the step count is capped by the size budget.
+    Returns None for models that are too large.
+    """
+    gaussians = gaussians_from_splat(model_path)
+    if not azimuths or not len(gaussians) or len(gaussians) > SORT_ORDER_MAX_GAUSSIANS:
+        return None
+
+    azimuths = azimuth_steps(len(gaussians), azimuths)
+
+    orders = sort_orders(gaussians.positions, azimuths)
+    data = orders.astype(orders.dtype.newbyteorder("<")).tobytes()
+    filename = store_bytes(data, upload_dir, SORT_ORDER_EXTENSION)
+
+    return {
+        "id": filename[:-len(SORT_ORDER_EXTENSION)],
+        "url": f"/uploads/{filename}",
+        "model_url": f"/uploads/{model_path.name}",
+        "azimuths": azimuths,
+        "index_type": orders.dtype.name,
+        "gaussian_count": len(gaussians),
+        "camera_distance": VIEWER_CAMERA_DISTANCE,
+        "size_bytes": len(data),
+    }
@@ -0,0 +1,139 @@
+import json
+import numpy as np
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+from services.asset_store import asset_path, store_bytes
+from services.splats.gaussians import SPLAT_DTYPE, SPLAT_MEDIA_TYPE, Gaussians, encode_splat, gaussians_from_splat
+from services.splats.lod import importance_scores
+from services.splats.morton import MORTON_BITS, morton_codes
+
+# Models with fewer gaussians than this are served whole
+TILING_MIN_GAUSSIANS = int(os.environ.get("TILING_MIN_GAUSSIANS", "500000"))
+
+# Nodes with at most this many gaussians become leaf tiles
+TILE_MAX_GAUSSIANS = 65536
+
+# Gaussians in the coarse aggregate stored for each interior node
+TILE_AGGREGATE_GAUSSIANS = 8192
+
+# Octree depth limit (a Morton code holds 21 levels)
+TILE_MAX_DEPTH = 10
+
+TILESET_EXTENSION = ".tiles"
+TILESET_MANIFEST_SUFFIX = ".tileset.json"
+
+def _bounds(positions: np.ndarray) -> dict:
+    return {
+        "min": [float(v) for v in positions.min(axis=0)],
+        "max": [float(v) for v in positions.max(axis=0)],
+    }
+
+def build_tileset(gaussians: Gaussians) -> Tuple[bytes, dict]:
+    """
+    Split gaussians into an octree of .splat tiles packed into one buffer.
+    Leaves hold every gaussian in their cell; interior nodes hold a coarse
+    aggregate of their subtree's most important gaussians, so a viewer can
+    start from the root and refine only visible cells. Returns the packed
+    bytes and a manifest of tile bounds and byte ranges.
+    """
+    codes = morton_codes(gaussians.positions)
+    order = np.argsort(codes, kind="stable")
+    gaussians = gaussians.take(order)
+    codes = codes[order]
+    scores = importance_scores(gaussians)
+
+    tiles = {}
+    buffers: List[bytes] = []
+    offset = 0
+    stack = [("r", 0, 0, len(gaussians))]
+
+    while stack:
+        tile_id, depth, start, end = stack.pop()
+        count = end - start
+        leaf = count <= TILE_MAX_GAUSSIANS or depth >= TILE_MAX_DEPTH
+
+        # Tiles are importance ordered too, so a partial tile still renders
+        node_scores = scores[start:end]
+        if leaf:
+            indices = np.argsort(-node_scores, kind="stable")
+        else:
+            indices = np.argpartition(-node_scores, TILE_AGGREGATE_GAUSSIANS)[:TILE_AGGREGATE_GAUSSIANS]
+            indices = indices[np.argsort(-node_scores[indices], kind="stable")]
+        data = encode_splat(gaussians.take(start + indices))
+
+        children = []
+        if not leaf:
+            # Cells at this depth are contiguous runs of the sorted codes
+            shift = np.uint64(3 * (MORTON_BITS - depth - 1))
+            digits = (codes[start:end] >> shift) & np.uint64(7)
+            edges = start + np.searchsorted(digits, np.arange(9, dtype=np.uint64))
+            for digit in range(8):
+                if edges[digit + 1] > edges[digit]:
+                    child_id = f"{tile_id}{digit}"
+                    children.append(child_id)
+                    stack.append((child_id, depth + 1, int(edges[digit]), int(edges[digit + 1])))
+
+        tiles[tile_id] = {
+            "depth": depth,
+            "bounds": _bounds(gaussians.positions[start:end]),
+            "offset": offset,
+            "length": len(data),
+            "gaussian_count": len(indices),
+            "subtree_gaussians": count,
+            "leaf": leaf,
+            "children": sorted(children),
+        }
+        buffers.append(data)
+        offset += len(data)
+
+    manifest = {
+        "format": "splat",
+        "media_type": SPLAT_MEDIA_TYPE,
+        "record_size": SPLAT_DTYPE.itemsize,
+        "gaussian_count": len(gaussians),
+        "root": "r",
+        "tiles": dict(sorted(tiles.items())),
+    }
+    return b"".join(buffers), manifest
+
+def tileset_manifest_path(upload_dir: Path, tileset_id: str) -> Path:
+    return asset_path(upload_dir, f"{tileset_id}{TILESET_MANIFEST_SUFFIX}")
+
+def build_tileset_file(model_path: Path, upload_dir: Path) -> Optional[dict]:
+    """
+    Tile a processed .splat model into the asset store. Runs in a worker
+    process. Returns the tileset summary, or None for models small enough
+    to serve whole.
+    """
+    gaussians = gaussians_from_splat(model_path)
+    if len(gaussians) < TILING_MIN_GAUSSIANS:
+        return None
+
+    data, manifest = build_tileset(gaussians)
+    filename = store_bytes(data, upload_dir, TILESET_EXTENSION)
+    tileset_id = filename[:-len(TILESET_EXTENSION)]
+
+    # The manifest is derived from the packed file, so it shares its address
+    manifest_path = tileset_manifest_path(upload_dir, tileset_id)
+    temp_path = manifest_path.with_name(f".{manifest_path.name}.tmp")
+    temp_path.write_text(json.dumps(manifest))
+    os.replace(temp_path, manifest_path)
+
+    return {
+        "id": tileset_id,
+        "url": f"/uploads/{filename}",
+        "manifest_url": f"/tilesets/{tileset_id}",
+        "tile_count": len(manifest["tiles"]),
+        "depth": max(tile["depth"] for tile in manifest["tiles"].values()),
+        "gaussian_count": manifest["gaussian_count"],
+        "size_bytes": len(data),
+    }
+
+@lru_cache(maxsize=32)
+def load_tileset_manifest(manifest_path: Path) -> dict:
+    """
+    Parsed manifest, cached per process; manifests never change once written.
+    """
+    return json.loads(manifest_path.read_text())
@@ -0,0 +1,237 @@
+import asyncio
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+from services.asset_store import IMMUTABLE_CACHE_CONTROL, content_hash, resolve_asset
+from services.uploads import TEMP_UPLOAD_PREFIX
+
+try:
+    import boto3
+    from botocore.exceptions import ClientError
+except ImportError:  # only needed for the S3 backend
+    boto3 = None
+    ClientError = Exception
+
+# "local" keeps assets in the upload directory; "s3" stores them in an
+# S3-compatible bucket (AWS, MinIO, ...) and serves reads from there
+ASSET_STORAGE = os.environ.get("ASSET_STORAGE", "local")
+
+S3_BUCKET = os.environ.get("S3_BUCKET", "")
+S3_PREFIX = os.environ.get("S3_PREFIX", "")
+S3_ENDPOINT_URL = os.environ.get("S3_ENDPOINT_URL") or None
+S3_REGION = os.environ.get("S3_REGION") or None
+
+# Base URL of a public bucket or CDN in front of it. Reads redirect there
+# instead of to presigned URLs when set.
+S3_PUBLIC_URL = os.environ.get("S3_PUBLIC_URL") or None
+
+# Lifetime of presigned read and upload URLs
+STORAGE_URL_EXPIRES = int(os.environ.get("STORAGE_URL_EXPIRES", "3600"))
+
+# Keys per bucket listing request (the S3 maximum)
+STORAGE_LIST_PAGE_SIZE = 1000
+
+@dataclass
+class StoredFile:
+    """
+    A file held by a storage backend, as listed.
+    """
+    name: str
+    size: int
+    modified: float
+
+class AssetStorage:
+    """
+    Durable home of uploaded assets, addressed by file name. The upload
+    directory stays the working copy that processing reads and writes; a
+    remote backend holds the canonical bytes and serves reads itself.
+    """
+    remote = False
+    # Read URLs are stable (a public bucket or CDN) rather than expiring
+    public_reads = False
+
+    async def save(self, path: Path, content_type: str, content_encoding: Optional[str] = None) -> None:
+        """
+        Store a file from the working copy under its name.
+        """
+
+    async def fetch(self, filename: str, destination: Path) -> bool:
+        """
+        Download a stored file into the working copy. Returns False if the
+        file isn't stored.
+        """
+        return False
+
+    async def size(self, filename: str) -> Optional[int]:
+        """
+        Size of a stored file, or None if it isn't stored.
+        """
+        return None
+
+    async def delete(self, filename: str) -> None:
+        pass
+
+    async def list(self, after: Optional[str] = None, limit: Optional[int] = None) -> List[StoredFile]:
+        """
+        Stored files in name order, starting after `after`, at most `limit`.
+        Only remote backends hold files outside the working copy.
+        """
+        return []
+
+    async def read_url(self, filename: str) -> Optional[str]:
+        """
+        URL clients can read the file from directly, if the backend has one.
+        """
+        return None
+
+    async def upload_form(self, filename: str, content_type: str, size: int) -> Optional[dict]:
+        """
+        Presigned form for uploading straight to the backend, if supported.
+        """
+        return None
+
+class LocalStorage(AssetStorage):
+    """
+    Assets live only in the upload directory and are served by the API.
+    """
+
+    def __init__(self, upload_dir: Path):
+        self.upload_dir = upload_dir
+
+    async def fetch(self, filename: str, destination: Path) -> bool:
+        return resolve_asset(self.upload_dir, filename).is_file()
+
+    async def size(self, filename: str) -> Optional[int]:
+        path = resolve_asset(self.upload_dir, filename)
+        return path.stat().st_size if path.is_file() else None
+
+    async def delete(self, filename: str) -> None:
+        resolve_asset(self.upload_dir, filename).unlink(missing_ok=True)
+
+class S3Storage(AssetStorage):
+    """
+    Assets in an S3-compatible bucket. boto3 is synchronous, so every call
+    runs in a thread. Reads redirect to the public URL or a presigned one,
+    and admins can upload straight to the bucket with presigned POSTs.
+    """
+    remote = True
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        public_url: Optional[str] = None,
+        client=None
+    ):
+        if client is None:
+            if boto3 is None:
+                raise RuntimeError("The S3 storage backend needs boto3")
+            client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.public_url = public_url.rstrip("/") if public_url else None
+        self.public_reads = self.public_url is not None
+
+    def key(self, filename: str) -> str:
+        return f"{self.prefix}{filename}"
+
+    async def save(self, path: Path, content_type: str, content_encoding: Optional[str] = None) -> None:
+        extra = {
+            "ContentType": content_type,
+            "CacheControl": IMMUTABLE_CACHE_CONTROL if content_hash(path.name) else "no-cache",
+        }
+        if content_encoding:
+            extra["ContentEncoding"] = content_encoding
+        await asyncio.to_thread(
+            self.client.upload_file, str(path), self.bucket, self.key(path.name), ExtraArgs=extra
+        )
+
+    async def fetch(self, filename: str, destination: Path) -> bool:
+        # Download beside the destination and rename, so readers never see
+        # a partial file
+        temp_path = destination.with_name(f"{TEMP_UPLOAD_PREFIX}{uuid.uuid4().hex}")
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            await asyncio.to_thread(
+                self.client.download_file, self.bucket, self.key(filename), str(temp_path)
+            )
+        except ClientError:
+            temp_path.unlink(missing_ok=True)
+            return False
+        os.replace(temp_path, destination)
+        return True
+
+    async def size(self, filename: str) -> Optional[int]:
+        try:
+            head = await asyncio.to_thread(
+                self.client.head_object, Bucket=self.bucket, Key=self.key(filename)
+            )
+        except ClientError:
+            return None
+        return head["ContentLength"]
+
+    async def delete(self, filename: str) -> None:
+        await asyncio.to_thread(
+            self.client.delete_object, Bucket=self.bucket, Key=self.key(filename)
+        )
+
+    async def list(self, after: Optional[str] = None, limit: Optional[int] = None) -> List[StoredFile]:
+        files = []
+        request = {"Bucket": self.bucket, "Prefix": self.prefix}
+        if after:
+            request["StartAfter"] = self.key(after)
+        while limit is None or len(files) < limit:
+            page_size = STORAGE_LIST_PAGE_SIZE if limit is None else min(STORAGE_LIST_PAGE_SIZE, limit - len(files))
+            page = await asyncio.to_thread(self.client.list_objects_v2, MaxKeys=page_size, **request)
+            for item in page.get("Contents", []):
+                files.append(StoredFile(
+                    name=item["Key"][len(self.prefix):],
+                    size=item["Size"],
+                    modified=item["LastModified"].timestamp()
+                ))
+                request["StartAfter"] = item["Key"]
+            if not page.get("IsTruncated"):
+                break
+        return files
+
+    async def read_url(self, filename: str) -> Optional[str]:
+        if self.public_url:
+            return f"{self.public_url}/{self.key(filename)}"
+        return await asyncio.to_thread(
+            self.client.generate_presigned_url,
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self.key(filename)},
+            ExpiresIn=STORAGE_URL_EXPIRES
+        )
+
+    async def upload_form(self, filename: str, content_type: str, size: int) -> Optional[dict]:
+        # The bucket enforces the declared size and type
+        return await asyncio.to_thread(
+            self.client.generate_presigned_post,
+            self.bucket,
+            self.key(filename),
+            Fields={"Content-Type": content_type, "Cache-Control": IMMUTABLE_CACHE_CONTROL},
+            Conditions=[
+                {"Content-Type": content_type},
+                {"Cache-Control": IMMUTABLE_CACHE_CONTROL},
+                ["content-length-range", size, size],
+            ],
+            ExpiresIn=STORAGE_URL_EXPIRES
+        )
+
+def create_storage(upload_dir: Path) -> AssetStorage:
+    """
+    The storage backend selected by ASSET_STORAGE.
+    """
+    if ASSET_STORAGE == "s3":
+        if not S3_BUCKET:
+            raise RuntimeError("ASSET_STORAGE=s3 needs S3_BUCKET")
+        return S3Storage(S3_BUCKET, S3_PREFIX, S3_ENDPOINT_URL, S3_REGION, S3_PUBLIC_URL)
+    if ASSET_STORAGE != "local":
+        raise RuntimeError(f"Unknown ASSET_STORAGE backend: {ASSET_STORAGE}")
+    return LocalStorage(upload_dir)
@@ -0,0 +1,118 @@
+import asyncio
+import hashlib
+import os
+import aiofiles
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional
+from fastapi import HTTPException, status
+from services.uploads import TEMP_UPLOAD_PREFIX, UPLOAD_CHUNK_SIZE
+
+if TYPE_CHECKING:
+    from services.upload_validation import UploadValidator
+
+# Abandoned sessions are swept after this many hours without activity
+UPLOAD_SESSION_TTL = timedelta(hours=int(os.environ.get("UPLOAD_SESSION_TTL_HOURS", "24")))
+
+def session_part_path(upload_dir: Path, session_id: str) -> Path:
+    """
+    Path of the part file a session's chunks are assembled into.
+    """
+    return upload_dir / f"{TEMP_UPLOAD_PREFIX}session_{session_id}"
+
+def merge_ranges(ranges: List[List[int]]) -> List[List[int]]:
+    """
+    Merge half-open [start, end) byte ranges into a sorted, non-overlapping list.
+    """
+    merged: List[List[int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+def bytes_received(ranges: List[List[int]]) -> int:
+    return sum(end - start for start, end in merge_ranges(ranges))
+
+def is_complete(ranges: List[List[int]], size: int) -> bool:
+    merged = merge_ranges(ranges)
+    return size == 0 or (len(merged) == 1 and merged[0] == [0, size])
+
+def session_expiry() -> datetime:
+    return datetime.now() + UPLOAD_SESSION_TTL
+
+async def create_part_file(upload_dir: Path, session_id: str, size: int) -> None:
+    """
+    Preallocate the part file so chunks can be written at any offset.
+    """
+    async with aiofiles.open(session_part_path(upload_dir, session_id), 'wb') as f:
+        await f.truncate(size)
+
+async def write_chunk(
+    upload_dir: Path,
+    session_id: str,
+    offset: int,
+    size: int,
+    chunks: AsyncIterator[bytes],
+    validator: Optional["UploadValidator"] = None
+) -> int:
+    """
+    Write a streamed chunk into the session part file at `offset`.
+    Returns the number of bytes written. Raises 416 if the data runs past
+    the declared session size. A validator, given for the chunk at offset
+    0, checks the file head before it is written.
+    """
+    written = 0
+
+    async with aiofiles.open(session_part_path(upload_dir, session_id), 'r+b') as f:
+        await f.seek(offset)
+        async for data in chunks:
+            if not data:
+                continue
+            if offset + written + len(data) > size:
+                raise HTTPException(
+                    status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                    detail=f"Chunk extends past declared upload size of {size} bytes"
+                )
+            if validator:
+                validator.feed(data)
+            await f.write(data)
+            written += len(data)
+
+    return written
+
+def _hash_file(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(UPLOAD_CHUNK_SIZE)
+            if not data:
+                break
+            hasher.update(data)
+    return hasher.hexdigest()
+
+async def finalize_hash(upload_dir: Path, session_id: str) -> str:
+    """
+    SHA-256 of the assembled part file, hashed from disk off the event loop.
+    Chunks may arrive out of order and on different worker processes, so no
+    hashing state is kept between requests.
+    """
+    return await asyncio.to_thread(_hash_file, session_part_path(upload_dir, session_id))
+
+def discard_session(upload_dir: Path, session_id: str) -> None:
+    session_part_path(upload_dir, session_id).unlink(missing_ok=True)
+
+async def expire_upload_sessions(db, upload_dir: Path, now: Optional[datetime] = None) -> int:
+    """
+    Remove sessions past their expiry along with their part files.
+    Returns the number of sessions removed.
+    """
+    now = now or datetime.now()
+    expired = await db.upload_sessions.find({"expires_at": {"$lt": now}}).to_list(None)
+
+    for session in expired:
+        discard_session(upload_dir, session["id"])
+        await db.upload_sessions.delete_one({"id": session["id"]})
+
+    return len(expired)
@@ -0,0 +1,218 @@
+import hashlib
+import numpy as np
+from pathlib import Path
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
+from services.asset_store import normalize_extension
+from services.splats.gaussians import SPLAT_DTYPE
+from services.splats.ply import MAX_HEADER_SIZE, PlyError, parse_ply_header
+from services.uploads import UPLOAD_CHUNK_SIZE
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif")
+
+# Upload kinds each endpoint accepts
+HERO_UPLOAD_KINDS = ("image", "ply", "splat")
+DEMO_UPLOAD_KINDS = ("image",)
+
+# Leading .splat records checked for sane values (.splat has no magic)
+SPLAT_CHECK_RECORDS = 64
+
+# Bytes needed to recognize any of the image signatures below
+IMAGE_SIGNATURE_SIZE = 12
+
+class UploadRejected(HTTPException):
+    """
+    Raised for uploads whose bytes are not the file type they claim to be.
+    """
+
+def _unsupported(detail: str) -> UploadRejected:
+    return UploadRejected(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=detail)
+
+def _malformed(detail: str) -> UploadRejected:
+    return UploadRejected(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
+
+def is_image_signature(data: bytes) -> bool:
+    return (
+        data.startswith(b"\xff\xd8\xff")
+        or data.startswith(b"\x89PNG\r\n\x1a\n")
+        or data.startswith((b"GIF87a", b"GIF89a"))
+        or (data[:4] == b"RIFF" and data[8:12] == b"WEBP")
+    )
+
+def is_ply_signature(data: bytes) -> bool:
+    return data.startswith((b"ply\n", b"ply\r\n"))
+
+def image_signature_extension(data: bytes) -> str:
+    """
+    File extension matching an image signature, for uploads named without one.
+    """
+    if data.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if data.startswith((b"GIF87a", b"GIF89a")):
+        return ".gif"
+    return ".webp"
+
+def declared_kind(filename: Optional[str], allowed: Tuple[str, ...] = HERO_UPLOAD_KINDS) -> Optional[str]:
+    """
+    The upload kind a file name claims, or None if it has no extension
+    (the bytes then decide). Raises 415 for extensions that aren't accepted.
+    """
+    extension = normalize_extension(filename)
+    if not extension:
+        return None
+    kind = "image" if extension in IMAGE_EXTENSIONS else extension[1:]
+    if kind not in allowed:
+        raise _unsupported(f"Unsupported file type: {extension}")
+    return kind
+
+def check_declared_size(filename: Optional[str], size: int, allowed: Tuple[str, ...] = HERO_UPLOAD_KINDS) -> Optional[str]:
+    """
+    Checks possible from the name and size alone, before any bytes arrive.
+    Returns the declared kind.
+    """
+    kind = declared_kind(filename, allowed)
+    if kind == "splat" and size % SPLAT_DTYPE.itemsize:
+        raise _malformed(f".splat size must be a multiple of the {SPLAT_DTYPE.itemsize} byte record size")
+    return kind
+
+class UploadValidator:
+    """
+    Checks that an upload is the kind of file its name claims, from the
+    leading chunks as they stream in: image signatures, the PLY header, or
+    the first .splat records. Only the head of the file is buffered; once
+    it has been checked the remaining chunks pass straight through.
+    finish() applies the checks that need the total size. A file named
+    without an extension is recognized from its bytes; kind and extension
+    then hold what was detected.
+    """
+
+    def __init__(self, filename: Optional[str], allowed: Tuple[str, ...] = HERO_UPLOAD_KINDS, max_size: Optional[int] = None):
+        self.kind = declared_kind(filename, allowed)
+        self.extension = normalize_extension(filename)
+        self.allowed = allowed
+        self.max_size = max_size
+        self.head = b""
+        self.checked = False
+        # Bytes a binary PLY needs for the elements its header declares
+        self.expected_size: Optional[int] = None
+
+    def feed(self, chunk: bytes) -> None:
+        if self.checked:
+            return
+        self.head += chunk
+        self.checked = self._check(final=False)
+        if self.checked:
+            self.head = b""
+
+    def finish(self, size: int) -> None:
+        if not self.checked:
+            self._check(final=True)
+            self.checked = True
+        if self.kind == "splat" and size % SPLAT_DTYPE.itemsize:
+            raise _malformed(f".splat size must be a multiple of the {SPLAT_DTYPE.itemsize} byte record size")
+        if self.expected_size is not None and size < self.expected_size:
+            raise _malformed(f"PLY data is truncated: header declares {self.expected_size} bytes, got {size}")
+
+    def _check(self, final: bool) -> bool:
+        """
+        Validate the buffered head. Returns False if more bytes are needed.
+        """
+        data = self.head
+        kind = self.kind
+        if kind is None:
+            if len(data) < IMAGE_SIGNATURE_SIZE and not final and not is_ply_signature(data):
+                return False
+            if is_ply_signature(data) and "ply" in self.allowed:
+                kind = self.kind = "ply"
+                self.extension = ".ply"
+            elif is_image_signature(data) and "image" in self.allowed:
+                kind = self.kind = "image"
+                self.extension = image_signature_extension(data)
+            else:
+                raise _unsupported("Unrecognized file type")
+
+        if kind == "image":
+            if len(data) < IMAGE_SIGNATURE_SIZE and not final:
+                return False
+            if not is_image_signature(data):
+                raise _unsupported("File is not a JPEG, PNG, GIF or WebP image")
+            return True
+
+        if kind == "ply":
+            return self._check_ply(data, final)
+
+        return self._check_splat(data, final)
+
+    def _check_ply(self, data: bytes, final: bool) -> bool:
+        if not is_ply_signature(data):
+            if not final and (b"ply\n".startswith(data) or b"ply\r\n".startswith(data)):
+                return False
+            raise _unsupported("File is not a PLY model")
+        try:
+            header = parse_ply_header(data[:MAX_HEADER_SIZE])
+        except PlyError as e:
+            if "incomplete" in str(e) and not final and len(data) < MAX_HEADER_SIZE:
+                return False
+            raise _malformed(f"Invalid PLY header: {e}")
+
+        try:
+            vertex = header.element("vertex")
+        except PlyError as e:
+            raise _malformed(str(e))
+        # Compressed PLYs pack positions into one quantized property
+        names = {name for name, _ in vertex.properties}
+        if not vertex.count or not ({"x", "y", "z"} <= names or "packed_position" in names):
+            raise _malformed("PLY has no vertex positions")
+
+        if header.format != "ascii" and not any(element.has_list for element in header.elements):
+            self.expected_size = header.header_size + sum(
+                element.count * header.dtype(element.name).itemsize for element in header.elements
+            )
+            if self.max_size is not None and self.expected_size > self.max_size:
+                raise UploadRejected(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"PLY header declares {self.expected_size} bytes, more than the allowed upload size"
+                )
+        return True
+
+    def _check_splat(self, data: bytes, final: bool) -> bool:
+        record_size = SPLAT_DTYPE.itemsize
+        if len(data) < SPLAT_CHECK_RECORDS * record_size and not final:
+            return False
+        if is_ply_signature(data) or is_image_signature(data):
+            raise _unsupported("File is not a .splat model")
+
+        count = min(len(data) // record_size, SPLAT_CHECK_RECORDS)
+        if not count:
+            raise _malformed(".splat file holds no complete records")
+        records = np.frombuffer(data[:count * record_size], dtype=SPLAT_DTYPE)
+        if not (np.all(np.isfinite(records["position"])) and np.all(np.isfinite(records["scale"]))):
+            raise _malformed(".splat records hold non-finite positions or scales")
+        return True
+
+def validate_file(path: Path, filename: Optional[str], allowed: Tuple[str, ...] = HERO_UPLOAD_KINDS) -> UploadValidator:
+    """
+    Run the streaming checks over a file already on disk (e.g. an upload
+    assembled from out-of-order chunks). Returns the finished validator.
+    """
+    validator = UploadValidator(filename, allowed)
+    with open(path, "rb") as f:
+        validator.feed(f.read(MAX_HEADER_SIZE))
+    validator.finish(path.stat().st_size)
+    return validator
+
+def verify_upload(path: Path, filename: Optional[str], sha256: str, allowed: Tuple[str, ...] = HERO_UPLOAD_KINDS) -> None:
+    """
+    Check a file that reached storage without passing through the API
+    (a presigned direct upload): its bytes must hash to the SHA-256 the
+    client declared, and pass the format checks.
+    """
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+    if hasher.hexdigest() != sha256:
+        raise _malformed("Uploaded file does not match its declared SHA-256")
+    validate_file(path, filename, allowed)
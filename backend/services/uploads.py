@@ -0,0 +1,138 @@
+import hashlib
+import re
+import uuid
+import aiofiles
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional
+from fastapi import HTTPException, UploadFile, status
+from fastapi.responses import JSONResponse
+
+if TYPE_CHECKING:
+    from services.upload_validation import UploadValidator
+
+# Size of each read from the incoming upload (1MB)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Prefix used for in-flight upload files so they are never served
+TEMP_UPLOAD_PREFIX = ".upload_"
+
+# Room for multipart boundaries and part headers around an uploaded file (64KB)
+MULTIPART_OVERHEAD = 64 * 1024
+
+@dataclass
+class StreamedUpload:
+    """
+    Result of streaming an upload to a temporary file in the upload directory.
+    """
+    temp_path: Path
+    size: int
+    sha256: str
+
+def format_size(size: int) -> str:
+    """
+    Human readable size string used in upload responses.
+    """
+    return f"{size / (1024*1024):.1f}MB"
+
+async def stream_upload_to_temp(
+    file: UploadFile,
+    upload_dir: Path,
+    max_size: int,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    validator: Optional["UploadValidator"] = None
+) -> StreamedUpload:
+    """
+    Copy an upload to a temp file in `upload_dir` in bounded chunks.
+    The SHA-256 and byte count are computed as the data streams through, and
+    a 413 is raised once more than `max_size` bytes have been copied. By
+    then Starlette has already spooled the whole multipart body, so
+    oversized requests are turned away before that by
+    UploadSizeLimitMiddleware; this check catches the file itself going
+    over. A validator sees the leading chunks before they are written, so
+    a file of the wrong type is rejected without copying the rest. The temp
+    file is removed on any failure.
+    """
+    temp_path = upload_dir / f"{TEMP_UPLOAD_PREFIX}{uuid.uuid4().hex}"
+    hasher = hashlib.sha256()
+    size = 0
+
+    try:
+        async with aiofiles.open(temp_path, 'wb') as f:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File size exceeds maximum allowed size of {format_size(max_size)}"
+                    )
+
+                if validator:
+                    validator.feed(chunk)
+                hasher.update(chunk)
+                await f.write(chunk)
+
+        if validator:
+            validator.finish(size)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    return StreamedUpload(temp_path=temp_path, size=size, sha256=hasher.hexdigest())
+
+def _too_large(limit: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Request body exceeds maximum allowed size of {format_size(limit)}"
+    )
+
+class UploadSizeLimitMiddleware:
+    """
+    Enforce upload size limits before a request body is parsed. Requests
+    to a limited path (a regular expression matched against the whole path)
+    are rejected from their Content-Length, and a body sent without one is
+    cut off as soon as it passes the limit, instead of being spooled first.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = [(re.compile(pattern), limit) for pattern, limit in limits.items()]
+
+    async def __call__(self, scope, receive, send):
+        limit = None
+        if scope["type"] == "http":
+            limit = next((limit for pattern, limit in self.limits if pattern.fullmatch(scope["path"])), None)
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > limit:
+            error = _too_large(limit)
+            response = JSONResponse({"detail": error.detail}, status_code=error.status_code)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise _too_large(limit)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+def discard_upload(upload: StreamedUpload) -> None:
+    """
+    Remove the temp file of an upload that will not be kept.
+    """
+    upload.temp_path.unlink(missing_ok=True)
@@ -28,6 +28,19 @@ class TestHomepageAPI(unittest.TestCase):
         response = requests.post(f"{self.api_url}/content/reset")
         self.assertEqual(response.status_code, 200, "Failed to reset homepage content")
 
+    def wait_for_job(self, upload_result, timeout=60):
+        """Poll the processing job of a hero upload until it finishes"""
+        self.assertIn("job_id", upload_result, "Upload response missing 'job_id' field")
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            response = requests.get(f"{self.api_url}/jobs/{upload_result['job_id']}")
+            self.assertEqual(response.status_code, 200, "Failed to get job status")
+            job = response.json()
+            if job["status"] in ("succeeded", "failed"):
+                return job
+            time.sleep(0.5)
+        self.fail("Upload processing did not finish in time")
+
     def test_get_homepage_content(self):
         """Test GET /api/homepage/content endpoint"""
         response = requests.get(f"{self.api_url}/content")
@@ -245,6 +258,12 @@ class TestHomepageAPI(unittest.TestCase):
         self.assertIn("image_url", result, "Response missing 'image_url' field")
         self.assertTrue(result["image_url"].startswith("/uploads/"), "Image URL not in expected format")
         
+        # Processing happens in a background job that then publishes the hero
+        job = self.wait_for_job(result)
+        self.assertEqual(job["status"], "succeeded", "Hero processing job failed")
+        self.assertTrue(job["published"], "Hero processing job did not publish")
+        self.assertEqual(job["progress"], 1.0, "Finished job should report full progress")
+        
         # Verify the image was stored in the database
         response = requests.get(f"{self.api_url}/content")
         content = response.json()
@@ -269,13 +288,13 @@ class TestHomepageAPI(unittest.TestCase):
             result = response.json()
             self.assertIn("message", result, f"Response missing 'message' field for index {index}")
             self.assertIn("image_url", result, f"Response missing 'image_url' field for index {index}")
-            self.assertTrue(result["image_url"].startswith("data:image/png;base64,"), f"Image URL not in base64 format for index {index}")
+            self.assertTrue(result["image_url"].startswith("/uploads/"), f"Image URL not a file path for index {index}")
             
             # Verify the image was stored in the database
             response = requests.get(f"{self.api_url}/content")
             content = response.json()
             self.assertIsNotNone(content["demo_items"][index]["image_base64"], f"Demo image not stored in database for index {index}")
-            self.assertTrue(content["demo_items"][index]["image_base64"].startswith("data:image/png;base64,"), f"Stored demo image not in base64 format for index {index}")
+            self.assertTrue(content["demo_items"][index]["image_base64"].startswith("/uploads/"), f"Stored demo image not a file path for index {index}")
 
     def test_upload_demo_invalid_index(self):
         """Test POST /api/homepage/upload/demo/{index} with invalid index"""
@@ -303,14 +322,29 @@ class TestHomepageAPI(unittest.TestCase):
         # Test uploading to hero endpoint
         response = requests.post(f"{self.api_url}/upload/hero", files=files)
         
-        # Should still work as the endpoint doesn't validate file types
-        self.assertEqual(response.status_code, 200, "Failed to upload text file as hero image")
+        # Uploads are sniffed as they stream in and unsupported types rejected
+        self.assertEqual(response.status_code, 415, "Text file should be rejected as hero upload")
+        
+        # A file named like a model must actually be one
+        files = {'file': ('model.ply', BytesIO(text_data), 'application/octet-stream')}
+        response = requests.post(f"{self.api_url}/upload/hero", files=files)
+        self.assertEqual(response.status_code, 415, "Non-PLY bytes should be rejected as a .ply upload")
         
-        # Verify the content was stored as a file path
+        # Truncated models are rejected too
+        header = b"ply\nformat binary_little_endian 1.0\nelement vertex 100\nproperty float x\nproperty float y\nproperty float z\nend_header\n"
+        files = {'file': ('model.ply', BytesIO(header + bytes(12 * 50)), 'application/octet-stream')}
+        response = requests.post(f"{self.api_url}/upload/hero", files=files)
+        self.assertEqual(response.status_code, 422, "Truncated PLY should be rejected")
+        
+        # Text is rejected for demo images as well
+        files = {'file': ('test.txt', BytesIO(text_data), 'text/plain')}
+        response = requests.post(f"{self.api_url}/upload/demo/0", files=files)
+        self.assertEqual(response.status_code, 415, "Text file should be rejected as demo image")
+        
+        # Nothing was stored in the database
         response = requests.get(f"{self.api_url}/content")
         content = response.json()
-        self.assertIsNotNone(content["hero"]["hero_image_base64"], "Hero image not stored in database")
-        self.assertTrue(content["hero"]["hero_image_base64"].startswith("/uploads/"), "Stored hero image has incorrect format")
+        self.assertIsNone(content["hero"]["hero_image_base64"], "Rejected upload should not change the hero")
 
     def test_complete_upload_flow(self):
         """Test the complete flow: upload images → fetch content → verify data"""
@@ -329,6 +363,7 @@ class TestHomepageAPI(unittest.TestCase):
         # Get the hero image URL
         hero_result = response.json()
         hero_image_url = hero_result["image_url"]
+        self.wait_for_job(hero_result)
         
         # Upload demo images
         for index in range(3):
@@ -346,7 +381,7 @@ class TestHomepageAPI(unittest.TestCase):
         # Verify demo images
         for index in range(3):
             self.assertIsNotNone(content["demo_items"][index]["image_base64"], f"Demo image not stored in database for index {index}")
-            self.assertTrue(content["demo_items"][index]["image_base64"].startswith("data:image/png;base64,"), f"Stored demo image not in base64 format for index {index}")
+            self.assertTrue(content["demo_items"][index]["image_base64"].startswith("/uploads/"), f"Stored demo image not a file path for index {index}")
         
         # Update content with PUT and verify data is preserved
         # For this test, we need to include the hero_image_base64 in the update to preserve it
@@ -374,6 +409,127 @@ class TestHomepageAPI(unittest.TestCase):
         self.assertIsNotNone(content["hero"]["hero_image_base64"], "Hero image lost after content update")
         self.assertEqual(content["hero"]["hero_image_base64"], hero_image_base64, "Hero image URL changed after update")
 
+    def test_resumable_hero_upload(self):
+        """Test the resumable hero upload session flow"""
+        model_data = (
+            b"ply\nformat binary_little_endian 1.0\nelement vertex 1024\n"
+            b"property float x\nproperty float y\nproperty float z\nend_header\n"
+        ) + bytes(range(256)) * 48
+        
+        # Create a session
+        response = requests.post(
+            f"{self.api_url}/upload/hero/sessions",
+            json={"filename": "model.ply", "size": len(model_data)}
+        )
+        self.assertEqual(response.status_code, 200, "Failed to create upload session")
+        session_id = response.json()["id"]
+        
+        # Send the second half first, then check the received ranges
+        half = len(model_data) // 2
+        response = requests.put(
+            f"{self.api_url}/upload/hero/sessions/{session_id}?offset={half}",
+            data=model_data[half:]
+        )
+        self.assertEqual(response.status_code, 200, "Failed to upload second chunk")
+        self.assertEqual(response.json()["received"], [[half, len(model_data)]], "Unexpected received ranges")
+        
+        # Finalizing an incomplete upload is rejected
+        response = requests.post(f"{self.api_url}/upload/hero/sessions/{session_id}/complete")
+        self.assertEqual(response.status_code, 409, "Incomplete upload should not finalize")
+        
+        # Resume with the missing first half
+        response = requests.put(
+            f"{self.api_url}/upload/hero/sessions/{session_id}?offset=0",
+            data=model_data[:half]
+        )
+        self.assertTrue(response.json()["complete"], "Session should be complete")
+        
+        # Finalize and verify the hero points at the assembled file
+        response = requests.post(f"{self.api_url}/upload/hero/sessions/{session_id}/complete")
+        self.assertEqual(response.status_code, 200, "Failed to finalize upload session")
+        image_url = response.json()["image_url"]
+        job = self.wait_for_job(response.json())
+        
+        content = requests.get(f"{self.api_url}/content").json()
+        self.assertEqual(content["hero"]["hero_source_url"], image_url, "Hero not updated to assembled file")
+        self.assertEqual(content["hero"]["hero_image_base64"], job["result"]["image_url"], "Hero not serving the job result")
+        
+        response = requests.get(f"{self.api_url}{image_url}")
+        self.assertEqual(response.content, model_data, "Assembled file does not match uploaded bytes")
+
+    def test_uploaded_file_ranges_and_conditional_get(self):
+        """Test Range, If-Range and conditional GET on /api/homepage/uploads/{filename}"""
+        model_data = bytes(range(256)) * 64
+        files = {'file': ('model.splat', BytesIO(model_data), 'application/octet-stream')}
+        response = requests.post(f"{self.api_url}/upload/hero", files=files)
+        self.assertEqual(response.status_code, 200, "Failed to upload hero model")
+        self.wait_for_job(response.json())
+        file_url = f"{self.api_url}{response.json()['image_url']}"
+        
+        # Full response advertises range support and validators
+        response = requests.get(file_url)
+        self.assertEqual(response.status_code, 200, "Failed to fetch uploaded file")
+        self.assertEqual(response.headers.get("Accept-Ranges"), "bytes", "Missing Accept-Ranges header")
+        etag = response.headers.get("ETag")
+        self.assertIsNotNone(etag, "Missing ETag header")
+        
+        # Models are stored in importance order, so compare against the served bytes
+        model_data = response.content
+        
+        # Revalidation returns 304
+        response = requests.get(file_url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304, "Matching ETag should return 304")
+        
+        # Single range
+        response = requests.get(file_url, headers={"Range": "bytes=0-31"})
+        self.assertEqual(response.status_code, 206, "Range request should return 206")
+        self.assertEqual(response.content, model_data[:32], "Incorrect range content")
+        self.assertEqual(response.headers.get("Content-Range"), f"bytes 0-31/{len(model_data)}", "Incorrect Content-Range")
+        
+        # Multiple ranges
+        response = requests.get(file_url, headers={"Range": "bytes=0-9,100-109"})
+        self.assertEqual(response.status_code, 206, "Multi-range request should return 206")
+        self.assertTrue(response.headers["Content-Type"].startswith("multipart/byteranges"), "Expected multipart/byteranges")
+        
+        # Stale If-Range falls back to the full file
+        response = requests.get(file_url, headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+        self.assertEqual(response.status_code, 200, "Stale If-Range should return the full file")
+        self.assertEqual(len(response.content), len(model_data), "Expected full file content")
+        
+        # Unsatisfiable range
+        response = requests.get(file_url, headers={"Range": f"bytes={len(model_data)}-"})
+        self.assertEqual(response.status_code, 416, "Unsatisfiable range should return 416")
+        
+        # Byte budgets return a whole-record prefix of the model
+        response = requests.get(f"{file_url}?budget=100")
+        self.assertEqual(response.status_code, 200, "Budgeted request should return 200")
+        self.assertEqual(response.content, model_data[:96], "Budget should be cut to whole 32 byte records")
+
+    def test_asset_garbage_collection(self):
+        """Test that unused asset collection reports reclaimable bytes and keeps the live hero"""
+        model_data = bytes(range(256)) * 64
+        files = {'file': ('model.splat', BytesIO(model_data), 'application/octet-stream')}
+        response = requests.post(f"{self.api_url}/upload/hero", files=files)
+        self.assertEqual(response.status_code, 200, "Failed to upload hero model")
+        job = self.wait_for_job(response.json())
+        
+        # A dry run only reports
+        response = requests.post(f"{self.api_url}/maintenance/asset-gc?dry_run=true")
+        self.assertEqual(response.status_code, 200, "Failed to run asset garbage collection")
+        stats = response.json()
+        for key in ("scanned", "deleted", "bytes_reclaimed", "kept", "next_after"):
+            self.assertIn(key, stats, f"Missing {key} in garbage collection report")
+        self.assertTrue(stats["dry_run"], "Dry run not reported")
+        
+        # Limited sweeps report where to continue
+        response = requests.post(f"{self.api_url}/maintenance/asset-gc?limit=1")
+        self.assertEqual(response.status_code, 200, "Failed to run incremental garbage collection")
+        self.assertLessEqual(response.json()["scanned"], 1, "Sweep exceeded its limit")
+        
+        # The live hero is never collected
+        response = requests.get(f"{self.api_url}{job['result']['image_url']}")
+        self.assertEqual(response.status_code, 200, "Live hero model was collected")
+
 class TestPlayCanvasURLFunctionality(unittest.TestCase):
     """Test the PlayCanvas URL functionality for homepage hero section"""
 
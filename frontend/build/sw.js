@@ -1,10 +1,53 @@
 // Service Worker for PlayCanvas Caching
 const CACHE_NAME = 'playcanvas-cache-v1';
+const ASSET_CACHE_NAME = 'uploaded-assets-v1';
 const PLAYCANVAS_ASSETS = [
   '/node_modules/playcanvas/build/playcanvas.min.js',
   '/node_modules/playcanvas/build/playcanvas.js'
 ];
 
+// Uploaded assets named by their SHA-256 never change once published,
+// and neither do their chunk manifests
+const CONTENT_ADDRESSED_ASSET = /\/api\/homepage\/uploads\/[0-9a-f]{64}(\.[a-z0-9]+)*(\/chunks)?$/;
+
+// Chunk URLs carry the chunk's own SHA-256, so identical chunks of
+// different files (or of a replaced model) share one cache entry
+const ASSET_CHUNK = /\/api\/homepage\/uploads\/[^/]+\/chunks\/\d+$/;
+const CHUNK_HASH = /^[0-9a-f]{64}$/;
+
+const isContentAddressedAsset = (request) =>
+  request.method === 'GET' &&
+  !request.headers.has('range') &&
+  CONTENT_ADDRESSED_ASSET.test(new URL(request.url).pathname);
+
+const chunkCacheKey = (request) => {
+  if (request.method !== 'GET' || request.headers.has('range')) {
+    return null;
+  }
+  const url = new URL(request.url);
+  const hash = url.searchParams.get('sha256');
+  if (!ASSET_CHUNK.test(url.pathname) || !hash || !CHUNK_HASH.test(hash)) {
+    return null;
+  }
+  return new Request(`${self.location.origin}/__asset-chunks/${hash}`);
+};
+
+const cacheFirst = (request, cacheKey) =>
+  caches.open(ASSET_CACHE_NAME).then((cache) =>
+    cache.match(cacheKey).then((cached) => {
+      if (cached) {
+        return cached;
+      }
+
+      return fetch(request).then((response) => {
+        if (response && response.status === 200) {
+          cache.put(cacheKey, response.clone());
+        }
+        return response;
+      });
+    })
+  );
+
 // Install event - cache PlayCanvas assets
 self.addEventListener('install', (event) => {
   event.waitUntil(
@@ -37,6 +80,19 @@ self.addEventListener('activate', (event) => {
 
 // Fetch event - serve from cache first for PlayCanvas assets
 self.addEventListener('fetch', (event) => {
+  // Model chunks are cached by content hash rather than by URL
+  const chunkKey = chunkCacheKey(event.request);
+  if (chunkKey) {
+    event.respondWith(cacheFirst(event.request, chunkKey));
+    return;
+  }
+
+  // Content-addressed uploads are served from cache without revalidation
+  if (isContentAddressedAsset(event.request)) {
+    event.respondWith(cacheFirst(event.request, event.request));
+    return;
+  }
+
   // Only handle PlayCanvas related requests
   if (PLAYCANVAS_ASSETS.some(asset => event.request.url.includes(asset)) || 
       event.request.url.includes('playcanvas')) {
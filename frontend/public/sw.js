@@ -1,10 +1,83 @@
 // Service Worker for PlayCanvas Caching
 const CACHE_NAME = 'playcanvas-cache-v1';
+const ASSET_CACHE_NAME = 'uploaded-assets-v1';
 const PLAYCANVAS_ASSETS = [
   '/node_modules/playcanvas/build/playcanvas.min.js',
   '/node_modules/playcanvas/build/playcanvas.js'
 ];
 
+// Uploaded assets named by their SHA-256 never change once published,
+// and neither do their chunk manifests
+const CONTENT_ADDRESSED_ASSET = /\/api\/homepage\/uploads\/[0-9a-f]{64}(\.[a-z0-9]+)*(\/chunks)?$/;
+
+// Chunk URLs carry the chunk's own SHA-256, so identical chunks of
+// different files (or of a replaced model) share one cache entry
+const ASSET_CHUNK = /\/api\/homepage\/uploads\/[^/]+\/chunks\/\d+$/;
+const CHUNK_HASH = /^[0-9a-f]{64}$/;
+
+// Chunks can't be traced back to a file, so only this many are kept,
+// oldest dropped first (about 200MB at the 2MB chunk size)
+const MAX_CACHED_CHUNKS = 100;
+
+// The published homepage content, and the uploads it points at
+const HOMEPAGE_CONTENT = /\/api\/homepage\/content$/;
+const UPLOAD_REFERENCE = /\/uploads\/([^/?#\s"']+)/g;
+
+const isContentAddressedAsset = (request) =>
+  request.method === 'GET' &&
+  !request.headers.has('range') &&
+  CONTENT_ADDRESSED_ASSET.test(new URL(request.url).pathname);
+
+const chunkCacheKey = (request) => {
+  if (request.method !== 'GET' || request.headers.has('range')) {
+    return null;
+  }
+  const url = new URL(request.url);
+  const hash = url.searchParams.get('sha256');
+  if (!ASSET_CHUNK.test(url.pathname) || !hash || !CHUNK_HASH.test(hash)) {
+    return null;
+  }
+  return new Request(`${self.location.origin}/__asset-chunks/${hash}`);
+};
+
+const cacheFirst = (request, cacheKey, onStored) =>
+  caches.open(ASSET_CACHE_NAME).then((cache) =>
+    cache.match(cacheKey).then((cached) => {
+      if (cached) {
+        return cached;
+      }
+
+      return fetch(request).then((response) => {
+        if (response && response.status === 200) {
+          cache.put(cacheKey, response.clone()).then(() => onStored && onStored(cache));
+        }
+        return response;
+      });
+    })
+  );
+
+// Drop the oldest chunks beyond the cap; cache keys list in insertion order
+const trimChunks = (cache) =>
+  cache.keys().then((requests) => {
+    const chunks = requests.filter((request) => new URL(request.url).pathname.startsWith('/__asset-chunks/'));
+    return Promise.all(chunks.slice(0, Math.max(0, chunks.length - MAX_CACHED_CHUNKS)).map((request) => cache.delete(request)));
+  });
+
+// Drop cached uploads the current homepage content no longer points at.
+// Replaced heroes and variants are never requested again, so they would
+// otherwise stay cached for good.
+const trimUploads = (content) => {
+  const referenced = new Set(Array.from(JSON.stringify(content).matchAll(UPLOAD_REFERENCE), (match) => match[1]));
+  return caches.open(ASSET_CACHE_NAME).then((cache) =>
+    cache.keys().then((requests) =>
+      Promise.all(requests.map((request) => {
+        const match = new URL(request.url).pathname.match(/\/uploads\/([^/]+)/);
+        return match && !referenced.has(match[1]) ? cache.delete(request) : null;
+      }))
+    )
+  );
+};
+
 // Install event - cache PlayCanvas assets
 self.addEventListener('install', (event) => {
   event.waitUntil(
@@ -37,6 +110,33 @@ self.addEventListener('activate', (event) => {
 
 // Fetch event - serve from cache first for PlayCanvas assets
 self.addEventListener('fetch', (event) => {
+  // Model chunks are cached by content hash rather than by URL
+  const chunkKey = chunkCacheKey(event.request);
+  if (chunkKey) {
+    event.respondWith(cacheFirst(event.request, chunkKey, trimChunks));
+    return;
+  }
+
+  // Homepage content goes to the network as usual; a fresh copy tells
+  // which cached uploads are still in use
+  if (event.request.method === 'GET' && HOMEPAGE_CONTENT.test(new URL(event.request.url).pathname)) {
+    event.respondWith(
+      fetch(event.request).then((response) => {
+        if (response.status === 200) {
+          event.waitUntil(response.clone().json().then(trimUploads).catch(() => null));
+        }
+        return response;
+      })
+    );
+    return;
+  }
+
+  // Content-addressed uploads are served from cache without revalidation
+  if (isContentAddressedAsset(event.request)) {
+    event.respondWith(cacheFirst(event.request, event.request));
+    return;
+  }
+
   // Only handle PlayCanvas related requests
   if (PLAYCANVAS_ASSETS.some(asset => event.request.url.includes(asset)) || 
       event.request.url.includes('playcanvas')) {
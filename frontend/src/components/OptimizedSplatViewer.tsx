@@ -136,28 +136,46 @@ const OptimizedSplatViewer: React.FC<OptimizedSplatViewerProps> = ({
         if (splatUrl && (splatUrl.includes('.ply') || splatUrl.includes('.splat'))) {
           try {
             let fileUrl = splatUrl;
+            let apiBase = '';
             if (splatUrl.startsWith('/uploads/')) {
               const BACKEND_URL = import.meta.env.VITE_REACT_APP_BACKEND_URL || process.env.REACT_APP_BACKEND_URL;
-              fileUrl = `${BACKEND_URL}/api/homepage${splatUrl}`;
+              apiBase = `${BACKEND_URL}/api/homepage`;
+              fileUrl = `${apiBase}${splatUrl}`;
             }
             
-            const splatMesh = new SplatMesh({ 
-              url: fileUrl,
-              alphaTest: 0.2,
-              alphaHash: false,
-              halfFloat: true,
-              sphericalHarmonics: false,
-              renderMode: 'basic',
-              progressiveLoad: true,
-              maxSplats: caps.isLowEndDevice ? 500000 : 1000000,
-            });
+            const addSplatMesh = (source: { url: string } | { fileBytes: Uint8Array; fileName?: string }) => {
+              const splatMesh = new SplatMesh({ 
+                ...source,
+                alphaTest: 0.2,
+                alphaHash: false,
+                halfFloat: true,
+                sphericalHarmonics: false,
+                renderMode: 'basic',
+                progressiveLoad: true,
+                maxSplats: caps.isLowEndDevice ? 500000 : 1000000,
+              });
+              
+              splatMesh.position.set(0, 0, 0);
+              splatMesh.rotation.x = Math.PI;
+              splatMesh.scale.set(1, 1, 1);
+              
+              scene.add(splatMesh);
+              splatMeshRef.current = splatMesh;
+              return splatMesh;
+            };
             
-            splatMesh.position.set(0, 0, 0);
-            splatMesh.rotation.x = Math.PI;
-            splatMesh.scale.set(1, 1, 1);
+            const splatMesh = addSplatMesh({ url: fileUrl });
             
-            scene.add(splatMesh);
-            splatMeshRef.current = splatMesh;
+            // If the direct load fails, resume it as retried, hash-verified chunks
+            if (apiBase) {
+              splatMesh.initialized?.catch(async (loadError: Error) => {
+                console.warn('Model load failed, retrying as chunks:', loadError);
+                const fileBytes = await sparkJSLoader.fetchModelBytes(apiBase, splatUrl).catch(() => null);
+                if (!mounted || !fileBytes) return;
+                scene.remove(splatMesh);
+                addSplatMesh({ fileBytes, fileName: splatUrl.split('/').pop() });
+              });
+            }
             
           } catch (splatError) {
             console.error('Splat loading failed:', splatError);
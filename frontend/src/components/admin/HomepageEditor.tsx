@@ -6,6 +6,8 @@ import { Label } from '@/components/ui/label';
 import { Textarea } from '@/components/ui/textarea';
 import { Badge } from '@/components/ui/badge';
 import { useToast } from '@/hooks/use-toast';
+import { resolveUploadUrl, type ImageVariant } from '@/utils/formatters';
+import { sparkJSLoader, type ModelVariant } from '@/services/sparkjs-loader';
 import SplatViewer from '../SplatViewer';
 import { 
   Save, 
@@ -25,6 +27,9 @@ interface HomepageHeroContent {
   headline: string;
   subheadline: string;
   hero_image_base64?: string;
+  hero_image_variants?: ImageVariant[];
+  hero_model_poster?: ImageVariant | null;
+  hero_model_variants?: ModelVariant[];
   primary_cta_text: string;
   primary_cta_url: string;
   secondary_cta_text: string;
@@ -50,6 +55,7 @@ interface HomepageDemoItem {
   name: string;
   description: string;
   image_base64?: string;
+  image_variants?: ImageVariant[];
   menu_link: string;
   emoji: string;
 }
@@ -61,6 +67,29 @@ interface HomepageContent {
   demo_items: HomepageDemoItem[];
 }
 
+// Background processing of an upload (GET /api/homepage/jobs/{id})
+interface AssetJob {
+  id: string;
+  status: 'queued' | 'running' | 'succeeded' | 'failed';
+  progress: number;
+  published: boolean;
+  superseded: boolean;
+  error?: string | null;
+}
+
+// Presigned upload straight to the storage bucket (POST /api/homepage/upload/hero/direct)
+interface DirectUpload {
+  stored_filename: string;
+  exists: boolean;
+  upload_url?: string | null;
+  fields: Record<string, string>;
+}
+
+const JOB_POLL_INTERVAL_MS = 1000;
+
+// Whether the backend accepts direct uploads; asked once, on first use
+let directUploadsAvailable: boolean | null = null;
+
 const HomepageEditor = () => {
   const [content, setContent] = useState<HomepageContent | null>(null);
   const [loading, setLoading] = useState(true);
@@ -294,6 +323,115 @@ const HomepageEditor = () => {
     });
   };
 
+  const waitForAssetJob = async (backendUrl: string, jobId: string): Promise<AssetJob> => {
+    for (;;) {
+      const response = await fetch(`${backendUrl}/api/homepage/jobs/${jobId}`, { cache: 'no-cache' });
+      if (!response.ok) {
+        throw new Error(`Failed to check processing status (${response.status})`);
+      }
+
+      const job: AssetJob = await response.json();
+      if (job.published || job.status === 'succeeded' || job.status === 'failed') {
+        return job;
+      }
+      await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    }
+  };
+
+  // POST a form with an XMLHttpRequest so hero upload progress can be shown
+  const postWithProgress = (url: string, formData: FormData): Promise<any> => {
+    const xhr = new XMLHttpRequest();
+    
+    // Track upload progress
+    xhr.upload.addEventListener('progress', (e) => {
+      if (e.lengthComputable) {
+        const percentComplete = (e.loaded / e.total) * 100;
+        setUploadProgress(prev => ({ ...prev, hero: percentComplete }));
+      }
+    });
+
+    // Handle completion
+    const uploadPromise = new Promise((resolve, reject) => {
+      xhr.onload = () => {
+        if (xhr.status >= 200 && xhr.status < 300) {
+          try {
+            // Storage buckets answer direct uploads with an empty 204
+            resolve(xhr.responseText ? JSON.parse(xhr.responseText) : null);
+          } catch (parseError) {
+            reject(new Error('Invalid server response'));
+          }
+        } else {
+          // Try to parse error response
+          try {
+            const errorResponse = JSON.parse(xhr.responseText);
+            reject(new Error(errorResponse.detail || `Upload failed: ${xhr.statusText}`));
+          } catch (parseError) {
+            reject(new Error(`Upload failed: ${xhr.statusText} (${xhr.status})`));
+          }
+        }
+      };
+      
+      xhr.onerror = () => reject(new Error('Network error during upload'));
+    });
+
+    // Send request
+    xhr.open('POST', url);
+    xhr.send(formData);
+    return uploadPromise;
+  };
+
+  // Upload a hero file straight to the storage bucket with a presigned form.
+  // Resolves to null when the backend stores assets locally or the browser
+  // can't hash the file, and the caller then uploads through the API instead.
+  const uploadHeroDirect = async (backendUrl: string, file: File): Promise<any> => {
+    // Images go through the API, which strips their metadata. Hashing needs
+    // crypto.subtle, which only secure (https) pages have.
+    if (directUploadsAvailable === false || !/\.(ply|splat)$/i.test(file.name) || !globalThis.crypto?.subtle) {
+      return null;
+    }
+
+    // Ask before reading and hashing what may be a 200MB file
+    if (directUploadsAvailable === null) {
+      const support = await fetch(`${backendUrl}/api/homepage/upload/hero/direct`);
+      directUploadsAvailable = support.ok && (await support.json()).available === true;
+      if (!directUploadsAvailable) return null;
+    }
+
+    const digest = await crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+    const sha256 = Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('');
+    const declared = JSON.stringify({ filename: file.name, size: file.size, sha256 });
+    const post = (path: string) => fetch(`${backendUrl}/api/homepage/upload/hero/${path}`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: declared
+    });
+
+    const response = await post('direct');
+    if (response.status === 501) {
+      directUploadsAvailable = false;
+      return null;
+    }
+    const direct: DirectUpload = await response.json();
+    if (!response.ok) {
+      throw new Error((direct as any).detail || `Upload failed (${response.status})`);
+    }
+
+    // Identical bytes already in storage are not sent again
+    if (!direct.exists && direct.upload_url) {
+      const formData = new FormData();
+      Object.entries(direct.fields).forEach(([name, value]) => formData.append(name, value));
+      formData.append('file', file);
+      await postWithProgress(direct.upload_url, formData);
+    }
+
+    const completed = await post('direct/complete');
+    const result = await completed.json();
+    if (!completed.ok) {
+      throw new Error(result.detail || `Upload failed (${completed.status})`);
+    }
+    return result;
+  };
+
   const uploadHeroImage = async (file: File) => {
     try {
       // Check file size on frontend (200MB limit)
@@ -313,55 +451,38 @@ const HomepageEditor = () => {
       setUploadProgress({ ...uploadProgress, hero: 0 });
       
       const backendUrl = import.meta.env.VITE_REACT_APP_BACKEND_URL || process.env.REACT_APP_BACKEND_URL;
-      const formData = new FormData();
-      formData.append('file', file);
-
-      // Create XMLHttpRequest to track upload progress
-      const xhr = new XMLHttpRequest();
-      
-      // Track upload progress
-      xhr.upload.addEventListener('progress', (e) => {
-        if (e.lengthComputable) {
-          const percentComplete = (e.loaded / e.total) * 100;
-          setUploadProgress(prev => ({ ...prev, hero: percentComplete }));
-        }
-      });
-
-      // Handle completion
-      const uploadPromise = new Promise((resolve, reject) => {
-        xhr.onload = () => {
-          if (xhr.status >= 200 && xhr.status < 300) {
-            try {
-              resolve(JSON.parse(xhr.responseText));
-            } catch (parseError) {
-              reject(new Error('Invalid server response'));
-            }
-          } else {
-            // Try to parse error response
-            try {
-              const errorResponse = JSON.parse(xhr.responseText);
-              reject(new Error(errorResponse.detail || `Upload failed: ${xhr.statusText}`));
-            } catch (parseError) {
-              reject(new Error(`Upload failed: ${xhr.statusText} (${xhr.status})`));
-            }
-          }
-        };
-        
-        xhr.onerror = () => reject(new Error('Network error during upload'));
-      });
+      // Straight to the storage bucket when the backend has one, else through the API
+      let result = await uploadHeroDirect(backendUrl, file);
+      if (!result) {
+        const formData = new FormData();
+        formData.append('file', file);
+        result = await postWithProgress(`${backendUrl}/api/homepage/upload/hero`, formData);
+      }
 
-      // Send request
-      xhr.open('POST', `${backendUrl}/api/homepage/upload/hero`);
-      xhr.send(formData);
+      // Processing runs in the background; wait until the upload is live
+      setUploadProgress(prev => ({ ...prev, hero: 99 }));
+      const job = await waitForAssetJob(backendUrl, result.job_id);
+      if (!job.published) {
+        throw new Error(job.error || (job.superseded ? 'A newer upload replaced this one' : 'Processing failed'));
+      }
 
-      const result = await uploadPromise;
+      const contentResponse = await fetch(`${backendUrl}/api/homepage/content`, { cache: 'no-cache' });
+      const published: HomepageContent = await contentResponse.json();
 
       if (content && result) {
+        // Take every processed field of the published hero; only the text
+        // being edited stays local
+        const { headline, subheadline, primary_cta_text, primary_cta_url, secondary_cta_text, secondary_cta_url } = content.hero;
         setContent({
           ...content,
           hero: {
-            ...content.hero,
-            hero_image_base64: result.image_url
+            ...published.hero,
+            headline,
+            subheadline,
+            primary_cta_text,
+            primary_cta_url,
+            secondary_cta_text,
+            secondary_cta_url
           }
         });
         
@@ -644,7 +765,10 @@ const HomepageEditor = () => {
                     content.hero.hero_image_base64.includes('splat') || 
                     content.hero.hero_image_base64.includes('ply')) ? (
                     <SplatViewer 
-                      splatUrl={content.hero.hero_image_base64}
+                      splatUrl={
+                        sparkJSLoader.selectModelVariant(content.hero.hero_model_variants || [])?.url ||
+                        content.hero.hero_image_base64
+                      }
                       width={400}
                       height={200}
                       autoRotate={true}
@@ -680,7 +804,7 @@ const HomepageEditor = () => {
               <div className="mt-2 space-y-2">
                 <input
                   type="file"
-                  accept=".ply,.splat,image/*"
+                  accept=".ply,.splat,image/jpeg,image/png,image/webp,image/gif"
                   onChange={(e) => {
                     const file = e.target.files?.[0];
                     if (file) uploadHeroImage(file);
@@ -946,7 +1070,7 @@ const HomepageEditor = () => {
                     {item.image_base64 ? (
                       <div className="relative inline-block">
                         <img 
-                          src={item.image_base64} 
+                          src={resolveUploadUrl(item.image_base64)} 
                           alt={item.name} 
                           className="w-48 h-32 object-cover rounded-lg border"
                         />
@@ -970,7 +1094,7 @@ const HomepageEditor = () => {
                     <div className="mt-2">
                       <input
                         type="file"
-                        accept="image/*"
+                        accept="image/jpeg,image/png,image/webp,image/gif"
                         onChange={(e) => {
                           const file = e.target.files?.[0];
                           if (file) uploadDemoImage(file, index);
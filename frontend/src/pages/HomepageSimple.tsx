@@ -14,6 +14,9 @@ import {
   ChevronRight,
   User
 } from 'lucide-react';
+import { buildSrcSet, resolveUploadUrl } from '@/utils/formatters';
+import { sparkJSLoader } from '@/services/sparkjs-loader';
+import LazySparkJS from '@/components/LazySparkJS';
 
 const BACKEND_URL = import.meta.env.VITE_REACT_APP_BACKEND_URL || process.env.REACT_APP_BACKEND_URL;
 
@@ -269,6 +272,13 @@ const HomePage = () => {
     );
   }
 
+  // Uploaded models come with level-of-detail variants; render the one that
+  // suits this device. Anything else is an embedded PlayCanvas experience.
+  const heroModelVariants = homepageContent.hero.hero_model_variants || [];
+  const heroModelUrl = heroModelVariants.length > 0
+    ? sparkJSLoader.selectModelVariant(heroModelVariants)?.url || homepageContent.hero.hero_image_base64
+    : null;
+
   return (
     <div style={{ background: 'var(--bg-page)', color: 'var(--text-primary)' }} className="min-h-screen relative overflow-hidden">
       {/* Header - ScaleFast Design */}
@@ -322,15 +332,33 @@ const HomePage = () => {
           <div className="max-w-2xl mx-auto mb-16">
             <div className="relative">
               {homepageContent.hero.hero_image_base64 ? (
-                <div className="w-full bg-gray-100 rounded-2xl overflow-hidden" style={{ height: typeof window !== 'undefined' ? Math.min(320, Math.max(200, (window.innerWidth - 32) * 0.5)) : 320 }}>
-                  <iframe
-                    src={homepageContent.hero.hero_image_base64}
-                    width="100%"
-                    height="100%"
-                    style={{ border: 'none', borderRadius: '1rem' }}
-                    allowFullScreen
-                    title="PlayCanvas 3D Experience"
-                  />
+                <div
+                  className="w-full bg-gray-100 rounded-2xl overflow-hidden bg-cover bg-center"
+                  style={{
+                    height: typeof window !== 'undefined' ? Math.min(320, Math.max(200, (window.innerWidth - 32) * 0.5)) : 320,
+                    // Server-rendered poster shows until the 3D experience paints
+                    backgroundImage: homepageContent.hero.hero_model_poster
+                      ? `url(${resolveUploadUrl(homepageContent.hero.hero_model_poster.url)})`
+                      : undefined
+                  }}
+                >
+                  {heroModelUrl ? (
+                    <LazySparkJS
+                      splatUrl={heroModelUrl}
+                      width={Math.min(672, typeof window !== 'undefined' ? window.innerWidth - 32 : 672)}
+                      height={typeof window !== 'undefined' ? Math.min(320, Math.max(200, (window.innerWidth - 32) * 0.5)) : 320}
+                      autoRotate={true}
+                    />
+                  ) : (
+                    <iframe
+                      src={homepageContent.hero.hero_image_base64}
+                      width="100%"
+                      height="100%"
+                      style={{ border: 'none', borderRadius: '1rem' }}
+                      allowFullScreen
+                      title="PlayCanvas 3D Experience"
+                    />
+                  )}
                   <div className="absolute top-2 right-2 bg-black bg-opacity-50 text-white px-2 py-1 rounded text-xs">
                     3D Experience Active
                   </div>
@@ -477,7 +505,9 @@ const HomePage = () => {
                             className="block relative overflow-hidden service-card transition-all duration-300 cursor-pointer"
                           >
                             <img 
-                              src={item.image_base64} 
+                              src={resolveUploadUrl(item.image_base64)} 
+                              srcSet={buildSrcSet(item.image_variants)}
+                              sizes="(max-width: 448px) 100vw, 448px"
                               alt={item.name}
                               className="w-full h-64 object-cover transition-transform duration-300 group-hover:scale-105"
                               style={{ borderRadius: '12px' }}
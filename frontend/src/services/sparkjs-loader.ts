@@ -24,6 +24,63 @@ interface BrowserCapabilities {
   isLowEndDevice: boolean;
 }
 
+interface ModelVariant {
+  url: string;
+  format: string;
+  media_type: string;
+  size_bytes: number;
+  gaussian_count?: number;
+  lod?: number;
+  progressive?: boolean;
+  sh_degree?: number;
+}
+
+// Summary of the hero model, available before the model is downloaded
+interface ModelMetadata {
+  gaussian_count: number;
+  sh_degree: number;
+  bounds_min: [number, number, number];
+  bounds_max: [number, number, number];
+  centroid: [number, number, number];
+  camera_distance: number;
+  sha256: string;
+}
+
+// Precomputed back-to-front orders for the auto-rotate spin, one block of
+// indices per azimuth step (fetch /api/homepage/sort-orders/{id}/{step})
+interface ModelSortOrders {
+  id: string;
+  url: string;
+  model_url: string;
+  azimuths: number;
+  index_type: 'uint16' | 'uint32';
+  gaussian_count: number;
+  camera_distance: number;
+  size_bytes: number;
+}
+
+// Fixed-size chunks of an uploaded file, each addressed by its SHA-256
+// (GET /api/homepage/uploads/{filename}/chunks)
+interface ChunkManifest {
+  url: string;
+  size: number;
+  sha256: string;
+  chunk_size: number;
+  chunks: {
+    index: number;
+    offset: number;
+    length: number;
+    sha256: string;
+    url: string;
+  }[];
+}
+
+const toHex = (digest: ArrayBuffer): string =>
+  Array.from(new Uint8Array(digest), byte => byte.toString(16).padStart(2, '0')).join('');
+
+// Variant formats SplatMesh can load directly
+const RENDERABLE_MODEL_FORMATS = ['splat', 'compressed_ply'];
+
 class SparkJSLoader {
   private modules: SparkJSModules | null = null;
   private loadingPromise: Promise<SparkJSModules> | null = null;
@@ -74,6 +131,26 @@ class SparkJSLoader {
     return this.capabilities!;
   }
 
+  // Pick the level-of-detail variant that suits this device
+  public selectModelVariant(variants: ModelVariant[]): ModelVariant | null {
+    const lodVariants = variants.filter(
+      variant => variant.lod !== undefined && variant.lod !== null && RENDERABLE_MODEL_FORMATS.includes(variant.format)
+    );
+    if (lodVariants.length === 0) {
+      return variants[0] || null;
+    }
+
+    const caps = this.getCapabilities();
+    const targetLod = caps.isLowEndDevice ? (caps.isMobile ? 0.05 : 0.15) : caps.isMobile ? 0.4 : 1.0;
+
+    // Largest level at or below the target, else the smallest available.
+    // Within a level, prefer the smallest encoding (e.g. compressed PLY).
+    const sorted = [...lodVariants].sort(
+      (a, b) => (b.lod as number) - (a.lod as number) || a.size_bytes - b.size_bytes
+    );
+    return sorted.find(variant => (variant.lod as number) <= targetLod) || sorted[sorted.length - 1];
+  }
+
   // Check if SparkJS is supported
   public isSupported(): boolean {
     const caps = this.getCapabilities();
@@ -197,6 +274,68 @@ class SparkJSLoader {
     }
   }
 
+  // Download an uploaded file as parallel, hash-verified chunks, retrying
+  // each chunk on its own. apiBase is the backend's /api/homepage prefix;
+  // chunk URLs are relative to it.
+  public async fetchModelChunks(
+    apiBase: string,
+    manifest: ChunkManifest,
+    concurrency: number = 4,
+    attempts: number = 3
+  ): Promise<Uint8Array> {
+    const bytes = new Uint8Array(manifest.size);
+    let next = 0;
+
+    const fetchChunk = async (chunk: ChunkManifest['chunks'][number]) => {
+      const response = await fetch(`${apiBase}${chunk.url}`);
+      if (!response.ok) {
+        throw new Error(`Chunk ${chunk.index} failed with status ${response.status}`);
+      }
+
+      const data = await response.arrayBuffer();
+      if (crypto.subtle && toHex(await crypto.subtle.digest('SHA-256', data)) !== chunk.sha256) {
+        throw new Error(`Chunk ${chunk.index} failed verification`);
+      }
+      bytes.set(new Uint8Array(data), chunk.offset);
+    };
+
+    const worker = async () => {
+      while (next < manifest.chunks.length) {
+        const chunk = manifest.chunks[next++];
+        for (let attempt = 1; ; attempt++) {
+          try {
+            await fetchChunk(chunk);
+            break;
+          } catch (error) {
+            if (attempt >= attempts) throw error;
+          }
+        }
+      }
+    };
+
+    const workers = Math.max(1, Math.min(concurrency, manifest.chunks.length));
+    await Promise.all(Array.from({ length: workers }, worker));
+    return bytes;
+  }
+
+  // Bytes of an uploaded model, fetched as chunks. Only for recovering
+  // after SplatMesh failed to load the url itself: that path keeps the
+  // precompressed siblings, progressive loading and storage redirects.
+  // Returns null when the model has no chunk manifest.
+  public async fetchModelBytes(apiBase: string, modelUrl: string): Promise<Uint8Array | null> {
+    if (!modelUrl.startsWith('/uploads/')) {
+      return null;
+    }
+
+    const response = await fetch(`${apiBase}${modelUrl}/chunks`);
+    if (!response.ok) {
+      return null;
+    }
+
+    const manifest: ChunkManifest = await response.json();
+    return this.fetchModelChunks(apiBase, manifest);
+  }
+
   // Get current loading state
   public getLoadingState(): LoadingState {
     return this.loadingState;
@@ -227,4 +366,4 @@ class SparkJSLoader {
 
 // Export singleton instance
 export const sparkJSLoader = new SparkJSLoader();
-export type { SparkJSModules, LoadingState, BrowserCapabilities };
\ No newline at end of file
+export type { SparkJSModules, LoadingState, BrowserCapabilities, ModelVariant, ModelMetadata, ModelSortOrders, ChunkManifest };
\ No newline at end of file
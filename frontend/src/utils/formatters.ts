@@ -68,4 +68,35 @@ export const formatFileSize = (bytes: number): string => {
   }
 
   return `${size.toFixed(1)} ${units[unitIndex]}`;
-};
\ No newline at end of file
+};
+/**
+ * Resolves a stored upload path (`/uploads/...`) to the backend URL that serves it.
+ * Absolute URLs and data URLs are returned unchanged.
+ */
+export const resolveUploadUrl = (url: string): string => {
+  if (!url.startsWith('/uploads/')) {
+    return url;
+  }
+  const backendUrl = import.meta.env.VITE_REACT_APP_BACKEND_URL || process.env.REACT_APP_BACKEND_URL;
+  return `${backendUrl}/api/homepage${url}`;
+};
+
+export interface ImageVariant {
+  url: string;
+  width: number;
+  height: number;
+  format: string;
+  size_bytes: number;
+}
+
+/**
+ * Builds an `srcset` attribute from the responsive variants generated on upload.
+ * Returns undefined when no variant in the requested format exists.
+ */
+export const buildSrcSet = (variants: ImageVariant[] | undefined, format = 'webp'): string | undefined => {
+  const matching = (variants || []).filter((variant) => variant.format === format);
+  if (matching.length === 0) {
+    return undefined;
+  }
+  return matching.map((variant) => `${resolveUploadUrl(variant.url)} ${variant.width}w`).join(', ');
+};
@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import numpy as np
+
+def write_gaussian_ply(path: Path, count: int, sh_coefficients: int = 0, ply_format: str = "binary_little_endian", seed: int = 0) -> np.ndarray:
+    """
+    Write a PLY in the layout of the reference 3D Gaussian Splatting
+    trainer and return its vertex rows.
+    """
+    rng = np.random.default_rng(seed)
+    names = (
+        ["x", "y", "z", "f_dc_0", "f_dc_1", "f_dc_2"]
+        + [f"f_rest_{i}" for i in range(3 * sh_coefficients)]
+        + ["opacity", "scale_0", "scale_1", "scale_2", "rot_0", "rot_1", "rot_2", "rot_3"]
+    )
+    rows = np.zeros(count, dtype=[(name, "<f4") for name in names])
+    for name in names:
+        rows[name] = rng.normal(size=count)
+    for name in ("x", "y", "z"):
+        rows[name] = rng.uniform(-1, 1, count)
+    for name in ("scale_0", "scale_1", "scale_2"):
+        rows[name] = rng.uniform(-5, -2, count)
+
+    header = (
+        f"ply\nformat {ply_format} 1.0\nelement vertex {count}\n"
+        + "".join(f"property float {name}\n" for name in names)
+        + "end_header\n"
+    )
+    with open(path, "wb") as f:
+        f.write(header.encode("ascii"))
+        if ply_format == "ascii":
+            np.savetxt(f, rows.view("<f4").reshape(count, -1), fmt="%.9g")
+        else:
+            f.write(rows.tobytes())
+    return rows
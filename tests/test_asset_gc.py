@@ -0,0 +1,130 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from mongomock_motor import AsyncMongoMockClient
+
+from services import asset_gc
+from services.asset_gc import STORAGE_CURSOR_PREFIX, collect_garbage
+from services.asset_store import asset_path
+from services.storage import AssetStorage, StoredFile
+
+GRACE_SECONDS = 3600
+
+class MemoryStorage(AssetStorage):
+    """Remote storage kept in a dict, for sweeping stored-only files"""
+    remote = True
+
+    def __init__(self, files):
+        self.files = {stored.name: stored for stored in files}
+
+    async def delete(self, filename):
+        self.files.pop(filename, None)
+
+    async def list(self, after=None, limit=None):
+        names = sorted(name for name in self.files if after is None or name > after)
+        return [self.files[name] for name in names[:limit]]
+
+class TestAssetGarbageCollection(unittest.TestCase):
+    """Unit tests for sweeping unreferenced uploads"""
+
+    def setUp(self):
+        """Set up test case"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name)
+        self.db = AsyncMongoMockClient()["test"]
+        pause = mock.patch.object(asset_gc, "ASSET_GC_BATCH_PAUSE", 0)
+        pause.start()
+        self.addCleanup(pause.stop)
+
+    def tearDown(self):
+        """Clean up test case"""
+        self.temp_dir.cleanup()
+
+    def write(self, name, age_hours=48, data=b"x"):
+        path = asset_path(self.path, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        modified = time.time() - age_hours * 3600
+        os.utime(path, (modified, modified))
+        return path
+
+    def collect(self, **kwargs):
+        return asyncio.run(collect_garbage(self.db, self.path, grace_seconds=GRACE_SECONDS, **kwargs))
+
+    def test_keeps_referenced_files(self):
+        """Referenced files and their derived files survive, orphans go"""
+        hero = "a" * 64 + ".splat"
+        orphan = "b" * 64 + ".splat"
+        asyncio.run(self.db.homepage_content.insert_one(
+            {"id": "main", "hero": {"hero_image_base64": f"/uploads/{hero}"}}
+        ))
+        kept = [self.write(hero), self.write(hero + ".gz"), self.write(hero + ".chunks.json")]
+        deleted = [self.write(orphan, data=b"y" * 10), self.write(orphan + ".br")]
+        fresh = self.write("c" * 64 + ".splat", age_hours=0)
+
+        dry = self.collect(dry_run=True)
+        self.assertEqual(dry["deleted"], 2)
+        self.assertTrue(all(path.exists() for path in deleted))
+
+        stats = self.collect()
+        self.assertEqual(stats["deleted"], 2)
+        self.assertEqual(stats["bytes_reclaimed"], 11)
+        self.assertTrue(all(path.exists() for path in kept + [fresh]))
+        self.assertFalse(any(path.exists() for path in deleted))
+
+    def test_keeps_unfinished_job_files(self):
+        """Files of a job still running are referenced by it"""
+        upload = "d" * 64 + ".ply"
+        asyncio.run(self.db.asset_jobs.insert_one(
+            {"id": "job", "status": "running", "payload": {"stored_filename": upload}, "result": None}
+        ))
+        path = self.write(upload)
+        self.assertEqual(self.collect()["deleted"], 0)
+        self.assertTrue(path.exists())
+
+    def test_incremental_sweeps_cover_every_file(self):
+        """Sweeps resumed from next_after visit each file exactly once"""
+        names = [f"{index:02x}" * 32 + ".splat" for index in range(0, 256, 17)]
+        for name in names:
+            self.write(name)
+        self.write("legacy.png")
+
+        scanned, after = 0, None
+        while True:
+            stats = self.collect(limit=4, after=after)
+            self.assertLessEqual(stats["scanned"], 4)
+            scanned += stats["scanned"]
+            after = stats["next_after"]
+            if after is None:
+                break
+        self.assertEqual(scanned, len(names) + 1)
+        self.assertEqual([path for path in self.path.rglob("*") if path.is_file()], [])
+
+    def test_sweeps_files_only_in_storage(self):
+        """With remote storage, stored-only orphans are deleted too"""
+        hero = "e" * 64 + ".splat"
+        asyncio.run(self.db.homepage_content.insert_one({"id": "main", "hero_url": f"/uploads/{hero}"}))
+        old = time.time() - 48 * 3600
+        storage = MemoryStorage([
+            StoredFile(hero, 10, old),
+            StoredFile(hero + ".gz", 5, old),
+            StoredFile("f" * 64 + ".splat", 20, old),
+            StoredFile("f" * 64 + ".splat.gz", 8, old),
+            StoredFile("0" * 64 + ".splat", 30, time.time()),
+        ])
+        self.write("1" * 64 + ".splat")
+
+        first = self.collect(storage=storage, limit=2)
+        self.assertTrue(first["next_after"].startswith(STORAGE_CURSOR_PREFIX))
+        rest = self.collect(storage=storage, after=first["next_after"])
+        self.assertIsNone(rest["next_after"])
+        self.assertEqual(first["deleted"] + rest["deleted"], 3)
+        self.assertEqual(sorted(storage.files), ["0" * 64 + ".splat", hero, hero + ".gz"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from services.splats.compressed import CHUNK_SIZE, decode_compressed_ply, encode_compressed_ply
+from services.splats.gaussians import gaussians_from_ply
+from services.splats.ply import read_ply_element
+from tests.splat_fixtures import write_gaussian_ply
+
+class TestCompressedPly(unittest.TestCase):
+    """Unit tests for the compressed PLY encoder"""
+
+    def setUp(self):
+        """Set up test case"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_compressed_ply_chunks(self):
+        """Test compressed PLY chunk bounds and unpacking"""
+        count = 3 * CHUNK_SIZE + 17
+        write_gaussian_ply(self.path / "model.ply", count, sh_coefficients=15)
+        gaussians = gaussians_from_ply(self.path / "model.ply")
+
+        data, expected = encode_compressed_ply(gaussians, sh_degree=3)
+        (self.path / "model.compressed.ply").write_bytes(data)
+
+        # One chunk per CHUNK_SIZE gaussians, the last one partial
+        chunk_rows = read_ply_element(self.path / "model.compressed.ply", "chunk")
+        self.assertEqual(len(chunk_rows), 4)
+        for index in range(len(chunk_rows)):
+            positions = gaussians.positions[index * CHUNK_SIZE:(index + 1) * CHUNK_SIZE]
+            self.assertAlmostEqual(float(chunk_rows["min_x"][index]), float(positions[:, 0].min()), places=6)
+            self.assertAlmostEqual(float(chunk_rows["max_z"][index]), float(positions[:, 2].max()), places=6)
+
+        # The file decodes to what the encoder reported
+        decoded = decode_compressed_ply(self.path / "model.compressed.ply")
+        self.assertEqual(len(decoded), count)
+        np.testing.assert_array_equal(decoded.positions, expected.positions)
+        np.testing.assert_array_equal(decoded.sh_rest, expected.sh_rest)
+
+        # 10-11 bit positions within each chunk's bounds
+        for index in range(len(chunk_rows)):
+            rows = slice(index * CHUNK_SIZE, (index + 1) * CHUNK_SIZE)
+            extent = gaussians.positions[rows].max(axis=0) - gaussians.positions[rows].min(axis=0)
+            error = np.abs(decoded.positions[rows] - gaussians.positions[rows]).max(axis=0)
+            self.assertTrue(np.all(error <= extent / 1023 + 1e-6), f"chunk {index} position error {error}")
+
+        alignment = np.abs(np.sum(decoded.rotations * gaussians.rotations, axis=1))
+        self.assertGreater(alignment.min(), 0.99)
+        np.testing.assert_allclose(decoded.opacities, gaussians.opacities, atol=0.5 / 255 + 1e-6)
+
+if __name__ == "__main__":
+    unittest.main()
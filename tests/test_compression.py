@@ -0,0 +1,65 @@
+import gzip
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from services.compression import (
+    available_encodings,
+    compress_file,
+    compress_files,
+    compressed_sibling,
+    negotiate_encoding,
+)
+
+class TestCompression(unittest.TestCase):
+    """Unit tests for precompressed sibling files"""
+
+    def setUp(self):
+        """Set up test case"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "model.ply"
+
+    def tearDown(self):
+        """Clean up test case"""
+        self.temp_dir.cleanup()
+
+    def test_compress_file_writes_siblings(self):
+        """Compressible files get a gzip sibling that round-trips"""
+        data = b"property float x\n" * 10000
+        self.path.write_bytes(data)
+        sizes = compress_file(self.path)
+
+        self.assertIn("gzip", sizes)
+        sibling = compressed_sibling(self.path, "gzip")
+        self.assertEqual(gzip.decompress(sibling.read_bytes()), data)
+        self.assertEqual(sizes["gzip"], sibling.stat().st_size)
+        self.assertEqual(sorted(available_encodings(self.path)), sorted(sizes))
+        self.assertEqual(list(self.path.parent.glob(".*.tmp")), [])
+
+    def test_compress_file_prunes_incompressible(self):
+        """Siblings that save too little are not kept"""
+        self.path.write_bytes(os.urandom(64 * 1024))
+        self.assertEqual(compress_file(self.path), {})
+        self.assertEqual(available_encodings(self.path), [])
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+    def test_compress_file_prunes_stale_siblings(self):
+        """Rewriting a file with incompressible data removes its old siblings"""
+        self.path.write_bytes(b"\0" * 64 * 1024)
+        self.assertIn("gzip", compress_file(self.path))
+
+        self.path.write_bytes(os.urandom(64 * 1024))
+        self.assertEqual(compress_files([self.path]), {self.path.name: {}})
+        self.assertEqual(available_encodings(self.path), [])
+
+    def test_negotiate_encoding(self):
+        """The preferred accepted coding with a sibling is chosen"""
+        self.assertEqual(negotiate_encoding("gzip, br", ["gzip", "br"]), "br")
+        self.assertEqual(negotiate_encoding("gzip, br;q=0", ["gzip", "br"]), "gzip")
+        self.assertEqual(negotiate_encoding("br", ["gzip"]), None)
+        self.assertEqual(negotiate_encoding("*", ["gzip"]), "gzip")
+        self.assertEqual(negotiate_encoding(None, ["gzip"]), None)
+
+if __name__ == "__main__":
+    unittest.main()
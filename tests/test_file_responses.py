@@ -0,0 +1,109 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from services.file_responses import parse_range_header, ranged_file_response
+
+DATA = bytes(range(256)) * 4
+
+class TestFileResponses(unittest.TestCase):
+    """Unit tests for Range and conditional file responses"""
+
+    def setUp(self):
+        """Set up test case"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "model.splat"
+        self.path.write_bytes(DATA)
+
+        app = FastAPI()
+
+        @app.get("/file")
+        @app.head("/file")
+        async def serve(request: Request):
+            return ranged_file_response(request, self.path, "application/splat")
+
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        """Clean up test case"""
+        self.temp_dir.cleanup()
+
+    def get(self, **headers):
+        return self.client.get("/file", headers=headers)
+
+    def test_parse_range_header(self):
+        """Ranges are parsed, clamped and coalesced"""
+        self.assertEqual(parse_range_header("bytes=0-9", 100), [(0, 9)])
+        self.assertEqual(parse_range_header("bytes=90-", 100), [(90, 99)])
+        self.assertEqual(parse_range_header("bytes=-10", 100), [(90, 99)])
+        self.assertEqual(parse_range_header("bytes=50-500", 100), [(50, 99)])
+        self.assertEqual(parse_range_header("bytes=0-9,5-19,20-29", 100), [(0, 29)])
+        self.assertEqual(parse_range_header("bytes=200-300", 100), [])
+        self.assertIsNone(parse_range_header("bytes=9-0", 100))
+        self.assertIsNone(parse_range_header("items=0-9", 100))
+        self.assertIsNone(parse_range_header("bytes=a-b", 100))
+
+    def test_single_and_multipart_ranges(self):
+        """One range is a plain 206, several are multipart/byteranges"""
+        response = self.get(range="bytes=10-19")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, DATA[10:20])
+        self.assertEqual(response.headers["content-range"], f"bytes 10-19/{len(DATA)}")
+
+        response = self.get(range="bytes=0-3,100-103")
+        self.assertEqual(response.status_code, 206)
+        self.assertTrue(response.headers["content-type"].startswith("multipart/byteranges"))
+        self.assertEqual(int(response.headers["content-length"]), len(response.content))
+        self.assertIn(DATA[0:4], response.content)
+        self.assertIn(DATA[100:104], response.content)
+
+        response = self.get(range=f"bytes={len(DATA)}-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response.headers["content-range"], f"bytes */{len(DATA)}")
+
+        response = self.client.head("/file", headers={"range": "bytes=10-19"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.headers["content-length"], "10")
+
+    def test_if_range(self):
+        """A Range is only honoured while If-Range matches the current file"""
+        full = self.get()
+        etag, last_modified = full.headers["etag"], full.headers["last-modified"]
+
+        response = self.get(range="bytes=0-9", **{"if-range": etag})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, DATA[:10])
+
+        response = self.get(range="bytes=0-9", **{"if-range": last_modified})
+        self.assertEqual(response.status_code, 206)
+
+        # A stale validator gets the whole file, and weak tags never match
+        for stale in ('"stale"', f"W/{etag}", "Thu, 01 Jan 1970 00:00:00 GMT"):
+            response = self.get(range="bytes=0-9", **{"if-range": stale})
+            self.assertEqual(response.status_code, 200, stale)
+            self.assertEqual(response.content, DATA)
+
+    def test_conditional_get(self):
+        """Matching validators get a 304 without a body"""
+        full = self.get()
+        self.assertEqual(full.status_code, 200)
+
+        response = self.get(**{"if-none-match": full.headers["etag"]})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+        response = self.get(**{"if-none-match": f"W/{full.headers['etag']}"})
+        self.assertEqual(response.status_code, 304)
+
+        response = self.get(**{"if-modified-since": full.headers["last-modified"]})
+        self.assertEqual(response.status_code, 304)
+
+        # If-None-Match wins over If-Modified-Since
+        response = self.get(**{"if-none-match": '"other"', "if-modified-since": full.headers["last-modified"]})
+        self.assertEqual(response.status_code, 200)
+
+if __name__ == "__main__":
+    unittest.main()
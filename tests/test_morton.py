@@ -0,0 +1,27 @@
+import unittest
+
+import numpy as np
+
+from services.splats.morton import morton_codes
+
+class TestMorton(unittest.TestCase):
+    """Unit tests for Morton ordering"""
+
+    def test_morton_ordering(self):
+        """Test that Morton codes never decrease as a point moves along an axis"""
+        self.assertEqual(len(morton_codes(np.empty((0, 3), dtype=np.float32))), 0)
+
+        rng = np.random.default_rng(0)
+        positions = rng.uniform(-1, 1, (1000, 3))
+        for axis in range(3):
+            moved = positions.copy()
+            moved[:, axis] += rng.uniform(0, 0.5, 1000)
+            codes = morton_codes(np.concatenate([positions, moved]))
+            self.assertTrue(np.all(codes[1000:] >= codes[:1000]), f"axis {axis}")
+
+        # Along the diagonal every axis grows together, so codes strictly increase
+        diagonal = np.repeat(np.linspace(0, 1, 500)[:, None], 3, axis=1)
+        self.assertTrue(np.all(np.diff(morton_codes(diagonal).astype(np.float64)) > 0))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from services.splats.gaussians import encode_splat, gaussians_from_ply
+from services.splats.poster import render_poster, render_poster_file
+from tests.splat_fixtures import write_gaussian_ply
+
+class TestPoster(unittest.TestCase):
+    """Unit tests for poster rendering"""
+
+    def setUp(self):
+        """Set up test case"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_poster_dimensions(self):
+        """Test poster output dimensions"""
+        write_gaussian_ply(self.path / "model.ply", 500)
+        gaussians = gaussians_from_ply(self.path / "model.ply")
+
+        image = render_poster(gaussians, width=64, height=48)
+        self.assertEqual(image.shape, (48, 64, 3))
+        self.assertEqual(image.dtype, np.uint8)
+
+        (self.path / "model.splat").write_bytes(encode_splat(gaussians))
+        poster = render_poster_file(self.path / "model.splat", self.path)
+        self.assertEqual((poster["width"], poster["height"]), (960, 540))
+        self.assertEqual(poster["format"], "webp")
+
+        stored = list(self.path.rglob(poster["url"].rsplit("/", 1)[-1]))
+        self.assertEqual(len(stored), 1, "Poster not stored")
+        with Image.open(stored[0]) as stored_image:
+            self.assertEqual(stored_image.size, (960, 540))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+import numpy as np
+
+from services.splats.sort_orders import azimuth_steps, camera_position, sort_orders
+
+class TestSortOrders(unittest.TestCase):
+    """Unit tests for precomputed sort orders"""
+
+    def test_sort_orders_are_permutations(self):
+        """Test that sort orders are back-to-front permutations of the right dtype"""
+        rng = np.random.default_rng(0)
+
+        positions = rng.uniform(-1, 1, (1000, 3)).astype(np.float32)
+        orders = sort_orders(positions, 4)
+        self.assertEqual(orders.dtype, np.uint16)
+        self.assertEqual(orders.shape, (4, 1000))
+        for step, order in enumerate(orders):
+            np.testing.assert_array_equal(np.sort(order), np.arange(1000))
+            distances = np.linalg.norm(positions[order] - camera_position(2 * np.pi * step / 4), axis=1)
+            self.assertTrue(np.all(np.diff(distances) <= 1e-5), f"step {step} not back to front")
+
+        # Indices past 65535 need 32 bits
+        positions = rng.uniform(-1, 1, (65537, 3)).astype(np.float32)
+        orders = sort_orders(positions, 2)
+        self.assertEqual(orders.dtype, np.uint32)
+        for order in orders:
+            np.testing.assert_array_equal(np.sort(order), np.arange(65537))
+        self.assertEqual(sort_orders(positions[:65536], 1).dtype, np.uint16)
+
+    def test_sort_order_budget(self):
+        """Test that sort orders take at most the model's size"""
+        self.assertEqual(azimuth_steps(1000, 32), 16)
+        self.assertEqual(azimuth_steps(100000, 32), 8)
+        self.assertEqual(azimuth_steps(1000, 8), 8)
+        self.assertEqual(azimuth_steps(1000, 2), 2)
+
+if __name__ == "__main__":
+    unittest.main()
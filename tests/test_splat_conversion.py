@@ -0,0 +1,85 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from services.splats.gaussians import SH_C0, SPLAT_DTYPE, encode_splat, gaussians_from_ply, gaussians_from_splat
+from services.splats.ply import PlyError, parse_ply_header, read_ply_element
+from tests.splat_fixtures import write_gaussian_ply
+
+class TestSplatConversion(unittest.TestCase):
+    """Unit tests for PLY parsing and .splat conversion"""
+
+    def setUp(self):
+        """Set up test case"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_ply_header_errors(self):
+        """Test that malformed PLY headers are rejected"""
+        with self.assertRaises(PlyError):
+            parse_ply_header(b"not a ply file")
+        with self.assertRaises(PlyError):
+            parse_ply_header(b"ply\nformat binary_little_endian 1.0\nelement vertex 1\n")
+        with self.assertRaises(PlyError):
+            parse_ply_header(b"ply\nformat binary_middle_endian 1.0\nelement vertex 1\nend_header\n")
+
+        header = parse_ply_header(b"ply\nformat ascii 1.0\nelement vertex 3\nproperty float x\nend_header\nrest")
+        self.assertEqual(header.element("vertex").count, 3)
+        self.assertEqual(header.header_size, len(b"ply\nformat ascii 1.0\nelement vertex 3\nproperty float x\nend_header\n"))
+
+    def test_ascii_and_binary_ply_match(self):
+        """Test that ASCII and binary PLY files decode to the same rows"""
+        binary = write_gaussian_ply(self.path / "binary.ply", 50, sh_coefficients=3)
+        write_gaussian_ply(self.path / "ascii.ply", 50, sh_coefficients=3, ply_format="ascii")
+
+        ascii_rows = read_ply_element(self.path / "ascii.ply")
+        for name in binary.dtype.names:
+            np.testing.assert_array_equal(ascii_rows[name], binary[name], err_msg=name)
+
+    def test_ply_to_splat_round_trip(self):
+        """Test that a PLY converted to .splat decodes within quantization tolerances"""
+        rows = write_gaussian_ply(self.path / "model.ply", 2000, sh_coefficients=3)
+        gaussians = gaussians_from_ply(self.path / "model.ply")
+        self.assertEqual(gaussians.sh_degree, 1)
+
+        # Decoding applies the activations of the reference renderer
+        np.testing.assert_allclose(gaussians.scales[:, 0], np.exp(rows["scale_0"]), rtol=1e-6)
+        np.testing.assert_allclose(gaussians.colors[:, 0], np.clip(0.5 + SH_C0 * rows["f_dc_0"], 0, 1), atol=1e-6)
+        np.testing.assert_allclose(gaussians.opacities, 1 / (1 + np.exp(-rows["opacity"])), atol=1e-6)
+
+        data = encode_splat(gaussians)
+        self.assertEqual(len(data), 2000 * SPLAT_DTYPE.itemsize)
+        (self.path / "model.splat").write_bytes(data)
+        decoded = gaussians_from_splat(self.path / "model.splat")
+
+        # Positions and scales are stored as float32
+        np.testing.assert_array_equal(decoded.positions, gaussians.positions)
+        np.testing.assert_array_equal(decoded.scales, gaussians.scales)
+
+        # Color and opacity are 8 bit
+        np.testing.assert_allclose(decoded.colors, gaussians.colors, atol=0.5 / 255 + 1e-6)
+        np.testing.assert_allclose(decoded.opacities, gaussians.opacities, atol=0.5 / 255 + 1e-6)
+
+        # Quaternion components are 8 bit; q and -q are the same rotation
+        alignment = np.abs(np.sum(decoded.rotations * gaussians.rotations, axis=1))
+        self.assertGreater(alignment.min(), 0.999)
+        np.testing.assert_allclose(np.linalg.norm(decoded.rotations, axis=1), 1.0, atol=1e-6)
+
+    def test_gaussians_from_splat_limit(self):
+        """Test that a .splat can be decoded partially and must hold whole records"""
+        write_gaussian_ply(self.path / "model.ply", 100)
+        data = encode_splat(gaussians_from_ply(self.path / "model.ply"))
+        (self.path / "model.splat").write_bytes(data)
+        self.assertEqual(len(gaussians_from_splat(self.path / "model.splat", limit=10)), 10)
+
+        (self.path / "truncated.splat").write_bytes(data[:-1])
+        with self.assertRaises(ValueError):
+            gaussians_from_splat(self.path / "truncated.splat")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from services.splats import tiles
+from services.splats.gaussians import SPLAT_DTYPE, gaussians_from_ply
+from tests.splat_fixtures import write_gaussian_ply
+
+class TestTiles(unittest.TestCase):
+    """Unit tests for octree tiling"""
+
+    def setUp(self):
+        """Set up test case"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_tile_partition(self):
+        """Test that the leaf tiles hold every gaussian exactly once"""
+        write_gaussian_ply(self.path / "model.ply", 5000)
+        gaussians = gaussians_from_ply(self.path / "model.ply")
+
+        with mock.patch.object(tiles, "TILE_MAX_GAUSSIANS", 400), mock.patch.object(tiles, "TILE_AGGREGATE_GAUSSIANS", 100):
+            data, manifest = tiles.build_tileset(gaussians)
+
+        leaves = [tile for tile in manifest["tiles"].values() if tile["leaf"]]
+        self.assertGreater(len(leaves), 1, "Model should be split into several tiles")
+        self.assertEqual(sum(tile["gaussian_count"] for tile in leaves), len(gaussians))
+
+        records = np.concatenate([
+            np.frombuffer(data[tile["offset"]:tile["offset"] + tile["length"]], dtype=SPLAT_DTYPE)
+            for tile in leaves
+        ])
+        found = np.unique(records["position"], axis=0)
+        self.assertEqual(len(found), len(gaussians), "A gaussian is missing or repeated")
+        np.testing.assert_array_equal(found, np.unique(gaussians.positions, axis=0))
+
+        # Interior tiles hold a bounded aggregate of their subtree
+        for tile in manifest["tiles"].values():
+            if not tile["leaf"]:
+                self.assertEqual(tile["gaussian_count"], 100)
+                self.assertEqual(tile["subtree_gaussians"], sum(
+                    manifest["tiles"][child]["subtree_gaussians"] for child in tile["children"]
+                ))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import asyncio
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+
+from fastapi import HTTPException
+
+from services.upload_sessions import (
+    bytes_received,
+    create_part_file,
+    discard_session,
+    finalize_hash,
+    is_complete,
+    merge_ranges,
+    session_part_path,
+    write_chunk,
+)
+
+async def _chunks(data: bytes, size: int = 100):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+class TestUploadSessions(unittest.TestCase):
+    """Unit tests for resumable upload sessions"""
+
+    def setUp(self):
+        """Set up test case"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name)
+        self.data = bytes(range(256)) * 40
+
+    def tearDown(self):
+        """Clean up test case"""
+        self.temp_dir.cleanup()
+
+    def write(self, session_id, start, end):
+        return asyncio.run(write_chunk(
+            self.path, session_id, start, len(self.data), _chunks(self.data[start:end])
+        ))
+
+    def test_merge_ranges(self):
+        """Overlapping and touching ranges merge, gaps are kept"""
+        self.assertEqual(merge_ranges([[50, 80], [0, 10], [10, 20], [15, 30]]), [[0, 30], [50, 80]])
+        self.assertEqual(bytes_received([[0, 10], [5, 20], [30, 40]]), 30)
+        self.assertFalse(is_complete([[0, 10], [20, 30]], 30))
+        self.assertTrue(is_complete([[10, 30], [0, 10]], 30))
+        self.assertTrue(is_complete([], 0))
+
+    def test_out_of_order_assembly(self):
+        """Chunks written in any order, with retries, assemble the original file"""
+        asyncio.run(create_part_file(self.path, "s1", len(self.data)))
+        ranges = []
+        for start, end in [(8000, 10240), (3000, 8000), (0, 4000)]:
+            self.assertFalse(is_complete(ranges, len(self.data)))
+            self.assertEqual(self.write("s1", start, end), end - start)
+            ranges.append([start, end])
+        self.assertTrue(is_complete(ranges, len(self.data)))
+        # A retried chunk rewrites the same bytes
+        self.assertEqual(self.write("s1", 3000, 5000), 2000)
+
+        self.assertEqual(session_part_path(self.path, "s1").read_bytes(), self.data)
+        self.assertEqual(
+            asyncio.run(finalize_hash(self.path, "s1")),
+            hashlib.sha256(self.data).hexdigest()
+        )
+
+    def test_chunk_past_declared_size(self):
+        """Data running past the declared size is a 416"""
+        asyncio.run(create_part_file(self.path, "s2", len(self.data)))
+        with self.assertRaises(HTTPException) as context:
+            asyncio.run(write_chunk(
+                self.path, "s2", len(self.data) - 10, len(self.data), _chunks(b"x" * 20)
+            ))
+        self.assertEqual(context.exception.status_code, 416)
+
+    def test_discard_session(self):
+        """Discarding a session removes its part file"""
+        asyncio.run(create_part_file(self.path, "s3", 10))
+        discard_session(self.path, "s3")
+        self.assertFalse(session_part_path(self.path, "s3").exists())
+        discard_session(self.path, "s3")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from services.splats.gaussians import SPLAT_DTYPE
+from services.upload_validation import UploadRejected, UploadValidator, check_declared_size, validate_file
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n" + b"\x00" * 16
+PLY_DATA = (
+    b"ply\nformat binary_little_endian 1.0\nelement vertex 2\n"
+    b"property float x\nproperty float y\nproperty float z\nend_header\n"
+    + np.zeros(6, dtype="<f4").tobytes()
+)
+
+class TestUploadValidation(unittest.TestCase):
+    """Unit tests for upload type and size validation"""
+
+    def feed(self, filename, data, chunk_size=7, **kwargs):
+        validator = UploadValidator(filename, **kwargs)
+        for start in range(0, len(data), chunk_size):
+            validator.feed(data[start:start + chunk_size])
+        validator.finish(len(data))
+        return validator
+
+    def test_sniffs_extensionless_uploads(self):
+        """Files named without an extension are typed from their bytes"""
+        validator = self.feed("model", PLY_DATA)
+        self.assertEqual(validator.kind, "ply")
+        self.assertEqual(validator.extension, ".ply")
+
+        validator = self.feed("photo", PNG_HEADER)
+        self.assertEqual(validator.kind, "image")
+        self.assertEqual(validator.extension, ".png")
+
+        with self.assertRaises(UploadRejected) as caught:
+            self.feed(None, b"\x00" * 64)
+        self.assertEqual(caught.exception.status_code, 415)
+
+        with self.assertRaises(UploadRejected):
+            self.feed("model", PLY_DATA, allowed=("image",))
+
+    def test_rejects_mislabelled_uploads(self):
+        """A declared extension must match the bytes"""
+        with self.assertRaises(UploadRejected) as caught:
+            self.feed("hero.png", PLY_DATA)
+        self.assertEqual(caught.exception.status_code, 415)
+
+        with self.assertRaises(UploadRejected) as caught:
+            self.feed("hero.ply", PNG_HEADER)
+        self.assertEqual(caught.exception.status_code, 415)
+
+        with self.assertRaises(UploadRejected) as caught:
+            self.feed("hero.exe", PNG_HEADER)
+        self.assertEqual(caught.exception.status_code, 415)
+
+    def test_ply_checks(self):
+        """Truncated and oversized binary PLYs are caught from the header"""
+        with self.assertRaises(UploadRejected) as caught:
+            self.feed("hero.ply", PLY_DATA[:-4])
+        self.assertEqual(caught.exception.status_code, 422)
+
+        with self.assertRaises(UploadRejected) as caught:
+            self.feed("hero.ply", PLY_DATA, max_size=len(PLY_DATA) - 1)
+        self.assertEqual(caught.exception.status_code, 413)
+
+    def test_splat_checks(self):
+        """.splat records must be whole and finite"""
+        records = np.zeros(4, dtype=SPLAT_DTYPE)
+        validator = self.feed("hero.splat", records.tobytes())
+        self.assertEqual(validator.kind, "splat")
+
+        with self.assertRaises(UploadRejected) as caught:
+            self.feed("hero.splat", records.tobytes()[:-1])
+        self.assertEqual(caught.exception.status_code, 422)
+
+        records["position"][0] = np.inf
+        with self.assertRaises(UploadRejected) as caught:
+            self.feed("hero.splat", records.tobytes())
+        self.assertEqual(caught.exception.status_code, 422)
+
+        self.assertEqual(check_declared_size("hero.splat", SPLAT_DTYPE.itemsize * 2), "splat")
+        with self.assertRaises(UploadRejected):
+            check_declared_size("hero.splat", SPLAT_DTYPE.itemsize + 1)
+
+    def test_validate_file(self):
+        """Files on disk are checked the same way and report their kind"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "upload.part"
+            path.write_bytes(PLY_DATA)
+            self.assertEqual(validate_file(path, None).kind, "ply")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import asyncio
+import hashlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+
+from services.uploads import TEMP_UPLOAD_PREFIX, UploadSizeLimitMiddleware, stream_upload_to_temp
+
+class TestUploads(unittest.TestCase):
+    """Unit tests for streaming uploads to disk"""
+
+    def setUp(self):
+        """Set up test case"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        """Clean up test case"""
+        self.temp_dir.cleanup()
+
+    def stream(self, data, max_size, chunk_size=1024):
+        upload = UploadFile(file=io.BytesIO(data), filename="hero.bin")
+        return asyncio.run(stream_upload_to_temp(upload, self.path, max_size, chunk_size))
+
+    def test_stream_upload_hashes_and_counts(self):
+        """The temp file holds the upload, with its size and SHA-256"""
+        data = bytes(range(256)) * 20
+        upload = self.stream(data, len(data))
+        self.assertEqual(upload.size, len(data))
+        self.assertEqual(upload.sha256, hashlib.sha256(data).hexdigest())
+        self.assertEqual(upload.temp_path.read_bytes(), data)
+        self.assertTrue(upload.temp_path.name.startswith(TEMP_UPLOAD_PREFIX))
+
+    def test_stream_upload_size_limit(self):
+        """Going one byte over the limit is a 413 and leaves no temp file"""
+        data = b"x" * 5000
+        with self.assertRaises(HTTPException) as caught:
+            self.stream(data, len(data) - 1)
+        self.assertEqual(caught.exception.status_code, 413)
+        self.assertEqual(list(self.path.iterdir()), [])
+
+    def test_size_limit_middleware(self):
+        """Oversized bodies are refused before the route parses them"""
+        app = FastAPI()
+        parsed = []
+
+        @app.post("/upload")
+        async def upload(file: UploadFile = File(...)):
+            parsed.append(file.filename)
+            return {"size": len(await file.read())}
+
+        app.add_middleware(UploadSizeLimitMiddleware, limits={r"/upload": 4096})
+        client = TestClient(app)
+
+        response = client.post("/upload", files={"file": ("small.bin", b"x" * 1000)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"size": 1000})
+
+        response = client.post("/upload", files={"file": ("large.bin", b"x" * 8000)})
+        self.assertEqual(response.status_code, 413)
+
+        # Without a Content-Length the body is cut off as it streams in
+        chunks = iter([b"x" * 3000, b"x" * 3000])
+        response = client.post("/upload", content=chunks, headers={"content-type": "multipart/form-data; boundary=b"})
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(parsed, ["small.bin"])
+
+if __name__ == "__main__":
+    unittest.main()